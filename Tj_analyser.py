@@ -1,121 +1,44 @@
 import argparse
-from datetime import datetime
+import os
+from pathlib import Path
 
 import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
-from tqdm import tqdm
-
-from config import DATA_URL_OVERALL, DATA_URL_WEEKLY
-from helpers.calculations import (
-    stats_table_overall,
-    stats_table_weekly,
+
+from config import (
+    ARROW_SUFFIXES,
+    BOOTSTRAP_DEFAULTS,
+    EXCURSION_DEFAULTS,
+    EXPORT_FORMATS,
+    SERVER_DEFAULTS,
+)
+from helpers.calculations import stats_table_overall
+from helpers.columnar_journal import (
+    append_columnar_journal,
+    write_arrow_journal,
+    write_columnar_journal,
 )
+from helpers.excursions import EXCURSION_INPUT_COLUMNS, add_excursions
+from helpers.exporters import export_report
+from helpers.portfolio import PORTFOLIO_COLUMNS, account_names, build_portfolio
+from helpers.sqlite_journal import ingest_sqlite_journal, is_sqlite_journal
+from helpers.journal_loading import load_input_dataframe
 from helpers.journal_normalization import (
-    load_journal_config,
-    load_journal_data,
-    normalize_journal,
+    print_column_profile,
+    print_column_timings,
     print_detected_mappings,
 )
-from helpers.utils import has_non_empty, series_or_none
-from helpers.visualizations import (
-    asset_performance_bar,
-    bar_outcomes_by_custom_ranges,
-    create_stats_table,
-    distribution_plot,
-    drawdown_curve,
-    heatmap_rr,
-    outcome_by_day,
-    risk_vs_reward_scatter,
-    rr_barplot,
-    rr_barplot_months,
-    rr_curve,
-    rr_vs_hour_range_bubble_scatter,
-    rr_vs_sl_points,
+from helpers.journal_filter import FilterError, filter_columns, filter_journal
+from helpers.position_sizing import parse_sizing_spec
+from helpers.report_pages import (
+    generate_plots_overall,
+    generate_plots_portfolio,
+    generate_plots_weekly,
+    report_columns,
 )
+from helpers.report_planner import INTERMEDIATES, ReportPlanner, position_sizing
+from helpers.weekly_backfill import BACKFILL_LAYOUTS, WEEKLY_HASH_COLUMNS, backfill_weekly_reports
 
 
-def has_columns(df: pd.DataFrame, *columns: str) -> bool:
-    return all(column in df.columns for column in columns)
-
-
-def add_plot(plots: list[tuple], enabled: bool, func, *args) -> None:
-    """Append a plot only when its data requirements are satisfied."""
-    if enabled:
-        plots.append((func, args))
-
-
-def generate_plots_weekly(df: pd.DataFrame) -> list[tuple]:
-    """Generate plot functions and arguments for weekly reports."""
-    plots: list[tuple] = [(create_stats_table, (stats_table_weekly(df),))]
-
-    rr_series = series_or_none(df, "rr")
-    days = df["trade_day"] if "trade_day" in df.columns else None
-    dates = df["trade_date"] if "trade_date" in df.columns else None
-    add_plot(
-        plots,
-        rr_series is not None and (has_non_empty(df, "trade_day") or has_non_empty(df, "trade_date")),
-        rr_barplot,
-        rr_series,
-        days,
-        dates,
-        "Weekly R by Day",
-        "",
-        "Total R",
-    )
-
-    return plots
-
-
-def generate_plots_overall(df: pd.DataFrame) -> list[tuple]:
-    """Generate plot functions and arguments for overall reports."""
-    plots: list[tuple] = [(create_stats_table, (stats_table_overall(df),))]
-    time_ranges = [
-        ("09:30–10:00", "09:30", "10:00"),
-        ("10:00–11:00", "10:00", "11:00"),
-    ]
-
-    rr_series = series_or_none(df, "rr")
-    stop_loss_points = series_or_none(df, "stop_loss_points")
-    position_size = series_or_none(df, "position_size")
-
-    date_series = df["trade_date"] if "trade_date" in df.columns else None
-    day_series = df["trade_day"] if "trade_day" in df.columns else None
-
-    add_plot(plots, rr_series is not None and not rr_series.empty, rr_curve, rr_series)
-    add_plot(plots, rr_series is not None and not rr_series.empty, drawdown_curve, rr_series)
-    add_plot(plots, rr_series is not None and has_non_empty(df, "asset"), asset_performance_bar, df["asset"], rr_series)
-    add_plot(
-        plots,
-        has_non_empty(df, "outcome") and (has_non_empty(df, "trade_day") or has_non_empty(df, "trade_date")),
-        outcome_by_day,
-        df["outcome"],
-        date_series,
-        day_series,
-        "WIN",
-        "LOSS",
-        "BE",
-    )
-    add_plot(plots, rr_series is not None and has_columns(df, "trade_day", "entry_time"), heatmap_rr, rr_series, df["trade_day"], df["entry_time"])
-    add_plot(plots, has_columns(df, "outcome", "entry_time"), bar_outcomes_by_custom_ranges, df["outcome"], df["entry_time"], time_ranges)
-    add_plot(plots, rr_series is not None and has_columns(df, "entry_time", "outcome"), rr_vs_hour_range_bubble_scatter, df["entry_time"], rr_series, df["outcome"])
-    add_plot(plots, stop_loss_points is not None and not stop_loss_points.empty, distribution_plot, stop_loss_points, "Distribution of Stop-Loss points", "Stop-Loss Points")
-    add_plot(
-        plots,
-        position_size is not None and rr_series is not None and has_non_empty(df, "outcome"),
-        risk_vs_reward_scatter,
-        position_size,
-        rr_series,
-        df["outcome"],
-        "Position Size vs R/R",
-        "Position Size",
-        "R/R",
-    )
-    add_plot(plots, stop_loss_points is not None and rr_series is not None and has_non_empty(df, "outcome"), rr_vs_sl_points, stop_loss_points, rr_series, df["outcome"])
-    add_plot(plots, rr_series is not None and has_non_empty(df, "trade_date"), rr_barplot_months, rr_series, df["trade_date"])
-
-    return plots
-
 def term_stats(stats: dict) -> None:
     """Print statistics to terminal in formatted way."""
     print("\n--- Trading Statistics ---")
@@ -123,59 +46,208 @@ def term_stats(stats: dict) -> None:
         print(f"{key:<25}: {value}")
 
 
-def export_pdf_report(figure_list: list[tuple], report_type: str = "Report") -> str:
+def export_pdf_report(
+    figure_list: list[tuple],
+    report_type: str = "Report",
+    output_dir: str = ".",
+    output_name: str | None = None,
+) -> str:
     """Export all figures to a PDF file."""
-    pdf_path = f"{datetime.now().strftime('%Y-%m-%d')}-{report_type}.pdf"
-
-    with PdfPages(pdf_path) as pdf:
-        for func, args in tqdm(figure_list, desc="Generating plots", unit="plot"):
-            fig = func(*args)
-            if fig is not None:
-                pdf.savefig(fig)
-            plt.close()
-
-    return pdf_path
-
-
-def fetch_and_process(df: pd.DataFrame, report_type: str) -> pd.DataFrame:
-    """Process data and generate report."""
+    written = export_report(
+        figure_list,
+        report_type=report_type,
+        formats=("pdf",),
+        output_dir=output_dir,
+        output_name=output_name,
+    )
+    return written["pdf"][0]
+
+
+def fetch_and_process(
+    df: pd.DataFrame,
+    report_type: str,
+    formats: tuple[str, ...] | list[str] = ("pdf",),
+    output_dir: str = ".",
+    output_name: str | None = None,
+    breakdowns: list[list[str]] | None = None,
+    bootstrap: dict | None = None,
+    sizing: dict[str, list[float]] | None = None,
+) -> pd.DataFrame:
+    """Process data and generate report.
+
+    ``bootstrap`` holds ``stats_table_overall`` keyword arguments (``resamples``,
+    ``seed``, ``max_workers``) that add confidence intervals to the overall stats.
+    ``sizing`` is a position-sizing policy grid; an empty dict uses the default grid.
+    """
     print("Processing and generating report...")
 
     plot_funcs = {
         "weekly": generate_plots_weekly,
-        "overall": generate_plots_overall,
-    }
-    stats_funcs = {
-        "weekly": stats_table_weekly,
-        "overall": stats_table_overall,
+        "overall": lambda data, planner: generate_plots_overall(data, breakdowns, planner, sizing is not None),
     }
 
     if report_type not in plot_funcs:
         raise ValueError(f"Unknown report type: {report_type}")
 
-    steps = plot_funcs[report_type](df)
-    pdf_path = export_pdf_report(steps, report_type=report_type.capitalize())
-    print(f"\nReport successfully saved to: {pdf_path}")
+    intermediates = dict(INTERMEDIATES)
+    if bootstrap:
+        intermediates["stats_overall"] = ((), (), lambda data: stats_table_overall(data, **bootstrap))
+    if sizing:
+        intermediates["position_sizing"] = ((), ("rr_trades",), lambda data, rr: position_sizing(data, rr, sizing))
+    planner = ReportPlanner(df, intermediates)
+    steps = plot_funcs[report_type](df, planner)
+    stats = planner.get(f"stats_{report_type}")
+    written = export_report(
+        steps,
+        report_type=report_type.capitalize(),
+        formats=formats,
+        output_dir=output_dir,
+        output_name=output_name,
+        stats=stats,
+    )
+    for fmt, paths in written.items():
+        location = paths[0] if len(paths) == 1 else f"{len(paths)} files in {os.path.dirname(paths[0])}"
+        print(f"\n{fmt.upper()} report successfully saved to: {location}")
 
-    stats = stats_funcs[report_type](df)
     term_stats(stats)
     return df
 
 
-def load_input_dataframe(report_type: str, input_path: str | None, config_path: str | None) -> pd.DataFrame:
-    """Load data from a local journal or fallback URL, then normalize it."""
-    journal_config = load_journal_config(config_path)
-
-    if input_path or journal_config.get("source", {}).get("path"):
-        raw_df = load_journal_data(input_path, journal_config)
+def backfill_weekly(
+    df: pd.DataFrame,
+    formats: tuple[str, ...] | list[str] = ("pdf",),
+    output_dir: str = ".",
+    layout: str = "per-week",
+    output_name: str | None = None,
+    max_workers: int | None = None,
+    force: bool = False,
+) -> dict:
+    """Generate weekly reports for every ISO week in the journal."""
+    print("Backfilling weekly reports...")
+    result = backfill_weekly_reports(
+        df,
+        output_dir=output_dir,
+        formats=formats,
+        layout=layout,
+        output_name=output_name,
+        max_workers=max_workers,
+        force=force,
+    )
+    print(
+        f"\nRendered {len(result['rendered'])} week(s), skipped {len(result['skipped'])} unchanged; "
+        f"wrote {len(result['files'])} file(s) to {output_dir}"
+    )
+    return result
+
+
+def fetch_and_process_portfolio(
+    journals: dict[str, pd.DataFrame],
+    formats: tuple[str, ...] | list[str] = ("pdf",),
+    output_dir: str = ".",
+    output_name: str | None = None,
+) -> dict:
+    """Aggregate many account journals and generate the portfolio report."""
+    print(f"Aggregating {len(journals)} accounts...")
+    portfolio = build_portfolio(journals)
+    written = export_report(
+        generate_plots_portfolio(portfolio),
+        report_type="Portfolio",
+        formats=formats,
+        output_dir=output_dir,
+        output_name=output_name,
+        stats=portfolio["stats"],
+    )
+    for fmt, paths in written.items():
+        location = paths[0] if len(paths) == 1 else f"{len(paths)} files in {os.path.dirname(paths[0])}"
+        print(f"\n{fmt.upper()} report successfully saved to: {location}")
+
+    term_stats(portfolio["stats"])
+    return portfolio
+
+
+def apply_filter(df: pd.DataFrame, expression: str, parser: argparse.ArgumentParser) -> pd.DataFrame:
+    """Keep the trades matching a --filter expression."""
+    try:
+        filtered = filter_journal(df, expression)
+    except FilterError as exc:
+        parser.error(f"invalid --filter: {exc}")
+    print(f"Filter kept {len(filtered)} of {len(df)} trades")
+    return filtered
+
+
+def input_columns(
+    args: argparse.Namespace, breakdowns: list[list[str]] | None, parser: argparse.ArgumentParser
+) -> list[str]:
+    """Journal columns a report run reads, so stored journals load only those."""
+    if args.type == "portfolio":
+        columns = list(PORTFOLIO_COLUMNS)
     else:
-        url_map = {
-            "weekly": DATA_URL_WEEKLY,
-            "overall": DATA_URL_OVERALL,
-        }
-        raw_df = pd.read_csv(url_map[report_type])
+        columns = report_columns(args.type, breakdowns, args.sizing is not None)
+    if args.backfill:
+        columns += WEEKLY_HASH_COLUMNS
+    if args.bars:
+        columns += EXCURSION_INPUT_COLUMNS
+    if args.filter:
+        try:
+            columns += filter_columns(args.filter)
+        except FilterError as exc:
+            parser.error(f"invalid --filter: {exc}")
+    return list(dict.fromkeys(columns))
+
+
+def apply_excursions(df: pd.DataFrame, bars_dir: str, max_workers: int | None) -> pd.DataFrame:
+    """Add MAE/MFE columns from the bar store in ``bars_dir``."""
+    enriched = add_excursions(df, bars_dir, max_workers=max_workers)
+    covered = int(enriched["mae_points"].notna().sum())
+    print(f"MAE/MFE computed for {covered} of {len(enriched)} trades")
+    missing = enriched.attrs["excursion_missing_assets"]
+    if missing:
+        print(f"No bars in {bars_dir} for: {', '.join(missing)}")
+    return enriched
+
+
+def convert_journal(
+    input_path: str | list[str] | None,
+    output_path: str,
+    config_path: str | None = None,
+    append: bool = False,
+    fills: bool = False,
+    conflicts_path: str | None = None,
+    normalize_workers: int | None = None,
+    timings: bool = False,
+) -> str:
+    """Normalize a CSV or Excel journal and store it in the columnar format or a SQLite store.
+
+    SQLite stores (``.sqlite``, ``.sqlite3``, ``.db``) are always ingested
+    incrementally, skipping trades they already hold.
+    """
+    df = load_input_dataframe(
+        "overall",
+        input_path,
+        config_path,
+        fills,
+        conflicts_path=conflicts_path,
+        normalize_workers=normalize_workers,
+    )
+    if timings:
+        print_column_timings(df)
+    if is_sqlite_journal(output_path):
+        inserted, total_rows = ingest_sqlite_journal(df, output_path)
+        print(
+            f"Stored {inserted} new trades in {output_path} "
+            f"({len(df) - inserted} already stored, {total_rows} total)"
+        )
+    elif append:
+        total_rows = append_columnar_journal(df, output_path)
+        print(f"Appended {len(df)} trades to {output_path} ({total_rows} total)")
+    elif Path(output_path).suffix.lower() in ARROW_SUFFIXES:
+        write_arrow_journal(df, output_path)
+        print(f"Wrote {len(df)} trades to Arrow journal {output_path}")
+    else:
+        write_columnar_journal(df, output_path)
+        print(f"Wrote {len(df)} trades to columnar journal {output_path}")
+    return output_path
 
-    return normalize_journal(raw_df, journal_config)
 
 def main() -> None:
     """Main entry point for the application."""
@@ -185,15 +257,33 @@ def main() -> None:
     parser.add_argument(
         "--type",
         type=str,
-        choices=["weekly", "overall"],
-        required=True,
-        help="Type of report to generate (weekly or overall)",
+        choices=["weekly", "overall", "portfolio"],
+        default=None,
+        help="Type of report to generate (weekly, overall, or portfolio)",
     )
     parser.add_argument(
         "--input",
         type=str,
+        nargs="+",
+        default=None,
+        help=(
+            "Path to a CSV (plain, .csv.gz/.bz2/.xz/.zst, or a .zip of CSVs), Excel, columnar, or SQLite "
+            "journal; several overlapping exports are merged, dropping trades repeated across them"
+        ),
+    )
+    parser.add_argument(
+        "--conflicts",
+        type=str,
         default=None,
-        help="Path to a CSV or Excel journal file",
+        metavar="FILE",
+        help="When merging several --input journals, write repeated trades whose other columns disagree to a CSV",
+    )
+    parser.add_argument(
+        "--accounts",
+        type=str,
+        nargs="+",
+        default=None,
+        help="Journal files to aggregate for --type portfolio, one per account",
     )
     parser.add_argument(
         "--config",
@@ -201,11 +291,294 @@ def main() -> None:
         default=None,
         help="Path to a journal mapping config TOML file",
     )
+    parser.add_argument(
+        "--format",
+        type=str,
+        default="pdf",
+        help=f"Comma-separated export formats ({', '.join(EXPORT_FORMATS)})",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default=".",
+        help="Directory where report files are written",
+    )
+    parser.add_argument(
+        "--output-name",
+        type=str,
+        default=None,
+        help="Output file name template; supports {date}, {time}, {report} and {pid}",
+    )
+    parser.add_argument(
+        "--breakdown",
+        type=str,
+        action="append",
+        default=None,
+        help="Comma-separated columns to break stats down by, e.g. setup,session (repeatable)",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a local HTTP report server instead of generating one report",
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        default=SERVER_DEFAULTS["host"],
+        help="Host interface for --serve",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=SERVER_DEFAULTS["port"],
+        help="Port for --serve",
+    )
+    parser.add_argument(
+        "--root",
+        type=str,
+        default=".",
+        help="Directory that --serve is allowed to read journals from",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=SERVER_DEFAULTS["cache_size"],
+        help="Number of normalized journals kept in memory by --serve",
+    )
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=SERVER_DEFAULTS["max_concurrent"],
+        help="Maximum in-flight stats/report requests for --serve",
+    )
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        default=None,
+        help="Number of report rendering processes for --serve and --backfill",
+    )
+    parser.add_argument(
+        "--backfill",
+        choices=BACKFILL_LAYOUTS,
+        nargs="?",
+        const="per-week",
+        default=None,
+        help="With --type weekly, write a report for every ISO week: per-week files or one combined PDF",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="With --backfill, re-render weeks even when their trades are unchanged",
+    )
+    parser.add_argument(
+        "--filter",
+        type=str,
+        default=None,
+        metavar="EXPR",
+        help=(
+            "Only report trades matching an expression, e.g. "
+            "\"asset == NQ and session == NY and weekday == tue and time between 09:30 and 10:00\""
+        ),
+    )
+    parser.add_argument(
+        "--normalize-workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Threads cleaning journal columns concurrently during normalization (default: [normalization] max_workers, or 1)",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print the seconds spent normalizing each journal column",
+    )
+    parser.add_argument(
+        "--since",
+        type=str,
+        default=None,
+        metavar="DATE",
+        help="Only report trades dated on or after DATE (queried through the index for SQLite stores)",
+    )
+    parser.add_argument(
+        "--until",
+        type=str,
+        default=None,
+        metavar="DATE",
+        help="Only report trades dated on or before DATE",
+    )
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        default=0,
+        metavar="N",
+        help="With --type overall, add bootstrap confidence intervals from N resamples to the stats",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=BOOTSTRAP_DEFAULTS["seed"],
+        help="Random seed for reproducible --bootstrap intervals",
+    )
+    parser.add_argument(
+        "--bootstrap-workers",
+        type=int,
+        default=1,
+        help="Processes used for --bootstrap resampling",
+    )
+    parser.add_argument(
+        "--sizing",
+        type=str,
+        nargs="?",
+        const="",
+        default=None,
+        metavar="SPEC",
+        help=(
+            "With --type overall, add position-sizing what-if pages; optional grid such as "
+            "'fixed_fractional=0.5,1,2;fixed_r=1;kelly=0.25,0.5'"
+        ),
+    )
+    parser.add_argument(
+        "--bars",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help=(
+            "With --type overall, add MAE/MFE pages from per-asset minute bars in DIR "
+            "(<asset>/ bar stores, or <asset>.csv files imported on first use)"
+        ),
+    )
+    parser.add_argument(
+        "--bars-workers",
+        type=int,
+        default=EXCURSION_DEFAULTS["max_workers"],
+        help="Processes used to scan assets for --bars (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--fills",
+        action="store_true",
+        help="The input holds broker fills; pair them into round-trip trades (see [fills] in the journal config)",
+    )
+    parser.add_argument(
+        "--convert-to",
+        type=str,
+        default=None,
+        help="Write the normalized journal to a columnar directory (or .arrow file, or .sqlite store) and exit",
+    )
+    parser.add_argument(
+        "--append-to",
+        type=str,
+        default=None,
+        help="Append the normalized journal to an existing columnar directory (or .sqlite store) and exit",
+    )
     args = parser.parse_args()
 
-    df = load_input_dataframe(args.type, args.input, args.config)
+    if args.convert_to or args.append_to:
+        convert_journal(
+            args.input,
+            args.convert_to or args.append_to,
+            args.config,
+            append=bool(args.append_to),
+            fills=args.fills,
+            conflicts_path=args.conflicts,
+            normalize_workers=args.normalize_workers,
+            timings=args.timings,
+        )
+        return
+
+    if args.serve:
+        from helpers.report_server import serve
+
+        serve(
+            host=args.host,
+            port=args.port,
+            root=args.root,
+            cache_size=args.cache_size,
+            max_concurrent=args.max_concurrent,
+            render_workers=args.render_workers or SERVER_DEFAULTS["render_workers"],
+        )
+        return
+
+    if args.type is None:
+        parser.error("the following arguments are required: --type")
+
+    formats = [fmt.strip().lower() for fmt in args.format.split(",") if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in EXPORT_FORMATS]
+    if unknown:
+        parser.error(f"unknown export format(s): {', '.join(unknown)}")
+
+    breakdowns = (
+        [[column.strip() for column in spec.split(",") if column.strip()] for spec in args.breakdown]
+        if args.breakdown
+        else None
+    )
+    columns = input_columns(args, breakdowns, parser)
+
+    if args.type == "portfolio":
+        if not args.accounts:
+            parser.error("--type portfolio requires --accounts")
+        try:
+            names = account_names(args.accounts)
+        except ValueError as exc:
+            parser.error(str(exc))
+        journals = {
+            name: load_input_dataframe(
+                "overall",
+                account,
+                args.config,
+                args.fills,
+                args.since,
+                args.until,
+                normalize_workers=args.normalize_workers,
+                report_columns=columns,
+            )
+            for name, account in zip(names, args.accounts)
+        }
+        if args.filter:
+            journals = {name: apply_filter(journal, args.filter, parser) for name, journal in journals.items()}
+        fetch_and_process_portfolio(journals, formats, args.output_dir, args.output_name)
+        return
+
+    df = load_input_dataframe(
+        args.type,
+        args.input,
+        args.config,
+        args.fills,
+        args.since,
+        args.until,
+        args.conflicts,
+        args.normalize_workers,
+        columns,
+    )
     print_detected_mappings(df)
-    fetch_and_process(df, args.type)
+    print_column_profile(df)
+    if args.timings:
+        print_column_timings(df)
+    if args.filter:
+        df = apply_filter(df, args.filter, parser)
+    if args.backfill:
+        if args.type != "weekly":
+            parser.error("--backfill requires --type weekly")
+        backfill_weekly(df, formats, args.output_dir, args.backfill, args.output_name, args.render_workers, args.force)
+        return
+
+    if args.bootstrap and args.type != "overall":
+        parser.error("--bootstrap requires --type overall")
+    bootstrap = (
+        {"resamples": args.bootstrap, "seed": args.seed, "max_workers": args.bootstrap_workers}
+        if args.bootstrap
+        else None
+    )
+    if args.bars:
+        if args.type != "overall":
+            parser.error("--bars requires --type overall")
+        df = apply_excursions(df, args.bars, args.bars_workers)
+    if args.sizing is not None and args.type != "overall":
+        parser.error("--sizing requires --type overall")
+    try:
+        sizing = parse_sizing_spec(args.sizing) if args.sizing is not None else None
+    except ValueError as exc:
+        parser.error(str(exc))
+    fetch_and_process(df, args.type, formats, args.output_dir, args.output_name, breakdowns, bootstrap, sizing)
 
 
 if __name__ == "__main__":
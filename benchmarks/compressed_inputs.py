@@ -0,0 +1,63 @@
+"""Time reading a journal as a plain, compressed, and zipped CSV.
+
+The zip holds one CSV per month. With ``--cold``, the page cache is dropped
+before each cold read, which needs root on Linux.
+
+    python -m benchmarks.compressed_inputs --rows 5000000 --cold
+"""
+
+import argparse
+import gzip
+import os
+import shutil
+import subprocess
+import zipfile
+
+import pandas as pd
+
+from benchmarks.synthetic import best_of, journal_csv
+from helpers.journal_normalization import load_journal_config, load_journal_data
+
+
+def build_inputs(csv_path) -> list:
+    """Write a ``.csv.gz`` and a ``.zip`` of monthly CSVs next to the journal, once."""
+    gz_path = csv_path.with_suffix(".csv.gz")
+    zip_path = csv_path.with_suffix(".zip")
+    if not gz_path.exists():
+        with open(csv_path, "rb") as source, gzip.open(gz_path, "wb", compresslevel=6) as target:
+            shutil.copyfileobj(source, target)
+    if not zip_path.exists():
+        raw = pd.read_csv(csv_path)
+        months = raw["date"].str[:7]
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for month, trades in raw.groupby(months):
+                archive.writestr(f"{month}.csv", trades.to_csv(index=False))
+    return [csv_path, gz_path, zip_path]
+
+
+def drop_page_cache() -> None:
+    subprocess.run(["sync"], check=True)
+    with open("/proc/sys/vm/drop_caches", "w") as file:
+        file.write("3\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--cold", action="store_true", help="Also time reads after dropping the page cache")
+    args = parser.parse_args()
+
+    journal_config = load_journal_config(None)
+    print(f"{args.rows:,} trades:")
+    print(f"  {'Input':24s} {'Size':>8s} {'Cold read':>10s} {'Warm read':>10s}")
+    for path in build_inputs(journal_csv(args.rows)):
+        cold = "-"
+        if args.cold:
+            drop_page_cache()
+            cold = f"{best_of(1, lambda: load_journal_data(str(path), journal_config))[0]:.1f}s"
+        warm, _ = best_of(2, lambda: load_journal_data(str(path), journal_config))
+        print(f"  {path.name:24s} {os.path.getsize(path) / 2**20:6.0f} MB {cold:>10s} {warm:9.1f}s", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Time MAE/MFE for a synthetic journal against years of minute bars per asset.
+
+Bar stores hold one random-walk minute bar per minute around the clock for
+every journal asset, covering the journal's dates. They are built once and
+cached next to the journal.
+
+    python -m benchmarks.excursions --rows 1000000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import ASSETS, WORKDIR, best_of, synthetic_journal
+from helpers.excursions import add_excursions, bar_store_path, write_bars
+from helpers.journal_normalization import load_journal_config, normalize_journal
+
+
+def build_bars(bars_dir, start: str, days: int, seed: int = 0) -> None:
+    """One bar store per asset with ``days`` days of minute bars."""
+    rng = np.random.default_rng(seed)
+    times = pd.date_range(start, periods=days * 1440, freq="min")
+    for asset in ASSETS:
+        if (bar_store_path(bars_dir, asset) / "time.npy").exists():
+            continue
+        close = 1000 + np.cumsum(rng.normal(0, 0.5, len(times)))
+        open_ = np.r_[close[0], close[:-1]]
+        spread = np.abs(rng.normal(0, 0.3, (2, len(times))))
+        bars = pd.DataFrame(
+            {
+                "time": times,
+                "open": open_,
+                "high": np.maximum(open_, close) + spread[0],
+                "low": np.minimum(open_, close) - spread[1],
+                "close": close,
+            }
+        )
+        write_bars(bars, bar_store_path(bars_dir, asset))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=1800, help="Calendar days of trades and bars")
+    parser.add_argument("--workers", type=int, default=None, help="Asset worker processes (default: CPU count)")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    bars_dir = WORKDIR / f"bars_{args.days}"
+    build_bars(bars_dir, "2020-01-01", args.days)
+    df = normalize_journal(synthetic_journal(args.rows, days=args.days), load_journal_config(None))
+
+    elapsed, enriched = best_of(args.repeats, lambda: add_excursions(df, bars_dir, max_workers=args.workers))
+    bars = len(ASSETS) * args.days * 1440
+    print(f"MAE/MFE for {len(df):,} trades against {len(ASSETS)} assets x {args.days} days of minute bars")
+    print(f"({bars:,} bars): {elapsed:.2f}s (best of {args.repeats})")
+    print(f"Trades with MAE/MFE: {int(enriched['mae_points'].notna().sum()):,}")
+
+
+if __name__ == "__main__":
+    main()
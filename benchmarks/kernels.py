@@ -0,0 +1,83 @@
+"""Time the drawdown, streak and sizing kernels with NumPy and with numba.
+
+"pandas" is the straightforward pandas or Python-loop version the metrics
+used before the kernels, where one exists.
+
+    python -m benchmarks.kernels --rows 10000000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import best_of
+from helpers import kernels
+from helpers.calculations import consecutive_wins_and_losses, max_drawdown_from_equity, max_drawdown_r
+
+
+def pandas_max_drawdown(rr: pd.Series) -> float:
+    cumulative = rr.dropna().cumsum()
+    return abs(float((cumulative - cumulative.cummax()).min()))
+
+
+def python_streaks(outcomes: pd.Series) -> tuple[int, int]:
+    max_loss = max_win = loss = win = 0
+    for outcome in outcomes:
+        loss, win = (loss + 1 if outcome == "LOSS" else 0), (win + 1 if outcome == "WIN" else 0)
+        max_loss, max_win = max(max_loss, loss), max(max_win, win)
+    return max_loss, max_win
+
+
+def pandas_equity_drawdown(equity: pd.Series) -> float:
+    peaks = equity.cummax()
+    return -((equity - peaks) / peaks).min()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeats", type=int, default=2)
+    args = parser.parse_args()
+    if not kernels.JIT_AVAILABLE:
+        parser.error("numba is not installed (or TJ_KERNELS=numpy is set)")
+
+    rng = np.random.default_rng(0)
+    rr = pd.Series(rng.normal(0.1, 1.5, args.rows))
+    outcomes = pd.Series(rng.choice(np.array(["WIN", "LOSS", "BE"], dtype=object), args.rows, p=[0.45, 0.45, 0.1]))
+    equity = pd.Series(1e6 + np.cumsum(rng.normal(1, 100, args.rows)))
+    values = rr.to_numpy()
+    starts = np.unique(np.r_[0, rng.integers(0, args.rows, 500)]).astype(np.int64)
+    has_rr = np.ones(args.rows, dtype=bool)
+    risk = np.array([0.005, 0.01, 0.02, 0.05])
+
+    # Compile (or load from the on-disk cache) outside the timings.
+    for name in kernels.LOOP_KERNELS:
+        kernels.jit_kernel(name)
+
+    cases = [
+        ("Max drawdown (R)", lambda: pandas_max_drawdown(rr), lambda: max_drawdown_r(rr)),
+        ("Consecutive wins/losses", lambda: python_streaks(outcomes),
+         lambda: consecutive_wins_and_losses(outcomes, "LOSS", "WIN")),
+        ("Max drawdown from equity", lambda: pandas_equity_drawdown(equity), lambda: max_drawdown_from_equity(equity)),
+        (f"Segment drawdowns ({len(starts)} groups)", None,
+         lambda: kernels.segment_max_drawdown(values, has_rr, starts)),
+        (f"Segment win runs ({len(starts)} groups)", None,
+         lambda: kernels.segment_max_run(values > 0, starts)),
+        ("Sizing, 4 compounding policies", None, lambda: kernels.compounding_paths(values, risk, 65_536)),
+        ("Sizing, 4 fixed-R policies", None, lambda: kernels.fixed_paths(values, risk, 65_536)),
+    ]
+
+    print(f"{args.rows:,} trades, best of {args.repeats}:")
+    print(f"  {'Metric':36s} {'pandas':>8s} {'NumPy':>8s} {'numba':>8s}")
+    for label, before, kernel in cases:
+        baseline = f"{best_of(1, before)[0]:7.2f}s" if before else f"{'-':>8s}"
+        kernels.JIT_AVAILABLE = False
+        numpy_time, _ = best_of(args.repeats, kernel)
+        kernels.JIT_AVAILABLE = True
+        jit_time, _ = best_of(args.repeats, kernel)
+        print(f"  {label:36s} {baseline} {numpy_time:7.2f}s {jit_time:7.2f}s", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Time journal normalization on a standard and a wide journal, with 1 and N threads.
+
+The wide journal adds dollar-formatted risk, reward, stop and price columns
+plus day and side labels, as spreadsheet exports often have.
+
+    python -m benchmarks.normalization --rows 5000000 --workers 1 4
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import best_of, synthetic_journal
+from helpers.journal_normalization import load_journal_config, normalize_journal
+
+
+def widen(raw: pd.DataFrame) -> pd.DataFrame:
+    """Add the text-formatted money columns and labels of a wide export."""
+    risk = raw["risk"].astype(float)
+    return raw.assign(
+        risk="$" + raw["risk"].astype(str),
+        sl="$" + raw["sl"].astype(str),
+        reward="$" + (risk * raw["r/r"]).round(2).astype(str),
+        day=pd.to_datetime(raw["date"]).dt.day_name(),
+        side=np.where(np.arange(len(raw)) % 2, "Buy", "Sell"),
+        price_in="$" + (4000 + raw["sl"]).round(2).astype(str),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    raw = synthetic_journal(args.rows)
+    journal_config = load_journal_config(None)
+    for label, journal in (("standard", raw), ("wide", widen(raw))):
+        print(f"{label} journal, {args.rows:,} trades x {journal.shape[1]} columns:")
+        for workers in args.workers:
+            journal_config["normalization"] = {"max_workers": workers}
+            elapsed, df = best_of(1, lambda: normalize_journal(journal, journal_config))
+            timings = df.attrs["column_timings"]
+            print(
+                f"  {workers} thread(s): {elapsed:5.1f}s, {sum(timings.values()):.1f}s of it cleaning "
+                f"{len(timings)} columns",
+                flush=True,
+            )
+            print("    " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Time planning an overall report with and without shared intermediates.
+
+The baseline resolves every page's intermediates from scratch and computes
+the stats table separately, as the reports did before the planner. The
+planned run shares one ``ReportPlanner`` between the pages and the stats.
+
+    python -m benchmarks.report_planner --rows 1000000
+"""
+
+import argparse
+
+from benchmarks.synthetic import best_of, journal_csv
+from helpers.calculations import stats_table_overall
+from helpers.journal_loading import load_input_dataframe
+from helpers.report_pages import generate_plots_overall
+from helpers.report_planner import ReportPlanner
+
+
+class UnsharedPlanner(ReportPlanner):
+    """A planner that forgets every intermediate, so each page recomputes its own."""
+
+    def get(self, name: str, key: str | None = None):
+        value = super().get(name, key)
+        self._values.clear()
+        return value
+
+
+def unshared_report(df):
+    steps = generate_plots_overall(df, planner=UnsharedPlanner(df))
+    return steps, stats_table_overall(df)
+
+
+def planned_report(df):
+    planner = ReportPlanner(df)
+    steps = generate_plots_overall(df, planner=planner)
+    return steps, planner.get("stats_overall")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    df = load_input_dataframe("overall", str(journal_csv(args.rows)), None)
+    unshared, _ = best_of(args.repeats, lambda: unshared_report(df))
+    planned, (planned_steps, _) = best_of(args.repeats, lambda: planned_report(df))
+
+    print(f"Overall report on {len(df):,} trades, {len(planned_steps)} pages (best of {args.repeats}):")
+    print(f"  every page resolves its own data: {unshared:6.2f}s")
+    print(f"  shared planner:                   {planned:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Time a SQLite journal store against loading the CSV it was built from.
+
+    python -m benchmarks.sqlite_store --rows 5000000
+"""
+
+import argparse
+import os
+
+from benchmarks.synthetic import WORKDIR, best_of, journal_csv
+from helpers.journal_loading import load_input_dataframe
+from helpers.sqlite_journal import ingest_sqlite_journal, read_sqlite_journal
+
+REPORT_COLUMNS = [
+    "trade_date", "asset", "outcome", "rr", "entry_time", "exit_time",
+    "setup", "session", "stop_loss_points", "position_size",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--year", default="2022", help="Year loaded through the trade_date index")
+    args = parser.parse_args()
+
+    csv_path = journal_csv(args.rows)
+    store = WORKDIR / f"journal_{args.rows}.sqlite"
+    if store.exists():
+        store.unlink()
+
+    def step(label: str, func):
+        elapsed, result = best_of(1, func)
+        print(f"  {label:52s} {elapsed:7.1f}s", flush=True)
+        return result
+
+    print(f"{args.rows:,} trades:")
+    df = step("Load and normalize the CSV", lambda: load_input_dataframe("overall", str(csv_path), None))
+    step("Ingest into a new store", lambda: ingest_sqlite_journal(df, store))
+    step("Re-ingest the same trades (all deduplicated)", lambda: ingest_sqlite_journal(df, store))
+    step("Load every column", lambda: read_sqlite_journal(store))
+    year = step(
+        f"Load {args.year} of the report columns",
+        lambda: read_sqlite_journal(store, REPORT_COLUMNS, start=f"{args.year}-01-01", end=f"{args.year}-12-31"),
+    )
+    print(f"  CSV {os.path.getsize(csv_path) / 2**20:.0f} MB, store {os.path.getsize(store) / 2**20:.0f} MB, "
+          f"{len(year):,} trades in {args.year}")
+
+
+if __name__ == "__main__":
+    main()
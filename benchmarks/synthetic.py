@@ -0,0 +1,62 @@
+"""Synthetic raw journals for the benchmark scripts.
+
+Journals look like a spreadsheet export (``date``, ``entry time``, ``r/r``,
+``result`` and so on), so loading them exercises column mapping and
+normalization. They are built from lookup tables rather than per-row string
+formatting, so millions of rows take seconds.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+WORKDIR = Path(tempfile.gettempdir()) / "tj-benchmarks"
+ASSETS = ("NQ", "ES", "GC", "CL")
+
+
+def synthetic_journal(rows: int, seed: int = 0, start: str = "2020-01-01", days: int = 1800) -> pd.DataFrame:
+    """A raw journal of ``rows`` trades spread over ``days`` calendar days, in date order."""
+    rng = np.random.default_rng(seed)
+    day_labels = pd.date_range(start, periods=days, freq="D").strftime("%Y-%m-%d").to_numpy(dtype=object)
+    clock = np.array([f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(1440)], dtype=object)
+
+    day = np.sort(rng.integers(0, days, rows))
+    entry = rng.integers(8 * 60, 16 * 60, rows)
+    rr = np.round(rng.choice([-1, 0, 1.5, 2, 3, -1, -1], rows) * rng.uniform(0.8, 1.2, rows), 2)
+    return pd.DataFrame(
+        {
+            "date": day_labels[day],
+            "symbol": rng.choice(np.array(ASSETS, dtype=object), rows),
+            "entry time": clock[entry],
+            "exit": clock[(entry + rng.integers(1, 240, rows)) % 1440],
+            "size": rng.integers(1, 5, rows),
+            "result": np.where(rr > 0, "win", np.where(rr < 0, "Loss", "be")).astype(object),
+            "r/r": rr,
+            "sl": rng.normal(20, 5, rows).round(1),
+            "session": rng.choice(np.array(["NY", "London", "Asia"], dtype=object), rows),
+            "setup": rng.choice(np.array(["A", "B", "C"], dtype=object), rows),
+            "risk": rng.integers(100, 300, rows),
+        }
+    )
+
+
+def journal_csv(rows: int, seed: int = 0, workdir: Path = WORKDIR) -> Path:
+    """Write a synthetic journal CSV once and reuse it on later runs."""
+    path = Path(workdir) / f"journal_{rows}_{seed}.csv"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        synthetic_journal(rows, seed).to_csv(path, index=False)
+    return path
+
+
+def best_of(repeats: int, func) -> tuple[float, object]:
+    """Best wall time of ``repeats`` calls, and the last call's result."""
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
@@ -38,9 +38,115 @@ PLOT_DEFAULTS: Final[dict] = {
     "edge_linewidth": 1.5,
 }
 
+# Distinct R levels kept exact in the hour-range bubble chart before R is quantized
+BUBBLE_MAX_RR_LEVELS: Final[int] = 50
+
 # Trading constants
 DAY_ORDER: Final[list[str]] = ["monday", "tuesday", "wednesday", "thursday", "friday"]
 
+WEEKDAY_NAMES: Final[list[str]] = [*DAY_ORDER, "saturday", "sunday"]
+
+# Derived integer columns added by normalization (not stored in columnar journals)
+CALENDAR_COLUMNS: Final[list[str]] = [
+    "trade_weekday",
+    "trade_month",
+    "entry_time_seconds",
+    "exit_time_seconds",
+    "entry_hour",
+]
+
+# Journal filters: label columns with per-value bitmaps built up front, range
+# columns with a sorted index, and short field names accepted in --filter
+FILTER_BITMAP_COLUMNS: Final[list[str]] = ["asset", "session", "setup", "outcome", "trade_weekday", "entry_hour"]
+
+FILTER_RANGE_COLUMNS: Final[list[str]] = ["trade_date", "trade_month", "entry_time_seconds", "exit_time_seconds"]
+
+FILTER_FIELD_ALIASES: Final[dict[str, str]] = {
+    "date": "trade_date",
+    "day": "trade_weekday",
+    "weekday": "trade_weekday",
+    "month": "trade_month",
+    "hour": "entry_hour",
+    "time": "entry_time_seconds",
+    "entry_time": "entry_time_seconds",
+    "exit_time": "exit_time_seconds",
+    "symbol": "asset",
+}
+
+# Holding-time analytics: duration bucket edges in minutes (the last bucket is
+# open-ended) and the number of equal-count duration bins for win rates
+DURATION_DEFAULTS: Final[dict] = {
+    "bucket_edges": [0, 1, 5, 15, 30, 60, 120, 240, 480, 1440],
+    "quantiles": 5,
+}
+
+# Concurrent exposure: trades per sweep chunk, points on the exposure timeline,
+# and the cluster size from which overlap clusters are grouped together
+EXPOSURE_DEFAULTS: Final[dict] = {
+    "chunk_trades": 1_000_000,
+    "timeline_points": 1000,
+    "max_cluster_size": 8,
+}
+
+# MAE/MFE: seconds covered by one bar of the per-asset bar store and the
+# processes used to scan assets (None = one per CPU)
+EXCURSION_DEFAULTS: Final[dict] = {
+    "bar_seconds": 60,
+    "max_workers": None,
+}
+
+BAR_COLUMN_ALIASES: Final[dict[str, list[str]]] = {
+    "time": ["time", "datetime", "timestamp", "date"],
+    "open": ["open", "o"],
+    "high": ["high", "h"],
+    "low": ["low", "l"],
+    "close": ["close", "c", "last"],
+}
+
+# Broker fills: how round trips become journal rows ("position" = one trade per
+# flat-to-flat position, "fifo" = one trade per entry fill), contract multipliers
+# per asset, a fixed risk per trade for fills without stop prices, and the
+# decimals quantities are rounded to before exact integer position sums
+FILLS_DEFAULTS: Final[dict] = {
+    "enabled": False,
+    "pairing": "position",
+    "multipliers": {},
+    "risk_amount": None,
+    "quantity_decimals": 6,
+}
+
+FILL_COLUMN_ALIASES: Final[dict[str, list[str]]] = {
+    "time": ["time", "timestamp", "datetime", "date_time", "exec_time", "fill_time", "execution_time"],
+    "date": ["date", "trade_date", "exec_date"],
+    "asset": ["asset", "symbol", "ticker", "instrument", "contract"],
+    "account": ["account", "account_id", "acct"],
+    "side": ["side", "action", "buy_sell", "b_s"],
+    "quantity": ["quantity", "qty", "filled_qty", "shares", "contracts", "size"],
+    "price": ["price", "fill_price", "exec_price", "avg_price"],
+    "fees": ["fees", "commission", "commissions", "fee"],
+    "stop_price": ["stop_price", "stop", "sl_price"],
+}
+
+# Journal normalization: threads cleaning mapped columns concurrently
+# (1 = one column after another, None = Python's default pool size)
+NORMALIZATION_DEFAULTS: Final[dict] = {
+    "max_workers": 1,
+}
+
+# Journal merge: columns fingerprinting a trade across overlapping exports,
+# the decimals sizes and R multiples are rounded to before hashing, and the
+# rows per hash partition, which bounds the size of the dedup index
+MERGE_DEFAULTS: Final[dict] = {
+    "key_columns": ["trade_date", "entry_time", "asset", "position_size", "rr"],
+    "decimals": 6,
+    "partition_rows": 4_000_000,
+}
+
+# Magnitude thresholds for numeric dates: Excel serial days vs Unix seconds/milliseconds
+EXCEL_SERIAL_MAX: Final[float] = 200_000
+
+UNIX_MILLISECONDS_MIN: Final[float] = 1e11
+
 OUTCOME_LABELS: Final[dict[str, str]] = {
     "win": "WIN",
     "loss": "LOSS",
@@ -55,12 +161,15 @@ CANONICAL_COLUMNS: Final[dict[str, str]] = {
     "asset": "Instrument, ticker, symbol, or market name",
     "entry_time": "Entry time in any parseable format",
     "exit_time": "Exit time in any parseable format",
+    "exit_date": "Exit date, for trades closed on a later day than trade_date",
     "position_size": "Position size, contracts, lots, or shares",
     "outcome": "Trade outcome such as WIN, LOSS, or BE",
     "rr": "R-multiple or risk-reward result for the trade",
     "risk_amount": "Risk taken on the trade in account currency or points",
     "reward_amount": "Reward made on the trade in account currency or points",
     "stop_loss_points": "Stop-loss size in points, ticks, or pips",
+    "direction": "Trade direction, LONG or SHORT",
+    "entry_price": "Entry fill price",
     "session": "Trading session or market session label",
     "setup": "Setup, strategy, or playbook name",
     "notes": "Free-form trade notes",
@@ -76,6 +185,7 @@ COLUMN_ALIASES: Final[dict[str, list[str]]] = {
     "asset": ["asset", "symbol", "ticker"],
     "entry_time": ["entry_time", "entry", "entry time"],
     "exit_time": ["exit_time", "exit", "exit time"],
+    "exit_date": ["exit_date", "exit date", "close_date"],
     "position_size": [
         "position_size",
         "size",
@@ -98,6 +208,8 @@ COLUMN_ALIASES: Final[dict[str, list[str]]] = {
         "sl_points",
         "sl",
     ],
+    "direction": ["direction", "side", "long_short"],
+    "entry_price": ["entry_price", "entry price", "price_in"],
     "session": ["session", "market_session", "session_name"],
     "setup": ["setup", "strategy", "playbook"],
     "notes": ["notes", "comment", "comments"],
@@ -124,4 +236,106 @@ OUTCOME_VALUE_MAP: Final[dict[str, str]] = {
     "0": "BE",
 }
 
+DIRECTION_VALUE_MAP: Final[dict[str, str]] = {
+    "long": "LONG",
+    "l": "LONG",
+    "buy": "LONG",
+    "b": "LONG",
+    "bought": "LONG",
+    "short": "SHORT",
+    "s": "SHORT",
+    "sell": "SHORT",
+    "sold": "SHORT",
+    "bot": "LONG",
+    "sld": "SHORT",
+}
+
 MINIMUM_REQUIRED_COLUMNS: Final[list[str]] = ["outcome"]
+
+# Group breakdown pages added to the overall report when the columns have values
+DEFAULT_BREAKDOWNS: Final[list[list[str]]] = [
+    ["setup"],
+    ["session"],
+    ["setup", "session"],
+]
+
+# Report export
+EXPORT_FORMATS: Final[tuple[str, ...]] = ("pdf", "png", "svg", "html", "json")
+
+DEFAULT_OUTPUT_NAME: Final[str] = "{date}-{time}-{report}-{pid}"
+
+# Weekly backfill: per-week and combined file name templates, and the hash manifest
+BACKFILL_OUTPUT_NAME: Final[str] = "{week}-{report}"
+
+BACKFILL_COMBINED_NAME: Final[str] = "{report}-Backfill"
+
+BACKFILL_MANIFEST: Final[str] = "weekly_backfill.json"
+
+# Bootstrap confidence intervals: resamples are drawn in chunks of about chunk_bytes,
+# but never fewer than min_chunk_rows resamples per chunk
+BOOTSTRAP_DEFAULTS: Final[dict] = {
+    "resamples": 10_000,
+    "confidence": 0.95,
+    "seed": None,
+    "chunk_bytes": 64 * 1024 * 1024,
+    "min_chunk_rows": 16,
+}
+
+# Position-sizing what-if grid: policy -> parameters (risk % of equity, % of starting
+# equity for fixed R, or fraction of the Kelly stake), evaluated in tiles of about chunk_bytes
+SIZING_DEFAULTS: Final[dict] = {
+    "initial_equity": 10_000.0,
+    "policies": {
+        "fixed_fractional": [0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0],
+        "fixed_r": [0.5, 1.0, 2.0],
+        "kelly": [0.25, 0.5, 1.0],
+    },
+    "chunk_bytes": 64 * 1024 * 1024,
+    "table_rows": 25,
+}
+
+# Report server
+SERVER_DEFAULTS: Final[dict] = {
+    "host": "127.0.0.1",
+    "port": 8050,
+    "cache_size": 8,
+    "max_concurrent": 8,
+    "render_workers": 2,
+    "render_timeout": 120.0,
+    "metrics_window": 1024,
+}
+
+# Columnar journals
+COLUMNAR_MANIFEST: Final[str] = "journal.json"
+
+ARROW_SUFFIXES: Final[set[str]] = {".arrow", ".feather", ".ipc"}
+
+COLUMNAR_NUMERIC_COLUMNS: Final[list[str]] = [
+    "position_size",
+    "rr",
+    "risk_amount",
+    "reward_amount",
+    "stop_loss_points",
+    "entry_price",
+]
+
+COLUMNAR_TIME_COLUMNS: Final[list[str]] = ["entry_time", "exit_time"]
+
+# SQLite journal store: file suffixes, the trades table, indexed columns, and
+# rows per executemany/fetchmany batch
+SQLITE_SUFFIXES: Final[set[str]] = {".sqlite", ".sqlite3", ".db"}
+
+SQLITE_TABLE: Final[str] = "trades"
+
+SQLITE_INDEXED_COLUMNS: Final[list[str]] = ["trade_date", "asset", "setup", "session"]
+
+SQLITE_BATCH_ROWS: Final[int] = 100_000
+
+# Compressed journals: codec per file suffix (a ".csv" must come before it),
+# archive suffixes whose CSV members are read concurrently, and the threads
+# reading them (None = Python's default pool size)
+COMPRESSION_SUFFIXES: Final[dict[str, str]] = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+
+ARCHIVE_SUFFIXES: Final[set[str]] = {".zip"}
+
+ARCHIVE_MAX_WORKERS: Final[int | None] = None
@@ -0,0 +1,207 @@
+"""Vectorized bootstrap confidence intervals for the core trading statistics.
+
+Resamples are drawn as ``(chunk, n)`` index matrices and every statistic is
+reduced along the trade axis, so a whole chunk of resamples is evaluated with
+a handful of in-place NumPy passes. Chunks are sized to a memory budget with a
+floor of resamples per chunk, so there are a few dozen chunks rather than
+hundreds. Each chunk gets its own child seed, and chunks can run in worker
+processes, which receive the trade arrays once, without changing the results.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from config import BOOTSTRAP_DEFAULTS
+from helpers.utils import factorize_labels, series_or_none
+
+BOOTSTRAP_METRICS = ("WinRate", "Expectancy", "Profit Factor", "Max Drawdown", "Avg R/R")
+
+OUTCOME_WIN = 1
+OUTCOME_LOSS = -1
+
+# Trade arrays of a worker process, set once by _init_bootstrap_worker.
+_worker_arrays: tuple | None = None
+
+
+def bootstrap_samples(
+    rr: np.ndarray | None,
+    outcome_codes: np.ndarray | None,
+    resamples: int = BOOTSTRAP_DEFAULTS["resamples"],
+    seed: int | None = BOOTSTRAP_DEFAULTS["seed"],
+    chunk_bytes: int = BOOTSTRAP_DEFAULTS["chunk_bytes"],
+    max_workers: int | None = 1,
+    min_chunk_rows: int = BOOTSTRAP_DEFAULTS["min_chunk_rows"],
+) -> dict[str, np.ndarray]:
+    """Bootstrap the core statistics over resampled trades.
+
+    Args:
+        rr: R per trade (NaN when missing), or None.
+        outcome_codes: Per-trade ``OUTCOME_WIN``/``OUTCOME_LOSS``/0 codes, or None.
+        resamples: Number of bootstrap resamples.
+        seed: Seed for reproducible resamples.
+        chunk_bytes: Approximate memory budget for one chunk of resamples.
+        max_workers: Worker processes; 1 runs in-process.
+        min_chunk_rows: Fewest resamples per chunk, whatever ``chunk_bytes`` allows.
+
+    Returns:
+        dict: Metric name -> array of ``resamples`` values. Metrics that need a
+        missing input are left out.
+    """
+    n = len(rr) if rr is not None else len(outcome_codes)
+    if n == 0 or resamples <= 0:
+        return {}
+
+    rr_values = np.nan_to_num(rr, nan=0.0) if rr is not None else None
+    has_rr = ~np.isnan(rr) if rr is not None and np.isnan(rr).any() else None
+    codes = outcome_codes.astype(np.int8) if outcome_codes is not None else None
+
+    # Per resample: int32 indices, two float64 buffers and a few byte-sized masks.
+    # Chunk sizes never depend on max_workers, so neither do the results.
+    rows = min(resamples, max(1, min_chunk_rows, chunk_bytes // (n * 24)))
+    sizes = [rows] * (resamples // rows) + ([resamples % rows] if resamples % rows else [])
+    tasks = list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+    arrays = (rr_values, has_rr, codes)
+
+    if max_workers == 1 or len(tasks) == 1:
+        chunks = [_bootstrap_chunk(*arrays, size, child) for size, child in tasks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_bootstrap_worker, initargs=arrays
+        ) as executor:
+            chunks = list(executor.map(_worker_chunk, tasks))
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+
+
+def confidence_intervals(
+    samples: dict[str, np.ndarray], confidence: float = BOOTSTRAP_DEFAULTS["confidence"]
+) -> dict[str, tuple[float, float]]:
+    """Percentile confidence intervals from bootstrap samples."""
+    tail = (1 - confidence) / 2 * 100
+    # inverted_cdf never interpolates, so infinite profit factors stay well defined.
+    return {
+        name: tuple(float(value) for value in np.percentile(values, [tail, 100 - tail], method="inverted_cdf"))
+        for name, values in samples.items()
+    }
+
+
+def bootstrap_intervals(
+    df: pd.DataFrame,
+    resamples: int = BOOTSTRAP_DEFAULTS["resamples"],
+    confidence: float = BOOTSTRAP_DEFAULTS["confidence"],
+    seed: int | None = BOOTSTRAP_DEFAULTS["seed"],
+    max_workers: int | None = 1,
+) -> dict[str, tuple[float, float]]:
+    """Bootstrap confidence intervals for a normalized journal's core stats."""
+    rr_series = series_or_none(df, "rr")
+    outcome_codes = None
+    if "outcome" in df.columns:
+        codes, labels = factorize_labels(df["outcome"])
+        lookup = np.array(
+            [OUTCOME_WIN if label == "WIN" else OUTCOME_LOSS if label == "LOSS" else 0 for label in labels] + [0],
+            dtype=np.int8,
+        )
+        outcome_codes = lookup[codes]
+
+    samples = bootstrap_samples(
+        rr_series.to_numpy(dtype=float) if rr_series is not None else None,
+        outcome_codes,
+        resamples=resamples,
+        seed=seed,
+        max_workers=max_workers,
+    )
+    return confidence_intervals(samples, confidence)
+
+
+def format_intervals(
+    stats: dict, intervals: dict[str, tuple[float, float]], confidence: float = BOOTSTRAP_DEFAULTS["confidence"]
+) -> dict:
+    """Insert formatted intervals after the matching point estimates in a stats table."""
+    formats = {
+        "WinRate": lambda value: f"{value * 100:.2f}%",
+        "Expectancy": lambda value: f"{value:.2f}",
+        "Profit Factor": lambda value: f"{value:.2f}",
+        "Max Drawdown": lambda value: f"{value:.2f}R",
+        "Avg R/R": lambda value: f"{value:.2f}",
+    }
+    label = f"{confidence * 100:g}% CI"
+    result: dict = {}
+    for key, value in stats.items():
+        result[key] = value
+        if key in intervals:
+            low, high = intervals[key]
+            result[f"{key} {label}"] = f"{formats[key](low)} to {formats[key](high)}"
+    return result
+
+
+def _init_bootstrap_worker(rr: np.ndarray | None, has_rr: np.ndarray | None, codes: np.ndarray | None) -> None:
+    global _worker_arrays
+    _worker_arrays = (rr, has_rr, codes)
+
+
+def _worker_chunk(task: tuple) -> dict[str, np.ndarray]:
+    return _bootstrap_chunk(*_worker_arrays, *task)
+
+
+def _bootstrap_chunk(
+    rr: np.ndarray | None,
+    has_rr: np.ndarray | None,
+    codes: np.ndarray | None,
+    size: int,
+    seed: np.random.SeedSequence,
+) -> dict[str, np.ndarray]:
+    n = len(rr) if rr is not None else len(codes)
+    rng = np.random.default_rng(seed)
+    index = rng.integers(0, n, size=(size, n), dtype=np.int32 if n < 2**31 else np.int64)
+    results: dict[str, np.ndarray] = {}
+
+    wins = losses = None
+    if codes is not None:
+        drawn_codes = codes[index]
+        wins = np.count_nonzero(drawn_codes == OUTCOME_WIN, axis=1)
+        losses = np.count_nonzero(drawn_codes == OUTCOME_LOSS, axis=1)
+        del drawn_codes
+        decided = wins + losses
+        with np.errstate(divide="ignore", invalid="ignore"):
+            results["WinRate"] = np.where(decided > 0, wins / np.maximum(decided, 1), 0.0)
+
+    if rr is None:
+        return results
+
+    drawn = rr[index]
+    drawn_has_rr = has_rr[index] if has_rr is not None else None
+    del index
+    scratch = np.empty_like(drawn)
+    gross_profit = np.maximum(drawn, 0.0, out=scratch).sum(axis=1)
+    win_count = np.count_nonzero(drawn > 0, axis=1)
+    loss_count = np.count_nonzero(drawn < 0, axis=1)
+    rr_count = np.count_nonzero(drawn_has_rr, axis=1) if drawn_has_rr is not None else np.full(size, n)
+
+    # Max drawdown of the resampled sequence, as in max_drawdown_r (missing R is skipped).
+    cumulative = np.cumsum(drawn, axis=1, out=drawn)
+    total = cumulative[:, -1].copy()
+    if drawn_has_rr is not None:
+        seen = np.logical_or.accumulate(drawn_has_rr, axis=1)
+        scratch.fill(-np.inf)
+        np.copyto(scratch, cumulative, where=seen)
+        np.maximum.accumulate(scratch, axis=1, out=scratch)
+        np.subtract(cumulative, scratch, out=scratch)
+        np.copyto(scratch, 0.0, where=~seen)
+    else:
+        np.maximum.accumulate(cumulative, axis=1, out=scratch)
+        np.subtract(cumulative, scratch, out=scratch)
+    results["Max Drawdown"] = -scratch.min(axis=1)
+
+    gross_loss = gross_profit - total
+    with np.errstate(divide="ignore", invalid="ignore"):
+        results["Profit Factor"] = np.where(loss_count > 0, gross_profit / gross_loss, np.inf)
+        results["Avg R/R"] = np.where(rr_count > 0, total / np.maximum(rr_count, 1), np.nan)
+        if wins is not None:
+            decided = np.maximum(wins + losses, 1)
+            avg_win = np.where(win_count > 0, gross_profit / np.maximum(win_count, 1), 0.0)
+            avg_loss = np.where(loss_count > 0, gross_loss / np.maximum(loss_count, 1), 0.0)
+            results["Expectancy"] = np.where(
+                wins + losses > 0, wins / decided * avg_win - losses / decided * avg_loss, 0.0
+            )
+    return results
@@ -0,0 +1,164 @@
+"""Vectorized per-group statistics for setup, session, asset, and other breakdowns."""
+
+import numpy as np
+import pandas as pd
+
+from helpers.kernels import segment_max_drawdown, segment_max_run
+from helpers.utils import factorize_labels, series_or_none
+
+BREAKDOWN_COLUMNS = [
+    "Trades",
+    "Wins",
+    "Losses",
+    "Breakevens",
+    "WinRate",
+    "Total R",
+    "Avg R",
+    "Expectancy",
+    "Profit Factor",
+    "Max Drawdown",
+    "Consecutive Wins",
+    "Consecutive Losses",
+]
+
+
+def group_breakdown(
+    df: pd.DataFrame,
+    by: str | list[str],
+    labels: dict[str, tuple[np.ndarray, pd.Index]] | None = None,
+) -> pd.DataFrame:
+    """Compute the core stats for every group in a single sorted pass.
+
+    Rows are stably sorted by a combined integer group code, so each group
+    becomes one contiguous segment in journal order. Sums and counts use
+    ``np.add.reduceat`` over segment starts; drawdown and streaks use
+    segment-local cumulative sums and run-length encoding.
+
+    Args:
+        df: Normalized journal.
+        by: Column name or list of column names (e.g. ``["setup", "session"]``).
+        labels: Optional precomputed ``factorize_labels`` results by column
+            (group columns and ``outcome``), e.g. shared between breakdowns.
+
+    Returns:
+        pd.DataFrame: One row per group, indexed by the group labels, with the
+        columns in ``BREAKDOWN_COLUMNS``. Rows with a missing group label are
+        left out, as with ``groupby``.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    missing = [column for column in by if column not in df.columns]
+    if missing:
+        raise ValueError(f"Cannot break down by missing column(s): {', '.join(missing)}")
+
+    labels = labels or {}
+    group_codes, levels = _combined_codes(df, by, labels)
+    valid = group_codes >= 0
+    order = np.flatnonzero(valid)[np.argsort(group_codes[valid], kind="stable")]
+    sorted_codes = group_codes[order]
+    if len(sorted_codes) == 0:
+        return pd.DataFrame(columns=BREAKDOWN_COLUMNS, index=pd.MultiIndex.from_arrays([[]] * len(by), names=by))
+
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+
+    rr_series = series_or_none(df, "rr")
+    rr = rr_series.to_numpy(dtype=float)[order] if rr_series is not None else np.full(len(order), np.nan)
+    if "outcome" in df.columns:
+        outcome_codes, outcome_labels = labels.get("outcome") or factorize_labels(df["outcome"])
+        outcome_codes = outcome_codes[order]
+    else:
+        outcome_codes, outcome_labels = np.full(len(order), -1), pd.Index([])
+
+    has_rr = ~np.isnan(rr)
+    rr_filled = np.where(has_rr, rr, 0.0)
+    is_win = _label_mask(outcome_codes, outcome_labels, "WIN")
+    is_loss = _label_mask(outcome_codes, outcome_labels, "LOSS")
+    is_breakeven = _label_mask(outcome_codes, outcome_labels, "BE")
+
+    trades = np.diff(np.r_[starts, len(order)])
+    wins = np.add.reduceat(is_win.astype(np.int64), starts)
+    losses = np.add.reduceat(is_loss.astype(np.int64), starts)
+    breakevens = np.add.reduceat(is_breakeven.astype(np.int64), starts)
+    rr_count = np.add.reduceat(has_rr.astype(np.int64), starts)
+    total_r = np.add.reduceat(rr_filled, starts)
+    gross_profit = np.add.reduceat(np.where(rr_filled > 0, rr_filled, 0.0), starts)
+    gross_loss = -np.add.reduceat(np.where(rr_filled < 0, rr_filled, 0.0), starts)
+    win_rr_count = np.add.reduceat((rr_filled > 0).astype(np.int64), starts)
+    loss_rr_count = np.add.reduceat((rr_filled < 0).astype(np.int64), starts)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        decided = wins + losses
+        win_rate = np.where(decided > 0, wins / np.maximum(decided, 1), 0.0)
+        loss_rate = np.where(decided > 0, losses / np.maximum(decided, 1), 0.0)
+        avg_r = np.where(rr_count > 0, total_r / np.maximum(rr_count, 1), np.nan)
+        avg_win = np.where(win_rr_count > 0, gross_profit / np.maximum(win_rr_count, 1), 0.0)
+        avg_loss = np.where(loss_rr_count > 0, gross_loss / np.maximum(loss_rr_count, 1), 0.0)
+        expectancy = np.where(decided > 0, win_rate * avg_win - loss_rate * avg_loss, 0.0)
+        profit_factor = np.where(gross_loss > 0, gross_profit / gross_loss, np.inf)
+
+    max_drawdown = segment_max_drawdown(rr_filled, has_rr, starts)
+    consecutive_wins = segment_max_run(is_win, starts)
+    consecutive_losses = segment_max_run(is_loss, starts)
+
+    index = _group_index(sorted_codes[starts], levels, by)
+    return pd.DataFrame(
+        {
+            "Trades": trades,
+            "Wins": wins,
+            "Losses": losses,
+            "Breakevens": breakevens,
+            "WinRate": win_rate,
+            "Total R": total_r,
+            "Avg R": avg_r,
+            "Expectancy": np.round(expectancy, 2),
+            "Profit Factor": profit_factor,
+            "Max Drawdown": max_drawdown,
+            "Consecutive Wins": consecutive_wins,
+            "Consecutive Losses": consecutive_losses,
+        },
+        index=index,
+    )
+
+
+def format_breakdown(breakdown: pd.DataFrame) -> pd.DataFrame:
+    """Format breakdown values the same way as the stats tables."""
+    formatted = breakdown.copy().astype(object)
+    formatted["WinRate"] = [f"{value * 100:.2f}%" for value in breakdown["WinRate"]]
+    for column in ("Total R", "Avg R", "Expectancy", "Profit Factor"):
+        formatted[column] = [f"{value:.2f}" for value in breakdown[column]]
+    formatted["Max Drawdown"] = [f"{value:.2f}R" for value in breakdown["Max Drawdown"]]
+    return formatted
+
+
+def _combined_codes(
+    df: pd.DataFrame, by: list[str], labels: dict[str, tuple[np.ndarray, pd.Index]]
+) -> tuple[np.ndarray, list[pd.Index]]:
+    """Factorize each level and combine the codes into one mixed-radix integer."""
+    combined = np.zeros(len(df), dtype=np.int64)
+    levels: list[pd.Index] = []
+    for column in by:
+        codes, uniques = labels.get(column) or factorize_labels(df[column])
+        order = np.argsort(uniques.to_numpy(dtype=object).astype(str), kind="stable")
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        codes = np.where(codes >= 0, rank[np.maximum(codes, 0)] if len(order) else -1, -1)
+        combined = np.where((combined < 0) | (codes < 0), -1, combined * max(len(uniques), 1) + codes)
+        levels.append(pd.Index(uniques.take(order), name=column))
+    return combined, levels
+
+
+def _label_mask(codes: np.ndarray, labels: pd.Index, label: str) -> np.ndarray:
+    matches = np.flatnonzero(labels == label)
+    return np.isin(codes, matches) if len(matches) else np.zeros(len(codes), dtype=bool)
+
+
+def _group_index(codes: np.ndarray, levels: list[pd.Index], by: list[str]) -> pd.Index:
+    """Decode combined group codes back into (multi-level) labels."""
+    arrays = []
+    for level in reversed(levels):
+        size = max(len(level), 1)
+        arrays.append(level.take(codes % size))
+        codes = codes // size
+    arrays.reverse()
+    if len(by) == 1:
+        return pd.Index(arrays[0], name=by[0])
+    return pd.MultiIndex.from_arrays(arrays, names=by)
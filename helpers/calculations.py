@@ -2,8 +2,10 @@ import numpy as np
 import pandas as pd
 from datetime import datetime, time
 
-from config import DAY_ORDER
-from helpers.utils import has_non_empty, series_or_none, weekly_day_labels
+from config import BOOTSTRAP_DEFAULTS, DAY_ORDER
+from helpers.bootstrap import bootstrap_intervals, format_intervals
+from helpers.kernels import max_drawdown, max_relative_drawdown, max_streaks
+from helpers.utils import has_non_empty, series_or_none, trade_dates, weekly_day_labels
 
 
 def winrate(
@@ -132,13 +134,12 @@ def max_drawdown_from_pct_returns(
             cumulative_returns = pd.Series(cumulative_returns)
         returns_curve = cumulative_returns
 
-    peak = returns_curve.cummax()
-    # Check for division-by-zero (1 + peak == 0)
-    if (1 + peak).eq(0).any():
+    curve = returns_curve.to_numpy(dtype=float)
+    # Check for division-by-zero (1 + peak == 0); a -100% peak needs a -100% value first.
+    if (curve == -1).any() and (1 + returns_curve.cummax()).eq(0).any():
         raise ValueError("Cannot compute drawdown: peak value of -100% detected")
 
-    drawdown = (returns_curve - peak) / (1 + peak)
-    return -drawdown.min()  # make it positive dd value
+    return max_relative_drawdown(curve, offset=1.0)  # positive dd value
 
 
 def max_drawdown_from_equity(equity_balances=None) -> float:
@@ -166,9 +167,7 @@ def max_drawdown_from_equity(equity_balances=None) -> float:
     if (equity_balances <= 0).any():
         raise ValueError("equity_balances cannot contain zero or negative values")
 
-    peak = equity_balances.cummax()
-    drawdown = (equity_balances - peak) / peak
-    return -drawdown.min()
+    return max_relative_drawdown(equity_balances.to_numpy(dtype=float))
 
 
 def expectancy_from_rr(outcomes: pd.Series, rr_series: pd.Series) -> float:
@@ -239,25 +238,10 @@ def consecutive_wins_and_losses(
     if outcome.empty:
         return (0, 0)
 
-    max_loss_streak = 0
-    max_win_streak = 0
-    current_loss_streak = 0
-    current_win_streak = 0
-
-    for value in outcome:
-        if value == loss_str:
-            current_loss_streak += 1
-            current_win_streak = 0
-            max_loss_streak = max(max_loss_streak, current_loss_streak)
-        elif value == win_str:
-            current_win_streak += 1
-            current_loss_streak = 0
-            max_win_streak = max(max_win_streak, current_win_streak)
-        else:
-            current_loss_streak = 0
-            current_win_streak = 0
-
-    return (max_loss_streak, max_win_streak)
+    is_loss = outcome.eq(loss_str).to_numpy(dtype=bool, na_value=False)
+    is_win = outcome.eq(win_str).to_numpy(dtype=bool, na_value=False)
+    codes = is_win.astype(np.int8) - is_loss.astype(np.int8)
+    return max_streaks(codes)
 
 
 
@@ -281,9 +265,7 @@ def max_drawdown_r(rr_series: pd.Series) -> float:
     if rr_series.empty:
         return 0.0
 
-    cumulative_rr = rr_series.cumsum()
-    drawdown = cumulative_rr - cumulative_rr.cummax()
-    return abs(float(drawdown.min()))
+    return max_drawdown(rr_series.to_numpy(dtype=float))
 
 
 def stats_table_weekly(df: pd.DataFrame) -> dict:
@@ -302,8 +284,8 @@ def stats_table_weekly(df: pd.DataFrame) -> dict:
                 stats["Best Day"] = f"{daily_rr.idxmax().title()} ({daily_rr.max():.2f}R)"
                 stats["Worst Day"] = f"{daily_rr.idxmin().title()} ({daily_rr.min():.2f}R)"
 
-    if has_non_empty(df, "trade_date"):
-        valid_dates = pd.to_datetime(df["trade_date"], errors="coerce").dropna()
+    if "trade_date" in df.columns:
+        valid_dates = trade_dates(df["trade_date"]).dropna()
         if not valid_dates.empty:
             stats["Week Range"] = (
                 f"{valid_dates.min().strftime('%Y-%m-%d')} to "
@@ -318,8 +300,19 @@ def stats_table_weekly(df: pd.DataFrame) -> dict:
     return stats
 
 
-def stats_table_overall(df: pd.DataFrame) -> dict:
-    """Calculate summary statistics for the overall report."""
+def stats_table_overall(
+    df: pd.DataFrame,
+    resamples: int = 0,
+    seed: int | None = BOOTSTRAP_DEFAULTS["seed"],
+    confidence: float = BOOTSTRAP_DEFAULTS["confidence"],
+    max_workers: int | None = 1,
+) -> dict:
+    """Calculate summary statistics for the overall report.
+
+    With ``resamples`` > 0, bootstrap percentile confidence intervals for
+    WinRate, Expectancy, Profit Factor, Max Drawdown and Avg R/R are added
+    after the matching entries.
+    """
     stats: dict[str, str | int] = {"Total Trades": len(df)}
     rr_series = series_or_none(df, "rr")
     position_size = series_or_none(df, "position_size")
@@ -355,4 +348,8 @@ def stats_table_overall(df: pd.DataFrame) -> dict:
     if has_non_empty(df, "asset"):
         stats["Assets Traded"] = df["asset"].dropna().nunique()
 
+    if resamples > 0 and len(df):
+        intervals = bootstrap_intervals(df, resamples, confidence, seed, max_workers)
+        stats = format_intervals(stats, intervals, confidence)
+
     return stats
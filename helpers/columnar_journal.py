@@ -0,0 +1,409 @@
+"""Native columnar journal storage with memory-mapped loading.
+
+A columnar journal is a directory holding one ``.npy`` file per normalized
+column plus a ``journal.json`` manifest. Numeric, date and time columns are
+opened with ``mmap_mode="r"`` so reports only page in the columns they read.
+Arrow IPC files are supported when ``pyarrow`` is installed.
+"""
+
+import io
+import json
+import os
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    ARROW_SUFFIXES,
+    CALENDAR_COLUMNS,
+    COLUMNAR_MANIFEST,
+    COLUMNAR_NUMERIC_COLUMNS,
+    COLUMNAR_TIME_COLUMNS,
+)
+from helpers.data_cleaning import add_calendar_columns, time_strings_to_seconds
+from helpers.utils import column_profile, factorize_labels
+
+COLUMNAR_FORMAT = "tj-columnar"
+COLUMNAR_VERSION = 1
+MISSING_TIME = -1
+MISSING_CODE = -1
+
+# Stored columns that derived calendar columns are rebuilt from on load.
+CALENDAR_SOURCES = {
+    "trade_weekday": ["trade_day", "trade_date"],
+    "trade_month": ["trade_date"],
+    "entry_hour": ["entry_time"],
+}
+CALENDAR_OPTIONAL_SOURCES = {"trade_day"}
+
+
+def is_columnar_journal(path: str | Path) -> bool:
+    """Check whether a path is a columnar journal directory or Arrow IPC file."""
+    path = Path(path)
+    if path.is_dir():
+        return (path / COLUMNAR_MANIFEST).exists()
+    return path.suffix.lower() in ARROW_SUFFIXES
+
+
+def read_columnar_journal(
+    path: str | Path,
+    columns: list[str] | None = None,
+    decode_times: bool = True,
+    missing_ok: bool = False,
+) -> pd.DataFrame:
+    """Load a normalized columnar journal without re-normalizing it.
+
+    Args:
+        path: Columnar journal directory or Arrow IPC file.
+        columns: Optional subset of columns to load; the rest are never opened.
+        decode_times: Also rebuild ``HH:MM:SS`` strings for time columns. The raw
+            seconds-of-day values are always exposed as ``<column>_seconds``.
+        missing_ok: Skip requested columns the journal lacks instead of raising.
+
+    Returns:
+        pd.DataFrame: Normalized journal marked with ``attrs["normalized"]``.
+    """
+    path = Path(path)
+    if path.is_dir():
+        data = _read_npy_columns(path, columns, missing_ok)
+    else:
+        data = _read_arrow_columns(path, columns, missing_ok)
+
+    df = decode_columns(data, decode_times)
+    df.attrs["column_profile"] = _load_profile(path, df)
+    return df
+
+
+def decode_columns(data: dict[str, tuple], decode_times: bool = True) -> pd.DataFrame:
+    """Build a normalized journal from ``{name: (kind, values, extra)}`` stored columns.
+
+    Calendar columns are rebuilt, and the frame is marked with
+    ``attrs["normalized"]``; the caller attaches the column profile.
+    """
+    frame: dict[str, pd.Series] = {}
+    for name, (kind, values, extra) in data.items():
+        if kind == "time":
+            frame[f"{name}_seconds"] = pd.Series(values, name=f"{name}_seconds", copy=False)
+            if decode_times:
+                frame[name] = seconds_to_time_strings(values)
+        elif kind == "category":
+            frame[name] = pd.Series(
+                pd.Categorical.from_codes(values, categories=extra, validate=False), name=name
+            )
+        elif kind == "datetime":
+            series = pd.Series(values, name=name, copy=False)
+            frame[name] = series.dt.tz_localize("UTC").dt.tz_convert(extra) if extra else series
+        else:
+            frame[name] = pd.Series(values, name=name, copy=False)
+
+    df = add_calendar_columns(pd.DataFrame(frame, copy=False))
+    df.attrs["normalized"] = True
+    df.attrs["detected_mappings"] = {name: name for name in data}
+    return df
+
+
+def write_columnar_journal(df: pd.DataFrame, path: str | Path) -> Path:
+    """Write a normalized journal as a directory of ``.npy`` column files."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    manifest = {"format": COLUMNAR_FORMAT, "version": COLUMNAR_VERSION, "rows": len(df), "columns": {}}
+
+    for name in df.columns:
+        if name in CALENDAR_COLUMNS:
+            continue
+        kind, values, extra = encode_column(df[name], name)
+        np.save(path / f"{name}.npy", values, allow_pickle=False)
+        manifest["columns"][name] = {"kind": kind, "file": f"{name}.npy", "extra": extra}
+
+    manifest["profile"] = column_profile(df, list(manifest["columns"]))["columns"]
+    _write_manifest(path, manifest)
+    return path
+
+
+def append_columnar_journal(df: pd.DataFrame, path: str | Path) -> int:
+    """Append normalized trades to an existing columnar journal in place.
+
+    Column files are extended on disk and their ``.npy`` headers rewritten, so
+    existing data is never re-read. New category labels are added to the end of
+    the stored categories, keeping old codes valid.
+
+    Returns:
+        int: Total number of rows after the append.
+    """
+    path = Path(path)
+    manifest = _read_manifest(path)
+    stored = manifest["columns"]
+    unknown = [name for name in df.columns if name not in stored and name not in CALENDAR_COLUMNS]
+    if unknown:
+        raise ValueError(f"Columns not present in the columnar journal: {', '.join(unknown)}")
+
+    # Encode and check every column before touching any file, so a rejected
+    # append leaves the journal as it was.
+    profile = manifest.get("profile")
+    encoded = {}
+    for name, spec in stored.items():
+        series = df[name] if name in df.columns else pd.Series(pd.NA, index=df.index, dtype="object")
+        kind, values, extra = encode_column(series, name, kind=spec["kind"], categories=spec["extra"])
+        if kind == "datetime" and spec["extra"] != extra and len(series.dropna()):
+            raise ValueError(f"Time zone mismatch for {name}: {spec['extra']} vs {extra}")
+        encoded[name] = (series, values, extra)
+
+    originals = []
+    try:
+        for name, spec in stored.items():
+            series, values, extra = encoded[name]
+            originals.append(_append_npy(path / spec["file"], values))
+            if spec["kind"] == "category":
+                spec["extra"] = extra
+            if profile and name in profile:
+                appended = column_profile(series.to_frame(name))["columns"][name]
+                profile[name] = _merge_profile_entry(profile[name], appended, spec)
+
+        manifest["rows"] += len(df)
+        _write_manifest(path, manifest)
+    except BaseException:
+        for original in originals:
+            _restore_npy(*original)
+        raise
+    return manifest["rows"]
+
+
+def write_arrow_journal(df: pd.DataFrame, path: str | Path) -> Path:
+    """Write a normalized journal as an Arrow IPC file (requires ``pyarrow``)."""
+    pa = _require_pyarrow()
+    path = Path(path)
+    arrays, names = [], []
+    for name in df.columns:
+        if name in CALENDAR_COLUMNS:
+            continue
+        kind, values, extra = encode_column(df[name], name)
+        if kind == "category":
+            arrays.append(pa.DictionaryArray.from_arrays(
+                pa.array(values, mask=values == MISSING_CODE), pa.array(extra, type=pa.string())
+            ))
+        elif kind == "datetime":
+            arrays.append(pa.array(values, type=pa.timestamp(np.datetime_data(values.dtype)[0], tz=extra)))
+        else:
+            arrays.append(pa.array(values))
+        names.append(name)
+
+    table = pa.Table.from_arrays(arrays, names=names)
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return path
+
+
+def seconds_to_time_strings(seconds: np.ndarray) -> pd.Series:
+    """Format seconds-of-day as ``HH:MM:SS`` strings, with missing values as None."""
+    seconds = np.asarray(seconds)
+    valid = seconds != MISSING_TIME
+    # Format the (at most 86,400) distinct values once and gather per row.
+    unique, inverse = np.unique(seconds[valid], return_inverse=True)
+    labels = np.array(
+        [f"{value // 3600:02d}:{value % 3600 // 60:02d}:{value % 60:02d}" for value in unique.tolist()],
+        dtype=object,
+    )
+    result = np.full(len(seconds), None, dtype=object)
+    result[valid] = labels[inverse]
+    return pd.Series(result, dtype="object")
+
+
+def encode_column(
+    series: pd.Series,
+    name: str,
+    kind: str | None = None,
+    categories: list[str] | None = None,
+) -> tuple[str, np.ndarray, object]:
+    """Encode a column as (kind, numpy values, kind-specific metadata)."""
+    if kind is None:
+        if name in COLUMNAR_NUMERIC_COLUMNS or (
+            pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+        ):
+            kind = "numeric"
+        elif name in COLUMNAR_TIME_COLUMNS:
+            kind = "time"
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            kind = "datetime"
+        else:
+            kind = "category"
+
+    if kind == "numeric":
+        return kind, pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan), None
+    if kind == "time":
+        return kind, time_strings_to_seconds(series), None
+    if kind == "datetime":
+        dates = pd.to_datetime(series, errors="coerce")
+        tz = str(dates.dt.tz) if dates.dt.tz is not None else None
+        if tz:
+            dates = dates.dt.tz_convert("UTC").dt.tz_localize(None)
+        return kind, dates.to_numpy(), tz
+
+    text = series.astype("object").where(series.notna(), None)
+    codes, uniques = pd.factorize(text, use_na_sentinel=True)
+    known = list(categories or [])
+    positions = {label: index for index, label in enumerate(known)}
+    for label in map(str, uniques):
+        if label not in positions:
+            positions[label] = len(known)
+            known.append(label)
+    # The trailing sentinel maps factorize's -1 (missing) onto MISSING_CODE.
+    remap = np.array([positions[str(label)] for label in uniques] + [MISSING_CODE], dtype=np.int32)
+    return "category", remap[codes], known
+
+
+def _load_profile(path: Path, df: pd.DataFrame) -> dict:
+    """Use the profile stored at write time where available and profile the rest."""
+    stored = _read_manifest(path).get("profile", {}) if path.is_dir() else {}
+    missing = [name for name in df.columns if name not in stored]
+    entries = column_profile(df, missing)["columns"]
+    for name in df.columns:
+        if name in stored:
+            entries[name] = {**stored[name], "dtype": str(df[name].dtype)}
+    return {"rows": len(df), "columns": {name: entries[name] for name in df.columns}}
+
+
+def _merge_profile_entry(old: dict, new: dict, spec: dict) -> dict:
+    """Combine the stored profile of a column with the profile of appended rows.
+
+    Distinct counts of label columns are recounted from the stored categories;
+    for other columns they cannot be merged and become None.
+    """
+    bounds = [value for value in (old["min"], new["min"], old["max"], new["max"]) if value is not None]
+    if spec["kind"] == "category":
+        distinct = len(factorize_labels(pd.Series(spec["extra"], dtype="object"))[1])
+    else:
+        distinct = None
+    return {
+        **old,
+        "non_null": old["non_null"] + new["non_null"],
+        "non_empty": old["non_empty"] or new["non_empty"],
+        "distinct": distinct,
+        "min": min(bounds) if bounds else None,
+        "max": max(bounds) if bounds else None,
+    }
+
+
+def _read_npy_columns(path: Path, columns: list[str] | None, missing_ok: bool = False) -> dict[str, tuple]:
+    manifest = _read_manifest(path)
+    selected = select_columns(manifest["columns"], columns, missing_ok)
+    data = {}
+    for name in selected:
+        spec = manifest["columns"][name]
+        mmap_mode = None if spec["kind"] == "category" else "r"
+        values = np.load(path / spec["file"], mmap_mode=mmap_mode, allow_pickle=False)
+        if len(values) != manifest["rows"]:
+            raise ValueError(f"Column {name} has {len(values)} rows, expected {manifest['rows']}")
+        data[name] = (spec["kind"], values, spec["extra"])
+    return data
+
+
+def _read_arrow_columns(path: Path, columns: list[str] | None, missing_ok: bool = False) -> dict[str, tuple]:
+    pa = _require_pyarrow()
+    with pa.memory_map(str(path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+
+    selected = select_columns(dict.fromkeys(table.column_names), columns, missing_ok)
+    data = {}
+    for name in selected:
+        column = table.column(name).combine_chunks()
+        if pa.types.is_dictionary(column.type):
+            codes = column.indices.fill_null(MISSING_CODE).to_numpy().astype(np.int32)
+            data[name] = ("category", codes, column.dictionary.to_pylist())
+        elif pa.types.is_timestamp(column.type):
+            values = column.to_numpy(zero_copy_only=column.null_count == 0)
+            data[name] = ("datetime", values, column.type.tz)
+        elif name in COLUMNAR_TIME_COLUMNS:
+            data[name] = ("time", column.to_numpy(zero_copy_only=column.null_count == 0), None)
+        else:
+            data[name] = ("numeric", column.to_numpy(zero_copy_only=column.null_count == 0), None)
+    return data
+
+
+def select_columns(available: dict, columns: list[str] | None, missing_ok: bool = False) -> list[str]:
+    if columns is None:
+        return list(available)
+    wanted = set()
+    for column in columns:
+        wanted.update(CALENDAR_SOURCES.get(column, [column.removesuffix("_seconds")]))
+    missing = {column for column in wanted if column not in CALENDAR_OPTIONAL_SOURCES} - set(available)
+    if missing and not missing_ok:
+        raise ValueError(f"Columns not present in the stored journal: {', '.join(sorted(missing))}")
+    return [name for name in available if name in wanted]
+
+
+def _append_npy(path: Path, values: np.ndarray) -> tuple[Path, int, bytes]:
+    """Append rows to a 1-D ``.npy`` file and rewrite its header in place.
+
+    Returns:
+        tuple: The path, original size, and original header, for ``_restore_npy``.
+    """
+    with path.open("r+b") as file:
+        version = np.lib.format.read_magic(file)
+        read_header, write_header = (
+            (np.lib.format.read_array_header_1_0, np.lib.format.write_array_header_1_0)
+            if version == (1, 0)
+            else (np.lib.format.read_array_header_2_0, np.lib.format.write_array_header_2_0)
+        )
+        shape, fortran_order, dtype = read_header(file)
+        data_offset = file.tell()
+        if len(shape) != 1 or fortran_order:
+            raise ValueError(f"Cannot append to non 1-D column file: {path}")
+
+        # Build the new header first; it must fit the space the old one reserved.
+        header = io.BytesIO()
+        write_header(
+            header,
+            {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (shape[0] + len(values),)},
+        )
+        if len(header.getvalue()) != data_offset:
+            raise ValueError(f"Column header grew past its reserved space: {path}")
+
+        file.seek(0)
+        original_header = file.read(data_offset)
+        original_size = file.seek(0, os.SEEK_END)
+        try:
+            file.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+            file.seek(0)
+            file.write(header.getvalue())
+        except BaseException:
+            _restore_npy(file, original_size, original_header)
+            raise
+    return path, original_size, original_header
+
+
+def _restore_npy(target: Path | BinaryIO, size: int, header: bytes) -> None:
+    """Undo ``_append_npy``: cut a column file back to its old size and header."""
+    if isinstance(target, Path):
+        with target.open("r+b") as file:
+            _restore_npy(file, size, header)
+        return
+    target.truncate(size)
+    target.seek(0)
+    target.write(header)
+
+
+def _read_manifest(path: Path) -> dict:
+    manifest_path = path / COLUMNAR_MANIFEST
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"Columnar journal manifest not found: {manifest_path}")
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if manifest.get("format") != COLUMNAR_FORMAT:
+        raise ValueError(f"Not a columnar journal: {path}")
+    return manifest
+
+
+def _write_manifest(path: Path, manifest: dict) -> None:
+    temp_path = path / f".{COLUMNAR_MANIFEST}.tmp"
+    temp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(temp_path, path / COLUMNAR_MANIFEST)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as error:
+        raise ImportError("pyarrow is required to read or write Arrow IPC journals.") from error
+    return pa
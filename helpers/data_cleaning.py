@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 
+from config import EXCEL_SERIAL_MAX, UNIX_MILLISECONDS_MIN, WEEKDAY_NAMES
+
 
 def convert_to_datetime(
     date_series: pd.Series,
@@ -14,9 +16,8 @@ def convert_to_datetime(
         raise ValueError("Input Series is empty.")
 
     if pd.api.types.is_numeric_dtype(date_series):
-        unix_result = pd.to_datetime(date_series, errors="coerce", origin=origin, unit="s")
-        excel_result = pd.to_datetime(date_series, errors="coerce", origin="1899-12-30", unit="D")
-        result = unix_result.where(~unix_result.isna(), excel_result)
+        unit, origin = _numeric_date_encoding(date_series, origin)
+        result = pd.to_datetime(date_series, errors="coerce", origin=origin, unit=unit)
     else:
         result = pd.to_datetime(date_series, errors="coerce", origin=origin, format=format)
 
@@ -32,6 +33,87 @@ def convert_to_datetime(
     return result
 
 
+def _numeric_date_encoding(date_series: pd.Series, origin: str | float) -> tuple[str, str | float]:
+    """Pick one unit/epoch for a numeric date column from the magnitude of its values.
+
+    Excel serial days for modern dates are below ~100,000, Unix seconds are
+    around 1e9, and Unix milliseconds around 1e12.
+    """
+    if origin != "unix":
+        return "s", origin
+
+    values = pd.to_numeric(date_series, errors="coerce").to_numpy(dtype=float)
+    values = np.abs(values[np.isfinite(values)])
+    magnitude = float(np.median(values)) if len(values) else 0.0
+    if 0 < magnitude < EXCEL_SERIAL_MAX:
+        return "D", "1899-12-30"
+    if magnitude >= UNIX_MILLISECONDS_MIN:
+        return "ms", origin
+    return "s", origin
+
+
+def time_strings_to_seconds(values: pd.Series) -> np.ndarray:
+    """Convert normalized ``HH:MM:SS`` strings into int32 seconds-of-day (-1 when missing)."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    unique_seconds = np.array([_time_text_to_seconds(value) for value in uniques], dtype=np.int32)
+    return np.append(unique_seconds, np.int32(-1))[codes]
+
+
+def _time_text_to_seconds(value) -> int:
+    parts = str(value).split(":")
+    try:
+        hours, minutes = int(parts[0]), int(parts[1])
+        secs = int(float(parts[2])) if len(parts) > 2 else 0
+    except (ValueError, IndexError):
+        return -1
+    return hours * 3600 + minutes * 60 + secs
+
+
+def add_calendar_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Add integer calendar columns derived once from normalized dates and times.
+
+    - ``trade_weekday``: int8 weekday (0 = Monday), from ``trade_day`` when it
+      has values, otherwise from ``trade_date``
+    - ``trade_month``: int32 year-month period as ``YYYYMM``
+    - ``entry_time_seconds`` / ``exit_time_seconds``: int32 seconds of day
+    - ``entry_hour``: int8 entry hour
+
+    Missing values are encoded as -1.
+    """
+    enriched = df.copy(deep=False)
+    dates = enriched["trade_date"] if "trade_date" in enriched.columns else None
+    if dates is not None and not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, errors="coerce")
+
+    if dates is not None:
+        valid = dates.notna().to_numpy()
+        months = dates.dt.year.to_numpy(dtype=float, na_value=0) * 100 + dates.dt.month.to_numpy(dtype=float, na_value=0)
+        enriched["trade_month"] = np.where(valid, months, -1).astype(np.int32)
+
+    weekday = None
+    if "trade_day" in enriched.columns:
+        codes, uniques = pd.factorize(enriched["trade_day"], use_na_sentinel=True)
+        lookup = {name: index for index, name in enumerate(WEEKDAY_NAMES)}
+        unique_codes = [lookup.get(str(value).strip().lower(), -1) for value in uniques]
+        if any(code >= 0 for code in unique_codes):
+            weekday = np.append(np.array(unique_codes, dtype=np.int8), np.int8(-1))[codes]
+    if weekday is None and dates is not None:
+        weekday = np.where(dates.notna().to_numpy(), dates.dt.weekday.to_numpy(dtype=float, na_value=0), -1)
+    if weekday is not None:
+        enriched["trade_weekday"] = np.asarray(weekday).astype(np.int8)
+
+    for time_column in ("entry_time", "exit_time"):
+        seconds_column = f"{time_column}_seconds"
+        if time_column in enriched.columns and seconds_column not in enriched.columns:
+            enriched[seconds_column] = time_strings_to_seconds(enriched[time_column])
+
+    if "entry_time_seconds" in enriched.columns:
+        seconds = enriched["entry_time_seconds"].to_numpy()
+        enriched["entry_hour"] = np.where(seconds >= 0, seconds // 3600, -1).astype(np.int8)
+
+    return enriched
+
+
 def clean_numeric_series(series, return_nan=False) -> pd.Series:
     """
     General-purpose cleaner for numeric-like pandas Series.
@@ -43,6 +125,11 @@ def clean_numeric_series(series, return_nan=False) -> pd.Series:
     """
     invalid = np.nan if return_nan else 0.0
 
+    # Already-numeric columns (e.g. memory-mapped ones) need no per-value parsing.
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        numeric = series.astype("float64")
+        return numeric if return_nan else numeric.fillna(invalid)
+
     def _convert(x):
         if pd.isna(x):
             return invalid
@@ -68,4 +155,7 @@ def clean_numeric_series(series, return_nan=False) -> pd.Series:
         except (ValueError, TypeError):
             return invalid
 
-    return series.apply(_convert)
+    # Text columns repeat few distinct values; convert each one once and gather per row.
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    converted = np.array([*(_convert(value) for value in uniques), invalid], dtype=np.float64)
+    return pd.Series(converted[codes], index=series.index, name=series.name)
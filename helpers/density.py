@@ -0,0 +1,85 @@
+"""Binned kernel density estimation for large samples.
+
+Data is linearly binned onto a regular grid once and convolved with a
+Gaussian kernel via FFT, so the cost after binning depends only on the
+grid size, not on the number of samples.
+"""
+
+import numpy as np
+
+
+def scott_bandwidth(values: np.ndarray) -> float:
+    """Scott's rule of thumb, matching ``scipy.stats.gaussian_kde``'s default."""
+    return float(np.std(values, ddof=1) * len(values) ** (-1 / 5))
+
+
+def silverman_bandwidth(values: np.ndarray) -> float:
+    """Silverman's rule of thumb, as in ``scipy.stats.gaussian_kde``."""
+    return float(np.std(values, ddof=1) * (len(values) * 3 / 4) ** (-1 / 5))
+
+
+BANDWIDTH_RULES = {
+    "scott": scott_bandwidth,
+    "silverman": silverman_bandwidth,
+}
+
+
+def linear_binning(values: np.ndarray, grid_min: float, delta: float, gridsize: int) -> np.ndarray:
+    """Spread each sample's unit weight over its two neighbouring grid points."""
+    position = (values - grid_min) / delta
+    left = np.clip(np.floor(position).astype(np.int64), 0, gridsize - 2)
+    fraction = np.clip(position - left, 0.0, 1.0)
+    return np.bincount(left, weights=1.0 - fraction, minlength=gridsize) + np.bincount(
+        left + 1, weights=fraction, minlength=gridsize
+    )
+
+
+def binned_kde(
+    values,
+    gridsize: int = 200,
+    bw_method: str | float = "scott",
+    bw_adjust: float = 1.0,
+    cut: float = 0.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Estimate a Gaussian KDE on a regular grid using linear binning and FFT.
+
+    Args:
+        values: Sample values; non-finite entries are ignored.
+        gridsize: Number of evaluation points.
+        bw_method: ``"scott"``, ``"silverman"``, or an explicit bandwidth.
+        bw_adjust: Multiplier applied to the bandwidth, as in seaborn.
+        cut: Extend the grid this many bandwidths past the data range.
+
+    Returns:
+        tuple: (grid, density). Both are empty when fewer than two distinct
+        finite values are available.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    if len(values) < 2 or values.min() == values.max():
+        return np.array([]), np.array([])
+
+    if isinstance(bw_method, str):
+        if bw_method not in BANDWIDTH_RULES:
+            raise ValueError(f"Unknown bandwidth rule: {bw_method}")
+        bandwidth = BANDWIDTH_RULES[bw_method](values)
+    else:
+        bandwidth = float(bw_method)
+    bandwidth *= bw_adjust
+
+    grid = np.linspace(values.min() - cut * bandwidth, values.max() + cut * bandwidth, gridsize)
+    delta = grid[1] - grid[0]
+    counts = linear_binning(values, grid[0], delta, gridsize)
+
+    # The kernel spans every grid offset, so the binned estimate is not truncated.
+    offsets = np.arange(-(gridsize - 1), gridsize) * delta
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    density = _fft_convolve(counts, kernel)[gridsize - 1 : 2 * gridsize - 1] / len(values)
+    return grid, np.clip(density, 0.0, None)
+
+
+def _fft_convolve(signal: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    size = len(signal) + len(kernel) - 1
+    fft_size = 1 << (size - 1).bit_length()
+    spectrum = np.fft.rfft(signal, fft_size) * np.fft.rfft(kernel, fft_size)
+    return np.fft.irfft(spectrum, fft_size)[:size]
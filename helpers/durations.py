@@ -0,0 +1,215 @@
+"""Holding-time analytics from entry and exit times of day.
+
+Durations come from the integer ``entry_time_seconds``/``exit_time_seconds``
+columns. With an ``exit_date``, the whole days between ``trade_date`` and the
+exit date are added. Without one, an exit earlier in the day than the entry
+is read as an overnight hold. Each aggregation assigns bins with a single
+``searchsorted`` and reduces every statistic with ``np.bincount``.
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import DURATION_DEFAULTS
+from helpers.utils import series_or_none, trade_dates
+
+SECONDS_PER_DAY = 86_400
+
+DURATION_COLUMNS = ["Trades", "Wins", "Losses", "WinRate", "Total R", "Avg R", "Avg Minutes", "R/Minute"]
+
+
+def holding_minutes(
+    entry_seconds: np.ndarray,
+    exit_seconds: np.ndarray,
+    entry_dates: pd.Series | None = None,
+    exit_dates: pd.Series | None = None,
+) -> np.ndarray:
+    """Minutes held per trade from seconds of day (-1 = missing), NaN when unknown.
+
+    Rows with both dates use the day difference; other rows wrap past midnight
+    when the exit time is earlier than the entry time. Negative durations
+    (exit dated before the entry) are treated as unknown.
+    """
+    entry = np.asarray(entry_seconds, dtype=np.int64)
+    exit_ = np.asarray(exit_seconds, dtype=np.int64)
+    seconds = exit_ - entry
+    seconds += np.where(seconds < 0, SECONDS_PER_DAY, 0)
+
+    if entry_dates is not None and exit_dates is not None:
+        start = trade_dates(entry_dates).to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+        end = trade_dates(exit_dates).to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+        dated = ~np.isnat(start) & ~np.isnat(end)
+        days = (end - start).astype(np.int64)
+        seconds = np.where(dated, exit_ - entry + days * SECONDS_PER_DAY, seconds)
+
+    valid = (entry >= 0) & (exit_ >= 0) & (seconds >= 0)
+    return np.where(valid, seconds / 60, np.nan)
+
+
+def journal_holding_minutes(df: pd.DataFrame) -> np.ndarray:
+    """Minutes held per trade of a normalized journal (see ``holding_minutes``)."""
+    has_dates = "trade_date" in df.columns and "exit_date" in df.columns
+    return holding_minutes(
+        df["entry_time_seconds"].to_numpy(),
+        df["exit_time_seconds"].to_numpy(),
+        df["trade_date"] if has_dates else None,
+        df["exit_date"] if has_dates else None,
+    )
+
+
+def bucket_labels(edges: list[float]) -> list[str]:
+    """Readable labels for the duration buckets ``[edges[i], edges[i + 1])``, the last one open."""
+    names = [_edge_label(edge) for edge in edges]
+    return [f"{low}–{high}" for low, high in zip(names, names[1:])] + [f"{names[-1]}+"]
+
+
+def duration_buckets(
+    minutes: np.ndarray,
+    rr: np.ndarray | None,
+    outcome_codes: np.ndarray | None,
+    edges: list[float] = DURATION_DEFAULTS["bucket_edges"],
+) -> pd.DataFrame:
+    """Stats per fixed duration bucket; ``DURATION_COLUMNS`` indexed by bucket label."""
+    edges = np.asarray(edges, dtype=float)
+    bins = np.searchsorted(edges, minutes, side="right") - 1
+    labels = pd.Index(bucket_labels(list(edges)), name="Duration")
+    return _aggregate(bins, len(edges), minutes, rr, outcome_codes, labels)
+
+
+def duration_quantiles(
+    minutes: np.ndarray,
+    rr: np.ndarray | None,
+    outcome_codes: np.ndarray | None,
+    quantiles: int = DURATION_DEFAULTS["quantiles"],
+) -> pd.DataFrame:
+    """Stats per equal-count duration bin; ``DURATION_COLUMNS`` indexed by ``Q<n> (low–high)``.
+
+    Ties at a bin edge fall into the upper bin, so bins can be uneven when
+    many trades share a duration; bins left empty by ties are dropped.
+    """
+    known = minutes[~np.isnan(minutes)]
+    if len(known) == 0:
+        return pd.DataFrame(columns=DURATION_COLUMNS, index=pd.Index([], name="Duration Quantile"))
+    edges = np.quantile(known, np.linspace(0, 1, quantiles + 1))
+    bins = np.searchsorted(edges[1:-1], minutes, side="right")
+    labels = [
+        f"Q{number} ({_edge_label(low)}–{_edge_label(high)})"
+        for number, (low, high) in enumerate(zip(edges, edges[1:]), start=1)
+    ]
+    table = _aggregate(bins, quantiles, minutes, rr, outcome_codes, pd.Index(labels, name="Duration Quantile"))
+    return table[table["Trades"] > 0]
+
+
+def holding_summary(minutes: np.ndarray, rr: np.ndarray | None) -> dict:
+    """Trades with a known duration, mean and median minutes held, and R per minute held.
+
+    R per minute is total R over total minutes held, for trades with both.
+    """
+    known = ~np.isnan(minutes)
+    summary = {
+        "trades": int(known.sum()),
+        "mean_minutes": float(minutes[known].mean()) if known.any() else np.nan,
+        "median_minutes": float(np.median(minutes[known])) if known.any() else np.nan,
+        "r_per_minute": np.nan,
+    }
+    if rr is not None:
+        both = known & ~np.isnan(rr)
+        held = minutes[both].sum()
+        summary["r_per_minute"] = float(rr[both].sum() / held) if held > 0 else np.nan
+    return summary
+
+
+def holding_profile(
+    df: pd.DataFrame,
+    edges: list[float] = DURATION_DEFAULTS["bucket_edges"],
+    quantiles: int = DURATION_DEFAULTS["quantiles"],
+) -> dict:
+    """Duration buckets, duration quantiles and the holding summary for a normalized journal."""
+    minutes = journal_holding_minutes(df)
+    rr_series = series_or_none(df, "rr")
+    rr = rr_series.to_numpy(dtype=float) if rr_series is not None else None
+    outcome_codes = None
+    if "outcome" in df.columns:
+        outcome = df["outcome"]
+        outcome_codes = outcome.eq("WIN").to_numpy(dtype=np.int8, na_value=0) - outcome.eq("LOSS").to_numpy(
+            dtype=np.int8, na_value=0
+        )
+    return {
+        "buckets": duration_buckets(minutes, rr, outcome_codes, edges),
+        "quantiles": duration_quantiles(minutes, rr, outcome_codes, quantiles),
+        "summary": holding_summary(minutes, rr),
+    }
+
+
+def format_minutes(minutes: float) -> str:
+    """Format a duration in minutes as e.g. ``45m``, ``2h 05m`` or ``1d 3h``."""
+    if np.isnan(minutes):
+        return "-"
+    if minutes < 60:
+        return f"{minutes:.0f}m" if minutes >= 1 else f"{minutes * 60:.0f}s"
+    if minutes < 1440:
+        hours, rest = divmod(round(minutes), 60)
+        return f"{hours}h {rest:02d}m"
+    days, rest = divmod(round(minutes / 60), 24)
+    return f"{days}d {rest}h"
+
+
+def _edge_label(minutes: float) -> str:
+    """Compact edge label: ``0``, ``45s``, ``15m``, ``2h``, ``1h44``, ``1d``, ``1d6h``."""
+    if minutes == 0:
+        return "0"
+    if minutes < 1:
+        return f"{minutes * 60:.0f}s"
+    if minutes < 60:
+        return f"{minutes:.0f}m"
+    if minutes < 1440:
+        hours, rest = divmod(round(minutes), 60)
+        return f"{hours}h{rest:02d}" if rest else f"{hours}h"
+    days, hours = divmod(round(minutes / 60), 24)
+    return f"{days}d{hours}h" if hours else f"{days}d"
+
+
+def _aggregate(
+    bins: np.ndarray,
+    bin_count: int,
+    minutes: np.ndarray,
+    rr: np.ndarray | None,
+    outcome_codes: np.ndarray | None,
+    index: pd.Index,
+) -> pd.DataFrame:
+    known = ~np.isnan(minutes) & (bins >= 0)
+    bins = bins[known]
+    trades = np.bincount(bins, minlength=bin_count)
+    total_minutes = np.bincount(bins, weights=minutes[known], minlength=bin_count)
+
+    wins = losses = np.zeros(bin_count, dtype=np.int64)
+    if outcome_codes is not None:
+        codes = outcome_codes[known]
+        wins = np.bincount(bins, weights=codes == 1, minlength=bin_count).astype(np.int64)
+        losses = np.bincount(bins, weights=codes == -1, minlength=bin_count).astype(np.int64)
+
+    total_r = np.full(bin_count, np.nan)
+    rr_count = np.zeros(bin_count, dtype=np.int64)
+    rr_minutes = np.zeros(bin_count)
+    if rr is not None:
+        values = rr[known]
+        has_rr = ~np.isnan(values)
+        total_r = np.bincount(bins[has_rr], weights=values[has_rr], minlength=bin_count)
+        rr_count = np.bincount(bins[has_rr], minlength=bin_count)
+        rr_minutes = np.bincount(bins[has_rr], weights=minutes[known][has_rr], minlength=bin_count)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        decided = wins + losses
+        return pd.DataFrame(
+            {
+                "Trades": trades,
+                "Wins": wins,
+                "Losses": losses,
+                "WinRate": np.where(decided > 0, wins / np.maximum(decided, 1), np.nan),
+                "Total R": total_r,
+                "Avg R": np.where(rr_count > 0, total_r / np.maximum(rr_count, 1), np.nan),
+                "Avg Minutes": np.where(trades > 0, total_minutes / np.maximum(trades, 1), np.nan),
+                "R/Minute": np.where(rr_minutes > 0, total_r / rr_minutes, np.nan),
+            },
+            index=index,
+        )
@@ -0,0 +1,289 @@
+"""Maximum adverse and favorable excursion (MAE/MFE) from local bar files.
+
+Bars live in a bar store: one directory per asset, holding one ``.npy`` file
+per field (``time`` as int64 seconds since the epoch, on the journal's wall
+clock, and float ``open``/``high``/``low``/``close``), sorted by time and
+opened with ``mmap_mode="r"``. A ``<asset>.csv`` next to the store is
+imported on first use.
+
+Each trade covers the bars that overlap its entry-to-exit interval. Their
+index ranges are found with two ``searchsorted`` calls over the asset's bar
+times. The highest high and lowest low of every range then come from one
+``reduceat`` pass over interleaved range bounds, with the trades sorted by
+first bar so the pass reads each bar about once. Assets are scanned in
+parallel worker processes that open their own memory maps.
+"""
+
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import BAR_COLUMN_ALIASES, EXCURSION_DEFAULTS
+from helpers.data_cleaning import clean_numeric_series, convert_to_datetime
+from helpers.exposure import trade_intervals
+from helpers.utils import column_profile, factorize_labels, normalize_label, series_or_none
+
+BAR_FIELDS = ("time", "open", "high", "low", "close")
+
+EXCURSION_COLUMNS = ["mae_points", "mfe_points", "mae_r", "mfe_r"]
+# Journal columns ``trade_excursions`` reads.
+EXCURSION_INPUT_COLUMNS = [
+    "asset",
+    "trade_date",
+    "exit_date",
+    "entry_time_seconds",
+    "exit_time_seconds",
+    "entry_price",
+    "direction",
+    "rr",
+    "stop_loss_points",
+]
+
+
+def bar_store_path(bars_dir: str | Path, asset: str) -> Path:
+    """Directory holding an asset's bars; characters unsafe in file names become ``_``."""
+    return Path(bars_dir) / re.sub(r"[^\w.-]", "_", str(asset).strip())
+
+
+def write_bars(bars: pd.DataFrame, path: str | Path) -> Path:
+    """Write OHLC bars as a bar-store directory, sorted by time.
+
+    ``bars`` needs ``time`` (datetimes, or numbers read like numeric trade
+    dates) and ``open``/``high``/``low``/``close`` columns. Timezone-aware
+    times keep their wall-clock time.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    times = convert_to_datetime(bars["time"])
+    if times.dt.tz is not None:
+        times = times.dt.tz_localize(None)
+    seconds = times.to_numpy(dtype="datetime64[ns]").astype("datetime64[s]")
+    valid = ~np.isnat(seconds)
+    order = np.argsort(seconds[valid], kind="stable")
+    np.save(path / "time.npy", seconds[valid][order].astype(np.int64), allow_pickle=False)
+    for field in BAR_FIELDS[1:]:
+        values = clean_numeric_series(bars[field], return_nan=True).to_numpy(dtype=np.float64)
+        np.save(path / f"{field}.npy", values[valid][order], allow_pickle=False)
+    return path
+
+
+def import_bar_csv(csv_path: str | Path, path: str | Path) -> Path:
+    """Convert a CSV of OHLC bars (columns matched through ``BAR_COLUMN_ALIASES``) into a bar store."""
+    raw = pd.read_csv(csv_path)
+    columns = {normalize_label(column): column for column in raw.columns}
+    renamed = {}
+    for field, aliases in BAR_COLUMN_ALIASES.items():
+        match = next((columns[alias] for alias in aliases if alias in columns), None)
+        if match is None:
+            raise ValueError(f"{csv_path}: no {field} column (tried {', '.join(aliases)})")
+        renamed[field] = raw[match]
+    return write_bars(pd.DataFrame(renamed), path)
+
+
+def open_bars(bars_dir: str | Path, asset: str) -> dict[str, np.ndarray] | None:
+    """Memory-map an asset's bars, importing ``<asset>.csv`` on first use; None without bars."""
+    path = bar_store_path(bars_dir, asset)
+    if not (path / "time.npy").exists():
+        csv_path = path.with_name(f"{path.name}.csv")
+        if not csv_path.exists():
+            return None
+        import_bar_csv(csv_path, path)
+    return {field: np.load(path / f"{field}.npy", mmap_mode="r") for field in BAR_FIELDS}
+
+
+def bar_ranges(
+    times: np.ndarray, start: np.ndarray, end: np.ndarray, bar_seconds: int = EXCURSION_DEFAULTS["bar_seconds"]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Index ranges ``[first, last)`` of the bars overlapping each ``[start, end]`` interval.
+
+    A bar stamped ``t`` covers ``[t, t + bar_seconds)``; ranges are empty
+    (``first == last``) when no bar overlaps the trade.
+    """
+    first = np.searchsorted(times, start - bar_seconds, side="right")
+    last = np.searchsorted(times, end, side="right")
+    return first, np.maximum(last, first)
+
+
+def segment_reduce(ufunc: np.ufunc, values: np.ndarray, first: np.ndarray, last: np.ndarray) -> np.ndarray:
+    """Reduce ``values[first[i]:last[i]]`` for non-empty ranges in one ``reduceat`` pass.
+
+    Bounds are interleaved as ``first[0], last[0], first[1], ...`` and every
+    other result is kept; the segments in between cost little when ranges
+    are sorted by ``first``. Only the window spanned by the ranges is read.
+    """
+    low, high = int(first.min()), int(last.max())
+    window = values[low:high]
+    size = high - low
+    # reduceat indices must be valid positions, so ranges ending at the window
+    # edge stop one short and take the last value separately. A one-value range
+    # there already is that value.
+    bounds = np.empty(2 * len(first), dtype=np.intp)
+    bounds[0::2] = first - low
+    bounds[1::2] = np.minimum(last - low, size - 1)
+    result = ufunc.reduceat(window, bounds)[0::2]
+    at_edge = (last == high) & (first < high - 1)
+    result[at_edge] = ufunc(result[at_edge], window[size - 1])
+    return result
+
+
+def range_extremes(bars: dict[str, np.ndarray], first: np.ndarray, last: np.ndarray) -> np.ndarray:
+    """Highest high, lowest low, first open and last close per bar range; NaN for empty ranges.
+
+    Returns:
+        np.ndarray: ``(4, len(first))`` rows of high, low, open and close.
+    """
+    extremes = np.full((4, len(first)), np.nan)
+    rows = np.flatnonzero(last > first)
+    if len(rows) == 0:
+        return extremes
+    rows = rows[np.argsort(first[rows], kind="stable")]
+    first, last = first[rows], last[rows]
+    extremes[0, rows] = segment_reduce(np.fmax, bars["high"], first, last)
+    extremes[1, rows] = segment_reduce(np.fmin, bars["low"], first, last)
+    extremes[2, rows] = bars["open"][first]
+    extremes[3, rows] = bars["close"][last - 1]
+    return extremes
+
+
+def asset_extremes(
+    bars_dir: str, asset: str, start: np.ndarray, end: np.ndarray, bar_seconds: int
+) -> np.ndarray | None:
+    """``range_extremes`` for one asset's trades, or None when the asset has no bars."""
+    bars = open_bars(bars_dir, asset)
+    if bars is None:
+        return None
+    first, last = bar_ranges(bars["time"], start, end, bar_seconds)
+    return range_extremes(bars, first, last)
+
+
+def trade_excursions(
+    df: pd.DataFrame,
+    bars_dir: str | Path,
+    bar_seconds: int = EXCURSION_DEFAULTS["bar_seconds"],
+    max_workers: int | None = EXCURSION_DEFAULTS["max_workers"],
+) -> tuple[pd.DataFrame, list[str]]:
+    """MAE/MFE per trade of a normalized journal, in price points and in R.
+
+    The entry price is ``entry_price`` when present, otherwise the open of the
+    first bar. Without a ``direction``, a trade is read as long when its R and
+    the move from entry to the last close have the same sign. R values divide
+    by ``stop_loss_points`` (in price points).
+
+    Returns:
+        tuple: ``EXCURSION_COLUMNS`` indexed like ``df`` (NaN where unknown), and
+        the assets that have no bars.
+    """
+    rows, start, end = trade_intervals(df)
+    codes, assets = factorize_labels(df["asset"]) if "asset" in df.columns else (np.full(len(df), -1), [])
+    codes = codes[rows]
+    by_asset = np.argsort(codes, kind="stable")
+    by_asset = by_asset[codes[by_asset] >= 0]
+    splits = np.searchsorted(codes[by_asset], np.arange(1, len(assets)))
+    rows_by_asset = np.split(rows[by_asset], splits)
+    starts, ends = np.split(start[by_asset], splits), np.split(end[by_asset], splits)
+
+    tasks = [(str(bars_dir), str(asset), s, e, bar_seconds) for asset, s, e in zip(assets, starts, ends)]
+    if max_workers == 1 or len(tasks) < 2:
+        results = [asset_extremes(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(asset_extremes, *zip(*tasks)))
+
+    high, low, first_open, last_close = np.full((4, len(df)), np.nan)
+    missing = []
+    for asset, asset_rows, extremes in zip(assets, rows_by_asset, results):
+        if extremes is None:
+            missing.append(str(asset))
+            continue
+        high[asset_rows], low[asset_rows], first_open[asset_rows], last_close[asset_rows] = extremes
+
+    entry = first_open
+    entry_prices = series_or_none(df, "entry_price")
+    if entry_prices is not None:
+        entry = np.where(entry_prices.notna(), entry_prices.to_numpy(dtype=float), first_open)
+
+    side = np.zeros(len(df), dtype=np.int8)
+    if "direction" in df.columns:
+        direction = df["direction"]
+        side = direction.eq("LONG").to_numpy(dtype=np.int8, na_value=0) - direction.eq("SHORT").to_numpy(
+            dtype=np.int8, na_value=0
+        )
+    rr = series_or_none(df, "rr")
+    if rr is not None:
+        with np.errstate(invalid="ignore"):
+            inferred = np.sign(last_close - entry) * np.sign(rr.to_numpy(dtype=float))
+        side = np.where(side == 0, np.nan_to_num(inferred), side).astype(np.int8)
+
+    with np.errstate(invalid="ignore"):
+        up = np.maximum(high - entry, 0)
+        down = np.maximum(entry - low, 0)
+        mfe = np.where(side > 0, up, np.where(side < 0, down, np.nan))
+        mae = np.where(side > 0, down, np.where(side < 0, up, np.nan))
+
+    stops = series_or_none(df, "stop_loss_points")
+    stop = stops.to_numpy(dtype=float) if stops is not None else np.full(len(df), np.nan)
+    stop = np.where(stop > 0, stop, np.nan)
+    frame = pd.DataFrame(
+        {"mae_points": mae, "mfe_points": mfe, "mae_r": mae / stop, "mfe_r": mfe / stop},
+        index=df.index,
+    )
+    return frame, missing
+
+
+def add_excursions(
+    df: pd.DataFrame,
+    bars_dir: str | Path,
+    bar_seconds: int = EXCURSION_DEFAULTS["bar_seconds"],
+    max_workers: int | None = EXCURSION_DEFAULTS["max_workers"],
+) -> pd.DataFrame:
+    """Return the journal with ``EXCURSION_COLUMNS`` added and its column profile extended.
+
+    Assets without bars are listed in ``attrs["excursion_missing_assets"]``.
+    """
+    frame, missing = trade_excursions(df, bars_dir, bar_seconds, max_workers)
+    enriched = df.drop(columns=EXCURSION_COLUMNS, errors="ignore").assign(**frame)
+    profile = enriched.attrs.get("column_profile")
+    if profile and profile.get("rows") == len(enriched):
+        columns = dict(profile["columns"], **column_profile(frame)["columns"])
+        enriched.attrs["column_profile"] = {"rows": len(enriched), "columns": columns}
+    enriched.attrs["excursion_missing_assets"] = missing
+    return enriched
+
+
+def excursion_profile(df: pd.DataFrame) -> dict:
+    """MAE/MFE against final R per trade plus a summary, in R when stops are known, else in points.
+
+    The summary holds the median MAE of winners (heat taken by trades that
+    worked), the median MFE of losers (open profit given back) and, in R,
+    the share of winners' MFE captured at exit.
+    """
+    unit = "R" if series_or_none(df, "mae_r") is not None else "points"
+    suffix = "r" if unit == "R" else "points"
+    mae = df[f"mae_{suffix}"].to_numpy(dtype=float)
+    mfe = df[f"mfe_{suffix}"].to_numpy(dtype=float)
+    rr_series = series_or_none(df, "rr")
+    rr = rr_series.to_numpy(dtype=float) if rr_series is not None else np.full(len(df), np.nan)
+    outcome = df["outcome"] if "outcome" in df.columns else pd.Series(pd.NA, index=df.index)
+
+    known = ~np.isnan(mae) & ~np.isnan(mfe)
+    wins = outcome.eq("WIN").to_numpy(dtype=bool, na_value=False) & known
+    losses = outcome.eq("LOSS").to_numpy(dtype=bool, na_value=False) & known
+    captured = np.nan
+    if unit == "R":
+        scored = wins & ~np.isnan(rr)
+        if mfe[scored].sum() > 0:
+            captured = float(rr[scored].sum() / mfe[scored].sum())
+    summary = {
+        "trades": int(known.sum()),
+        "unit": unit,
+        "median_mae_winners": float(np.median(mae[wins])) if wins.any() else np.nan,
+        "median_mfe_losers": float(np.median(mfe[losses])) if losses.any() else np.nan,
+        "mfe_captured": captured,
+    }
+    trades = pd.DataFrame(
+        {"mae": mae[known], "mfe": mfe[known], "rr": rr[known], "outcome": outcome.to_numpy()[known]}
+    )
+    return {"summary": summary, "trades": trades}
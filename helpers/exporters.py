@@ -0,0 +1,257 @@
+"""Report exporters that render pages once and fan them out to several formats."""
+
+import base64
+import io
+import json
+import math
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time
+from html import escape
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_pdf import PdfPages
+from tqdm import tqdm
+
+from config import DEFAULT_OUTPUT_NAME, EXPORT_FORMATS
+from helpers.plot_styling import figure_bytes
+
+
+def report_basename(report_type: str, output_name: str | None = None) -> str:
+    """Build the output file stem from a name template.
+
+    Supported placeholders are ``{date}``, ``{time}``, ``{report}`` and ``{pid}``,
+    so concurrent runs can be given distinct names.
+    """
+    now = datetime.now()
+    template = output_name or DEFAULT_OUTPUT_NAME
+    return template.format(
+        date=now.strftime("%Y-%m-%d"),
+        time=now.strftime("%H%M%S"),
+        report=report_type,
+        pid=os.getpid(),
+    )
+
+
+def render_pages(figure_list: list[tuple], progress: bool = True) -> list[dict]:
+    """Render every plot step once and keep its figure alongside its plot data.
+
+    Steps are ``(func, args)`` or ``(func, args, kwargs)``; only ``args`` are
+    kept as the page's plot data.
+    """
+    pages: list[dict] = []
+    steps = tqdm(figure_list, desc="Generating plots", unit="plot", disable=not progress)
+    for index, (func, args, *options) in enumerate(steps, start=1):
+        fig = func(*args, **(options[0] if options else {}))
+        if fig is None:
+            continue
+        pages.append(
+            {
+                "name": f"{index:02d}-{func.__name__}",
+                "plot": func.__name__,
+                "figure": fig,
+                "args": args,
+                "lock": threading.Lock(),
+            }
+        )
+    return pages
+
+
+def write_pdf(pages: list[dict], path: Path) -> list[str]:
+    """Write all pages into one multi-page PDF."""
+    atomic_write(path, lambda file: _write_pdf_pages(pages, file))
+    return [str(path)]
+
+
+def write_images(pages: list[dict], directory: Path, image_format: str) -> list[str]:
+    """Write one image file per page, e.g. for dashboards."""
+    directory.mkdir(parents=True, exist_ok=True)
+    written: list[str] = []
+    for page in pages:
+        path = directory / f"{page['name']}.{image_format}"
+        atomic_write(path, lambda file, page=page: _save_figure(page, file, image_format))
+        written.append(str(path))
+    return written
+
+
+def write_html(pages: list[dict], stats: dict | None, path: Path, title: str) -> list[str]:
+    """Write a self-contained HTML report with inline PNG images."""
+    document = html_document(pages, stats, title)
+    atomic_write(path, lambda file: file.write(document.encode("utf-8")))
+    return [str(path)]
+
+
+def html_document(pages: list[dict], stats: dict | None, title: str) -> str:
+    """Build the self-contained HTML report as a string."""
+    sections = []
+    if stats:
+        rows = "\n".join(
+            f"<tr><th>{escape(str(key))}</th><td>{escape(str(value))}</td></tr>"
+            for key, value in stats.items()
+        )
+        sections.append(f"<table class=\"stats\">\n{rows}\n</table>")
+
+    for page in pages:
+        with page["lock"]:
+            encoded = base64.b64encode(figure_bytes(page["figure"], "png")).decode("ascii")
+        sections.append(
+            f"<figure id=\"{escape(page['name'])}\">"
+            f"<img alt=\"{escape(page['plot'])}\" src=\"data:image/png;base64,{encoded}\"/>"
+            "</figure>"
+        )
+
+    return (
+        "<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\"/>\n"
+        f"<title>{escape(title)}</title>\n"
+        "<style>body{background:#010101;color:#e0e0e0;font-family:sans-serif;margin:2em}"
+        "table.stats{border-collapse:collapse;margin-bottom:2em}"
+        "table.stats th,table.stats td{padding:.3em 1em;text-align:left}"
+        "table.stats tr:nth-child(even){background:#2a2a2a}"
+        "figure{margin:0 0 2em 0}img{max-width:100%}</style>\n"
+        f"</head>\n<body>\n<h1>{escape(title)}</h1>\n"
+        + "\n".join(sections)
+        + "\n</body>\n</html>\n"
+    )
+
+
+def pdf_bytes(pages: list[dict]) -> bytes:
+    """Return all pages as an in-memory multi-page PDF."""
+    buffer = io.BytesIO()
+    _write_pdf_pages(pages, buffer)
+    return buffer.getvalue()
+
+
+def write_json(pages: list[dict], stats: dict | None, path: Path, report_type: str) -> list[str]:
+    """Write the summary stats and the data behind every plot as JSON."""
+    document = json.dumps(report_payload(pages, stats, report_type), indent=2, allow_nan=False)
+    atomic_write(path, lambda file: file.write(document.encode("utf-8")))
+    return [str(path)]
+
+
+def report_payload(pages: list[dict], stats: dict | None, report_type: str) -> dict:
+    """Collect the summary stats and plot data into JSON-ready form."""
+    return {
+        "report_type": report_type,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "stats": to_jsonable(stats or {}),
+        "plots": [
+            {"name": page["name"], "plot": page["plot"], "data": [to_jsonable(arg) for arg in page["args"]]}
+            for page in pages
+        ],
+    }
+
+
+def export_report(
+    figure_list: list[tuple],
+    report_type: str = "Report",
+    formats: tuple[str, ...] | list[str] = ("pdf",),
+    output_dir: str | Path = ".",
+    output_name: str | None = None,
+    stats: dict | None = None,
+) -> dict[str, list[str]]:
+    """Render the report once and write it in every requested format.
+
+    Writers run in parallel threads; a per-figure lock keeps two writers from
+    serializing the same figure at the same time.
+
+    Returns:
+        dict: Output format mapped to the list of written file paths.
+    """
+    unknown = [fmt for fmt in formats if fmt not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown export format(s): {', '.join(unknown)}")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    basename = report_basename(report_type, output_name)
+    title = f"{report_type} Report"
+
+    writers = {
+        "pdf": lambda pages: write_pdf(pages, output_dir / f"{basename}.pdf"),
+        "png": lambda pages: write_images(pages, output_dir / basename, "png"),
+        "svg": lambda pages: write_images(pages, output_dir / basename, "svg"),
+        "html": lambda pages: write_html(pages, stats, output_dir / f"{basename}.html", title),
+        "json": lambda pages: write_json(pages, stats, output_dir / f"{basename}.json", report_type),
+    }
+
+    pages = render_pages(figure_list)
+    with ThreadPoolExecutor(max_workers=len(formats) or 1) as executor:
+        futures = {fmt: executor.submit(writers[fmt], pages) for fmt in dict.fromkeys(formats)}
+        return {fmt: future.result() for fmt, future in futures.items()}
+
+
+def to_jsonable(value):
+    """Convert stats values and plot arguments into plain JSON types."""
+    if isinstance(value, pd.DataFrame):
+        return [to_jsonable(record) for record in value.reset_index().to_dict(orient="records")]
+    if isinstance(value, pd.Series):
+        return {"name": to_jsonable(value.name), "values": [to_jsonable(item) for item in value.tolist()]}
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return [to_jsonable(item) for item in value.tolist()]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (str, int, bool)):
+        return value
+    return str(value)
+
+
+def _write_pdf_pages(pages: list[dict], file) -> None:
+    with PdfPages(file) as pdf:
+        for page in pages:
+            with page["lock"]:
+                pdf.savefig(page["figure"])
+
+
+def _save_figure(page: dict, file, image_format: str) -> None:
+    with page["lock"]:
+        page["figure"].savefig(file, format=image_format)
+
+
+def atomic_write(path: Path, write) -> None:
+    """Write to a temporary file next to ``path`` and move it into place.
+
+    The file gets the mode of the file it replaces. A new file is created
+    with mode 0o666, which the kernel narrows by the umask, as ``open`` does.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_name = _create_temp_file(path)
+    try:
+        with os.fdopen(handle, "wb") as file:
+            write(file)
+        try:
+            os.chmod(temp_name, path.stat().st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def _create_temp_file(path: Path) -> tuple[int, str]:
+    """Exclusively create a hidden file next to ``path`` with the default mode.
+
+    Unlike ``mkstemp`` (always 0600), the mode follows the umask without
+    reading it, since ``os.umask`` can only be read by changing it for every
+    thread in the process.
+    """
+    while True:
+        temp_name = str(path.parent / f".{path.name}.{uuid.uuid4().hex[:12]}")
+        try:
+            return os.open(temp_name, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), temp_name
+        except FileExistsError:
+            continue
@@ -0,0 +1,247 @@
+"""Concurrent-exposure analysis over trade intervals.
+
+Each trade is an interval from its entry to its exit (see
+``helpers.durations``). Entry and exit times are sorted once. The number of
+open positions at every entry is then the entry's rank minus the number of
+exits at or before it, found with ``searchsorted`` (a trade exiting when
+another enters does not overlap it). Overlap clusters, the connected runs
+of overlapping trades, start wherever an entry comes at or after the latest
+exit so far. The sorted arrays are walked in ``chunk_trades`` slices, so
+temporaries stay bounded for multi-million-trade backtests, and the
+timeline is sampled at a fixed number of points.
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import EXPOSURE_DEFAULTS
+from helpers.durations import SECONDS_PER_DAY, journal_holding_minutes
+from helpers.utils import series_or_none, trade_dates
+
+CLUSTER_COLUMNS = ["Clusters", "Trades", "Total R", "Avg R/Cluster", "Avg R/Trade", "WinRate", "Outcome Agreement"]
+
+
+def trade_intervals(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Row positions and entry/exit times (int64 seconds since the epoch) of trades with a known duration."""
+    minutes = journal_holding_minutes(df)
+    days = trade_dates(df["trade_date"]).to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    rows = np.flatnonzero(~np.isnan(minutes) & ~np.isnat(days))
+    start = days[rows].astype(np.int64) * SECONDS_PER_DAY + df["entry_time_seconds"].to_numpy(dtype=np.int64)[rows]
+    end = start + np.round(minutes[rows] * 60).astype(np.int64)
+    return rows, start, end
+
+
+def sweep_exposure(
+    start: np.ndarray,
+    end: np.ndarray,
+    risk: np.ndarray | None = None,
+    chunk_trades: int = EXPOSURE_DEFAULTS["chunk_trades"],
+    timeline_points: int = EXPOSURE_DEFAULTS["timeline_points"],
+) -> dict:
+    """Sweep entry/exit events for open positions, open risk and overlap clusters.
+
+    Args:
+        start: Entry times (int64 seconds).
+        end: Exit times, not before the entries.
+        risk: Risk per trade (NaN counts as 0), or None.
+        chunk_trades: Entries processed per step.
+        timeline_points: Number of timeline bins.
+
+    Returns:
+        dict: ``order`` (trades sorted by entry), ``cluster_ids`` (per trade
+        in that order), ``max_positions`` and ``max_positions_at`` (seconds),
+        ``max_risk`` (NaN without risk), ``position_seconds`` (summed trade
+        durations), ``exposed_seconds`` (time with at least one open
+        position), ``span_seconds`` (first entry to last exit), and
+        ``timeline``: bin start times with the most open positions and open
+        risk in each bin.
+    """
+    n = len(start)
+    order = np.argsort(start, kind="stable")
+    starts = start[order]
+    ends_by_start = end[order]
+    ends = np.sort(end, kind="stable")
+    risk_by_start = risk_by_end = None
+    if risk is not None:
+        risk = np.nan_to_num(np.asarray(risk, dtype=float), nan=0.0)
+        risk_by_start = np.r_[0.0, np.cumsum(risk[order])]
+        risk_by_end = np.r_[0.0, np.cumsum(risk[np.argsort(end, kind="stable")])]
+
+    first, last = int(starts[0]), int(ends[-1])
+    span = max(last - first, 1)
+    edges = first + (np.arange(timeline_points + 1, dtype=np.int64) * span) // timeline_points
+    # Positions open at each bin edge cover bins in which no trade is entered.
+    opened = np.searchsorted(starts, edges[:-1], side="right")
+    closed = np.searchsorted(ends, edges[:-1], side="right")
+    timeline_positions = opened - closed
+    timeline_risk = np.full(timeline_points, np.nan)
+    if risk is not None:
+        timeline_risk = risk_by_start[opened] - risk_by_end[closed]
+
+    cluster_ids = np.empty(n, dtype=np.int64)
+    clusters = 0
+    reach = np.iinfo(np.int64).min
+    max_positions, max_positions_at, max_risk = 0, first, np.nan
+    for low in range(0, n, chunk_trades):
+        high = min(low + chunk_trades, n)
+        chunk_starts = starts[low:high]
+        closed = np.searchsorted(ends, chunk_starts, side="right")
+        positions = np.arange(low + 1, high + 1) - closed
+        peak = int(np.argmax(positions))
+        if positions[peak] > max_positions:
+            max_positions, max_positions_at = int(positions[peak]), int(chunk_starts[peak])
+        bins = np.minimum((chunk_starts - first) * timeline_points // span, timeline_points - 1)
+        np.maximum.at(timeline_positions, bins, positions)
+        if risk is not None:
+            open_risk = risk_by_start[low + 1 : high + 1] - risk_by_end[closed]
+            max_risk = np.fmax(max_risk, open_risk.max())
+            np.fmax.at(timeline_risk, bins, open_risk)
+
+        running_reach = np.maximum.accumulate(np.r_[reach, ends_by_start[low:high]])
+        boundaries = chunk_starts >= running_reach[:-1]
+        cluster_ids[low:high] = clusters - 1 + np.cumsum(boundaries)
+        clusters = int(cluster_ids[high - 1]) + 1
+        reach = running_reach[-1]
+
+    cluster_starts = np.flatnonzero(np.r_[True, cluster_ids[1:] != cluster_ids[:-1]])
+    exposed = np.maximum.reduceat(ends_by_start, cluster_starts) - starts[cluster_starts]
+    return {
+        "order": order,
+        "cluster_ids": cluster_ids,
+        "max_positions": max_positions,
+        "max_positions_at": max_positions_at,
+        "max_risk": float(max_risk),
+        "position_seconds": int((end - start).sum()),
+        "exposed_seconds": int(exposed.sum()),
+        "span_seconds": last - first,
+        "timeline": pd.DataFrame(
+            {
+                "time": pd.to_datetime(edges[:-1], unit="s"),
+                "positions": timeline_positions,
+                "risk": timeline_risk,
+            }
+        ),
+    }
+
+
+def cluster_table(
+    cluster_ids: np.ndarray,
+    rr: np.ndarray | None,
+    outcome_codes: np.ndarray | None,
+    max_cluster_size: int = EXPOSURE_DEFAULTS["max_cluster_size"],
+) -> pd.DataFrame:
+    """Overlap-cluster results grouped by cluster size (sizes from ``max_cluster_size`` up are pooled).
+
+    Outcome agreement is the share of decided trade pairs within a cluster
+    that had the same outcome (both wins or both losses).
+    """
+    clusters = int(cluster_ids[-1]) + 1 if len(cluster_ids) else 0
+    sizes = np.bincount(cluster_ids, minlength=clusters)
+    groups = np.minimum(sizes, max_cluster_size) - 1
+    group_count = np.bincount(groups, minlength=max_cluster_size)
+    trades = np.bincount(groups, weights=sizes, minlength=max_cluster_size)
+
+    total_r = np.full(max_cluster_size, np.nan)
+    if rr is not None:
+        cluster_r = np.bincount(cluster_ids, weights=np.nan_to_num(rr, nan=0.0), minlength=clusters)
+        total_r = np.bincount(groups, weights=cluster_r, minlength=max_cluster_size)
+
+    win_rate = agreement = np.full(max_cluster_size, np.nan)
+    if outcome_codes is not None:
+        wins, losses = _cluster_outcomes(cluster_ids, outcome_codes, clusters)
+        same, total = _outcome_pairs(wins, losses)
+        same_pairs = np.bincount(groups, weights=same, minlength=max_cluster_size)
+        pairs = np.bincount(groups, weights=total, minlength=max_cluster_size)
+        group_wins = np.bincount(groups, weights=wins, minlength=max_cluster_size)
+        group_decided = np.bincount(groups, weights=wins + losses, minlength=max_cluster_size)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            win_rate = np.where(group_decided > 0, group_wins / group_decided, np.nan)
+            agreement = np.where(pairs > 0, same_pairs / pairs, np.nan)
+
+    labels = [str(size) for size in range(1, max_cluster_size)] + [f"{max_cluster_size}+"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        table = pd.DataFrame(
+            {
+                "Clusters": group_count,
+                "Trades": trades.astype(np.int64),
+                "Total R": total_r,
+                "Avg R/Cluster": total_r / group_count,
+                "Avg R/Trade": total_r / trades,
+                "WinRate": win_rate,
+                "Outcome Agreement": agreement,
+            },
+            index=pd.Index(labels, name="Cluster Size"),
+        )
+    return table[table["Clusters"] > 0]
+
+
+def exposure_profile(
+    df: pd.DataFrame,
+    chunk_trades: int = EXPOSURE_DEFAULTS["chunk_trades"],
+    timeline_points: int = EXPOSURE_DEFAULTS["timeline_points"],
+    max_cluster_size: int = EXPOSURE_DEFAULTS["max_cluster_size"],
+) -> dict:
+    """Concurrent-exposure summary, timeline and cluster table for a normalized journal.
+
+    Open risk uses ``risk_amount`` when it has values, otherwise ``position_size``.
+    """
+    rows, start, end = trade_intervals(df)
+    if len(rows) == 0:
+        raise ValueError("No trades with a trade date, entry time and exit time")
+
+    risk_column = next(
+        (column for column in ("risk_amount", "position_size") if series_or_none(df, column) is not None), None
+    )
+    risk = series_or_none(df, risk_column).to_numpy(dtype=float)[rows] if risk_column else None
+    sweep = sweep_exposure(start, end, risk, chunk_trades, timeline_points)
+
+    order = rows[sweep["order"]]
+    rr_series = series_or_none(df, "rr")
+    rr = rr_series.to_numpy(dtype=float)[order] if rr_series is not None else None
+    outcome_codes = None
+    if "outcome" in df.columns:
+        outcome = df["outcome"]
+        wins, losses = outcome.eq("WIN"), outcome.eq("LOSS")
+        codes = wins.to_numpy(dtype=np.int8, na_value=0) - losses.to_numpy(dtype=np.int8, na_value=0)
+        outcome_codes = codes[order]
+    clusters = cluster_table(sweep["cluster_ids"], rr, outcome_codes, max_cluster_size)
+
+    # Agreement among overlapping trades vs. what independent outcomes at the overall win rate would give.
+    agreement = expected_agreement = np.nan
+    if outcome_codes is not None and np.count_nonzero(outcome_codes):
+        wins, losses = _cluster_outcomes(sweep["cluster_ids"], outcome_codes, int(sweep["cluster_ids"][-1]) + 1)
+        same, total = _outcome_pairs(wins, losses)
+        agreement = same.sum() / total.sum() if total.sum() else np.nan
+        win_share = wins.sum() / (wins.sum() + losses.sum())
+        expected_agreement = win_share**2 + (1 - win_share) ** 2
+    overlapping = clusters.iloc[1:] if len(clusters) and clusters.index[0] == "1" else clusters
+    with np.errstate(divide="ignore", invalid="ignore"):
+        summary = {
+            "trades": len(rows),
+            "max_positions": sweep["max_positions"],
+            "max_positions_at": pd.Timestamp(sweep["max_positions_at"], unit="s"),
+            "avg_positions": sweep["position_seconds"] / max(sweep["span_seconds"], 1),
+            "avg_positions_when_exposed": sweep["position_seconds"] / max(sweep["exposed_seconds"], 1),
+            "exposed_fraction": sweep["exposed_seconds"] / max(sweep["span_seconds"], 1),
+            "risk_column": risk_column,
+            "max_risk": sweep["max_risk"],
+            "overlap_clusters": int(overlapping["Clusters"].sum()),
+            "overlapping_trades": int(overlapping["Trades"].sum()),
+            "outcome_agreement": float(agreement),
+            "expected_agreement": float(expected_agreement),
+        }
+    return {"summary": summary, "timeline": sweep["timeline"], "clusters": clusters}
+
+
+def _cluster_outcomes(
+    cluster_ids: np.ndarray, outcome_codes: np.ndarray, clusters: int
+) -> tuple[np.ndarray, np.ndarray]:
+    wins = np.bincount(cluster_ids, weights=outcome_codes == 1, minlength=clusters)
+    losses = np.bincount(cluster_ids, weights=outcome_codes == -1, minlength=clusters)
+    return wins, losses
+
+
+def _outcome_pairs(wins: np.ndarray, losses: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Same-outcome and total decided trade pairs per cluster."""
+    decided = wins + losses
+    return wins * (wins - 1) / 2 + losses * (losses - 1) / 2, decided * (decided - 1) / 2
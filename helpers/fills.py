@@ -0,0 +1,257 @@
+"""Broker execution fills aggregated into round-trip trades.
+
+Fills are sorted once by account, asset and time. Running positions come
+from one cumulative sum of signed quantities, done in integer units (see
+``quantity_decimals``) so a position returns exactly to zero, with each
+group's starting offset subtracted. A fill that flips the position from
+long to short (or back) is split into a closing and an opening part. A
+round trip runs from a fill that opens a flat position to the fill that
+makes it flat again; positions still open at the end of the data are left
+out.
+
+Entry and exit quantities are paired FIFO without walking the fills: the
+cumulative opened and cumulative closed quantities are merged, and every
+interval between consecutive breakpoints is one matched piece of an entry
+fill and an exit fill. Pieces are then reduced per trade with ``reduceat``.
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import DIRECTION_VALUE_MAP, FILL_COLUMN_ALIASES, FILLS_DEFAULTS
+from helpers.columnar_journal import seconds_to_time_strings
+from helpers.data_cleaning import clean_numeric_series, convert_to_datetime
+from helpers.utils import factorize_labels, normalize_label
+
+PAIRING_MODES = ("position", "fifo")
+
+
+def fill_columns(fills: pd.DataFrame, columns: dict[str, str] | None = None) -> dict[str, pd.Series]:
+    """Match fill columns through ``FILL_COLUMN_ALIASES`` (or explicit ``columns``) and parse them.
+
+    Returns:
+        dict: ``time`` (datetimes, combined with a separate ``date`` column when
+        there is one), ``asset``, ``account``, ``quantity`` (signed by ``side``
+        when a side column exists), ``price``, ``fees`` and ``stop_price``;
+        optional fields that are missing are left out.
+    """
+    by_label = {normalize_label(column): column for column in fills.columns}
+    matched = {}
+    for field, aliases in FILL_COLUMN_ALIASES.items():
+        explicit = (columns or {}).get(field)
+        candidates = [explicit] if explicit else aliases
+        source = next((by_label[normalize_label(name)] for name in candidates if normalize_label(name) in by_label), None)
+        if source is not None and source not in matched.values():
+            matched[field] = source
+    missing = [field for field in ("time", "asset", "quantity", "price") if field not in matched]
+    if missing:
+        raise ValueError(f"Fills are missing required columns: {', '.join(missing)}")
+
+    parsed = {"asset": fills[matched["asset"]]}
+    times = fills[matched["time"]]
+    if "date" in matched:
+        times = fills[matched["date"]].astype(str).str.strip() + " " + times.astype(str).str.strip()
+    times = convert_to_datetime(times)
+    parsed["time"] = times.dt.tz_localize(None) if times.dt.tz is not None else times
+
+    quantity = clean_numeric_series(fills[matched["quantity"]], return_nan=True)
+    if "side" in matched:
+        # Map the few distinct side labels, not every fill.
+        codes, labels = pd.factorize(fills[matched["side"]], use_na_sentinel=True)
+        directions = pd.Series(np.asarray(labels, dtype=object), dtype="string").str.strip().str.lower()
+        signs = directions.map(DIRECTION_VALUE_MAP).map({"LONG": 1.0, "SHORT": -1.0}).to_numpy(dtype=float, na_value=np.nan)
+        quantity = quantity.abs() * np.append(signs, np.nan)[codes]
+    parsed["quantity"] = quantity
+    for field in ("price", "fees", "stop_price"):
+        if field in matched:
+            parsed[field] = clean_numeric_series(fills[matched[field]], return_nan=True)
+    if "account" in matched:
+        parsed["account"] = fills[matched["account"]]
+    return parsed
+
+
+def pair_fills(
+    group_codes: np.ndarray,
+    times: np.ndarray,
+    quantity: np.ndarray,
+    price: np.ndarray,
+    fees: np.ndarray | None = None,
+    stop_price: np.ndarray | None = None,
+    pairing: str = FILLS_DEFAULTS["pairing"],
+    quantity_decimals: int = FILLS_DEFAULTS["quantity_decimals"],
+) -> dict[str, np.ndarray]:
+    """Pair fills into round-trip trades.
+
+    Args:
+        group_codes: Account/asset group per fill; positions never cross groups.
+        times: Fill times (datetime64 or int64).
+        quantity: Signed quantity (positive buys, negative sells).
+        price: Fill price.
+        fees: Fees per fill, charged to the trades its quantity ends up in.
+        stop_price: Stop price on entry fills, for the risk of each trade.
+        pairing: ``"position"`` for one trade per flat-to-flat position, ``"fifo"``
+            for one trade per entry fill, closed by the exits it is matched to.
+        quantity_decimals: Decimals quantities are rounded to.
+
+    Returns:
+        dict: Per trade ``group``, ``direction`` (+1/-1), ``entry_time``,
+        ``exit_time``, ``quantity`` (peak position, or the entry fill's
+        quantity with ``"fifo"``), ``entry_price`` and ``exit_price`` (volume
+        weighted), ``points`` (signed price gain times quantity), ``fees`` and
+        ``stop_points`` (|entry - stop| times quantity, NaN without stops), plus
+        ``open_fills``, the fills left in positions that never closed.
+    """
+    if pairing not in PAIRING_MODES:
+        raise ValueError(f"Unknown fill pairing {pairing!r}; expected one of {', '.join(PAIRING_MODES)}")
+    scale = 10**quantity_decimals
+    units = np.round(np.asarray(quantity, dtype=float) * scale)
+    fees = np.zeros(len(units)) if fees is None else np.nan_to_num(np.asarray(fees, dtype=float))
+    stop_price = np.full(len(units), np.nan) if stop_price is None else np.asarray(stop_price, dtype=float)
+    valid = np.isfinite(units) & (units != 0) & np.isfinite(price) & (group_codes >= 0)
+    if np.issubdtype(np.asarray(times).dtype, np.datetime64):
+        valid &= ~np.isnat(times)
+    rows = np.flatnonzero(valid)
+    if len(rows) == 0:
+        raise ValueError("No fills with a time, quantity and price")
+    rows = rows[np.lexsort((times[rows], group_codes[rows]))]
+    groups, times, units = group_codes[rows], np.asarray(times)[rows], units[rows].astype(np.int64)
+    price, fees, stop_price = np.asarray(price, dtype=float)[rows], fees[rows], stop_price[rows]
+
+    # Running position per group: one cumulative sum minus each group's starting offset.
+    total = np.cumsum(units)
+    group_starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])[: len(groups)]
+    offsets = np.repeat((total - units)[group_starts], np.diff(np.r_[group_starts, len(units)]))
+    after = total - offsets
+    before = after - units
+    fee_per_unit = fees / np.abs(units)
+
+    # Split position flips into a closing fill and an opening fill.
+    flips = (before != 0) & (after != 0) & (np.sign(before) != np.sign(after))
+    fill = np.repeat(np.arange(len(units)), 1 + flips)
+    second = np.r_[False, fill[1:] == fill[:-1]]
+    before = np.where(second, 0, before[fill])
+    after = np.where(flips[fill] & ~second, 0, after[fill])
+    units = after - before
+    opening = np.abs(after) > np.abs(before)
+
+    # Round trips open on a flat position; only those that get flat again count.
+    trade = np.cumsum(before == 0) - 1
+    trade_starts = np.flatnonzero(before == 0)
+    closed = after[np.r_[trade_starts[1:], len(units)] - 1] == 0
+    keep = closed[trade]
+    open_fills = len(np.unique(fill[~keep]))
+
+    opens = np.flatnonzero(keep & opening)
+    closes = np.flatnonzero(keep & ~opening)
+    opened = np.cumsum(np.abs(units[opens]))
+    closed_units = np.cumsum(np.abs(units[closes]))
+    # Closed round trips are balanced, so the opened and closed totals meet at
+    # every trade boundary and pieces never straddle two trades.
+    # Both totals are increasing, so a stable sort just merges two sorted runs.
+    breaks = np.sort(np.concatenate([opened, closed_units]), kind="stable")
+    breaks = breaks[np.r_[True, breaks[1:] != breaks[:-1]]] if len(breaks) else breaks
+    piece_units = np.diff(np.r_[0, breaks])
+    piece_start = breaks - piece_units
+    piece_units = piece_units.astype(float)
+    entry = opens[np.searchsorted(opened, piece_start, side="right")]
+    exit_ = closes[np.searchsorted(closed_units, piece_start, side="right")]
+
+    key = trade[entry] if pairing == "position" else entry
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])[: len(key)]
+    leading = entry[starts]
+    direction = np.sign(units[leading])
+    entry_price, exit_price = price[fill[entry]], price[fill[exit_]]
+    entry_value = np.add.reduceat(piece_units * entry_price, starts)
+    exit_value = np.add.reduceat(piece_units * exit_price, starts)
+    quantity_units = np.add.reduceat(piece_units, starts)
+    peak = quantity_units
+    if pairing == "position":
+        peak = np.maximum.reduceat(np.abs(after), trade_starts)[closed] if len(trade_starts) else quantity_units
+    stop_distance = piece_units * np.abs(entry_price - stop_price[fill[entry]])
+    known_stops = np.add.reduceat(np.isfinite(stop_distance), starts)
+    stop_points = np.add.reduceat(np.nan_to_num(stop_distance), starts)
+    piece_fees = piece_units * (fee_per_unit[fill[entry]] + fee_per_unit[fill[exit_]])
+
+    return {
+        "group": groups[fill[leading]],
+        "direction": direction.astype(np.int8),
+        "entry_time": times[fill[leading]],
+        "exit_time": np.maximum.reduceat(times[fill[exit_]], starts),
+        "quantity": peak / scale,
+        "entry_price": entry_value / quantity_units,
+        "exit_price": exit_value / quantity_units,
+        "points": direction * (exit_value - entry_value) / scale,
+        "fees": np.add.reduceat(piece_fees, starts),
+        "stop_points": np.where(known_stops > 0, stop_points / scale, np.nan),
+        "open_fills": open_fills,
+    }
+
+
+def fills_to_trades(fills: pd.DataFrame, fills_config: dict | None = None) -> pd.DataFrame:
+    """Aggregate a raw fills table into a journal with canonical column names for ``normalize_journal``.
+
+    ``fills_config`` overrides ``FILLS_DEFAULTS``; its optional ``columns``
+    table maps fill fields to source column names. P&L is the price gain
+    times quantity times the asset's multiplier, less fees. Risk comes from
+    stop prices on the entry fills, falling back to ``risk_amount``.
+    Trades are returned in order of entry, and ``attrs["fills"]`` counts the
+    fills used and those left in open positions.
+    """
+    settings = {**FILLS_DEFAULTS, **(fills_config or {})}
+    parsed = fill_columns(fills, settings.get("columns"))
+    asset_codes, assets = factorize_labels(parsed["asset"])
+    account_codes, accounts = (
+        factorize_labels(parsed["account"]) if "account" in parsed else (np.zeros(len(fills), dtype=np.intp), None)
+    )
+    group_codes = np.where(
+        (asset_codes >= 0) & (account_codes >= 0), account_codes * max(len(assets), 1) + asset_codes, -1
+    )
+    trades = pair_fills(
+        group_codes,
+        parsed["time"].to_numpy(dtype="datetime64[ns]"),
+        parsed["quantity"].to_numpy(dtype=float),
+        parsed["price"].to_numpy(dtype=float),
+        parsed["fees"].to_numpy(dtype=float) if "fees" in parsed else None,
+        parsed["stop_price"].to_numpy(dtype=float) if "stop_price" in parsed else None,
+        settings["pairing"],
+        settings["quantity_decimals"],
+    )
+
+    asset = trades["group"] % max(len(assets), 1)
+    multipliers = np.array([float(settings["multipliers"].get(str(name), 1.0)) for name in assets])
+    multiplier = multipliers[asset]
+    reward = trades["points"] * multiplier - trades["fees"]
+    risk = trades["stop_points"] * multiplier
+    if settings["risk_amount"] is not None:
+        risk = np.where(np.isnan(risk), float(settings["risk_amount"]), risk)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rr = np.where(risk > 0, reward / risk, np.nan)
+
+    entry = pd.Series(trades["entry_time"])
+    exit_ = pd.Series(trades["exit_time"])
+    entry_day, exit_day = entry.dt.normalize(), exit_.dt.normalize()
+    journal = pd.DataFrame(
+        {
+            "trade_date": entry_day,
+            "asset": np.asarray(assets, dtype=object)[asset],
+            "entry_time": seconds_to_time_strings(_seconds_of_day(entry, entry_day)),
+            "exit_time": seconds_to_time_strings(_seconds_of_day(exit_, exit_day)),
+            "exit_date": exit_day,
+            "position_size": trades["quantity"],
+            "direction": np.where(trades["direction"] > 0, "LONG", "SHORT"),
+            "entry_price": trades["entry_price"],
+            "outcome": np.select([reward > 0, reward < 0], ["WIN", "LOSS"], "BE"),
+            "rr": rr,
+            "risk_amount": risk,
+            "reward_amount": reward,
+        }
+    )
+    if accounts is not None:
+        journal["account"] = np.asarray(accounts, dtype=object)[trades["group"] // max(len(assets), 1)]
+    journal = journal.iloc[np.argsort(trades["entry_time"], kind="stable")].reset_index(drop=True)
+    journal.attrs["fills"] = {"fills": len(fills), "trades": len(journal), "open_fills": trades["open_fills"]}
+    return journal
+
+
+def _seconds_of_day(times: pd.Series, days: pd.Series) -> np.ndarray:
+    return ((times - days).to_numpy(dtype="timedelta64[ns]") // np.timedelta64(1, "s")).astype(np.int64)
@@ -0,0 +1,101 @@
+"""Compressed and archived CSV journals, decompressed while they are parsed.
+
+``.csv.gz``, ``.csv.bz2``, ``.csv.xz``, and ``.csv.zst`` files are parsed
+through a decompressing stream. Reading ``.zst`` requires ``zstandard``.
+In ``.zip`` bundles, each CSV member (plain or compressed) is parsed
+straight from the archive. Nothing is unpacked to disk.
+
+Members are read on a thread pool rather than processes. zlib and the pandas
+C parser release the GIL for most of the work, and threads hand back frames
+without pickling them.
+"""
+
+import bz2
+import gzip
+import lzma
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO
+
+import pandas as pd
+
+from config import ARCHIVE_MAX_WORKERS, ARCHIVE_SUFFIXES, COMPRESSION_SUFFIXES
+
+
+def is_compressed_journal(path: str | Path) -> bool:
+    """Check whether a path names a compressed CSV such as ``journal.csv.gz``."""
+    suffixes = [suffix.lower() for suffix in PurePosixPath(str(path)).suffixes[-2:]]
+    return len(suffixes) == 2 and suffixes[0] == ".csv" and suffixes[1] in COMPRESSION_SUFFIXES
+
+
+def is_journal_archive(path: str | Path) -> bool:
+    """Check whether a path names an archive of CSV journals."""
+    return Path(path).suffix.lower() in ARCHIVE_SUFFIXES
+
+
+def read_compressed_csv(path: str | Path) -> pd.DataFrame:
+    """Parse a compressed CSV journal through a decompressing stream."""
+    with open(path, "rb") as file, _decompress(file, Path(path).suffix.lower()) as stream:
+        return pd.read_csv(stream)
+
+
+def archive_members(path: str | Path) -> list[str]:
+    """CSV members of an archive in name order, skipping folders and hidden files."""
+    with zipfile.ZipFile(path) as archive:
+        names = [info.filename for info in archive.infolist() if not info.is_dir()]
+    return sorted(
+        name
+        for name in names
+        if not any(part.startswith((".", "__")) for part in PurePosixPath(name).parts)
+        and (PurePosixPath(name).suffix.lower() == ".csv" or is_compressed_journal(name))
+    )
+
+
+def read_journal_archive(path: str | Path, max_workers: int | None = ARCHIVE_MAX_WORKERS) -> pd.DataFrame:
+    """Parse every CSV member of an archive and stack them in name order.
+
+    Members are read concurrently, each through its own handle on the
+    archive. With ``max_workers=1`` or a single member they are read in
+    order on the calling thread.
+    """
+    members = archive_members(path)
+    if not members:
+        raise ValueError(f"No CSV journals found in archive: {path}")
+
+    read_member = partial(_read_archive_member, path)
+    if max_workers == 1 or len(members) < 2:
+        frames = [read_member(name) for name in members]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            frames = list(pool.map(read_member, members))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _read_archive_member(path: str | Path, name: str) -> pd.DataFrame:
+    with zipfile.ZipFile(path) as archive, archive.open(name) as member:
+        if not is_compressed_journal(name):
+            return pd.read_csv(member)
+        with _decompress(member, PurePosixPath(name).suffix.lower()) as stream:
+            return pd.read_csv(stream)
+
+
+def _decompress(stream: BinaryIO, suffix: str) -> BinaryIO:
+    """Wrap a binary stream in a decompressor for the codec of a file suffix."""
+    codec = COMPRESSION_SUFFIXES[suffix]
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=stream)
+    if codec == "bz2":
+        return bz2.BZ2File(stream)
+    if codec == "xz":
+        return lzma.LZMAFile(stream)
+    return _require_zstandard().ZstdDecompressor().stream_reader(stream)
+
+
+def _require_zstandard():
+    try:
+        import zstandard
+    except ImportError as error:
+        raise ImportError("zstandard is required to read .zst journals. Install it with: pip install zstandard") from error
+    return zstandard
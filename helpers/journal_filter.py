@@ -0,0 +1,384 @@
+"""Ad-hoc filters over a loaded journal, backed by precomputed indexes.
+
+Expressions such as ``asset == NQ and session == NY and weekday == tue and
+time between 09:30 and 10:00`` are parsed once and evaluated against:
+
+- packed bitmaps (one per distinct value) for label columns, combined with
+  bitwise and/or/not;
+- sorted indexes for dates, months and times of day, sliced with binary
+  search;
+- plain vectorized comparisons for other numeric columns such as ``rr``.
+
+Bitmaps for ``FILTER_BITMAP_COLUMNS`` are built when the index is created;
+sorted indexes and bitmaps for other label columns are built on first use.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from config import FILTER_BITMAP_COLUMNS, FILTER_FIELD_ALIASES, FILTER_RANGE_COLUMNS, WEEKDAY_NAMES
+from helpers.data_cleaning import time_strings_to_seconds
+from helpers.utils import factorize_labels, trade_dates
+
+# Evaluated expressions kept per index, so repeated filters are free.
+FILTER_CACHE_SIZE = 128
+
+DAY_NANOSECONDS = 86_400 * 10**9
+
+_TOKEN = re.compile(
+    r"""\s*(?:(?P<op>==|!=|<=|>=|<|>|=)|(?P<punct>[(),])|"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<word>[^\s()<>=!,"']+))"""
+)
+_KEYWORDS = {"and", "or", "not", "in", "between"}
+_TIME_OF_DAY = re.compile(r"([01]?\d|2[0-3]):([0-5]\d)(?::([0-5]\d))?")
+
+
+class FilterError(ValueError):
+    """Raised for filter expressions that cannot be parsed or evaluated."""
+
+
+def parse_filter(expression: str) -> tuple:
+    """Parse a filter expression into a nested tuple tree.
+
+    Grammar (keywords are case-insensitive; quote values containing spaces)::
+
+        expr       := term ("or" term)*
+        term       := factor ("and" factor)*
+        factor     := "not" factor | "(" expr ")" | comparison
+        comparison := field op value
+                    | field ["not"] "in" "(" value ("," value)* ")"
+                    | field "between" value "and" value
+
+    ``op`` is one of ``== != < <= > >=`` (``=`` means ``==``).
+    """
+    tokens = _tokenize(expression)
+    if not tokens:
+        raise FilterError("Empty filter expression")
+    parser = _Parser(tokens)
+    tree = parser.expression()
+    if parser.position != len(tokens):
+        raise FilterError(f"Unexpected {tokens[parser.position][1]!r} in filter")
+    return tree
+
+
+def filter_columns(expression: str) -> list[str]:
+    """Journal columns a filter expression reads, with field aliases resolved."""
+    columns: dict[str, None] = {}
+    pending = [parse_filter(expression)]
+    while pending:
+        node = pending.pop()
+        if node[0] == "cmp":
+            name = node[1].strip().lower()
+            columns[FILTER_FIELD_ALIASES.get(name, name)] = None
+        else:
+            pending.extend(reversed(node[1:]))
+    return list(columns)
+
+
+class JournalIndex:
+    """Precomputed indexes over one normalized journal for fast repeated filtering."""
+
+    def __init__(self, df: pd.DataFrame, bitmap_columns: list[str] | None = None):
+        self.df = df
+        self.rows = len(df)
+        self._bitmaps: dict[str, tuple[pd.Index, list[np.ndarray]]] = {}
+        self._ranges: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        for column in FILTER_BITMAP_COLUMNS if bitmap_columns is None else bitmap_columns:
+            if column in df.columns:
+                self._bitmap_column(column)
+
+    def mask(self, expression: str) -> np.ndarray:
+        """Boolean row mask for a filter expression."""
+        return np.unpackbits(self._evaluate_cached(expression), count=self.rows).astype(bool)
+
+    def count(self, expression: str) -> int:
+        """Number of trades matching a filter expression."""
+        return int(np.unpackbits(self._evaluate_cached(expression), count=self.rows).sum())
+
+    def positions(self, expression: str) -> np.ndarray:
+        """Row positions (in journal order) matching a filter expression."""
+        return np.flatnonzero(self.mask(expression))
+
+    def select(self, expression: str) -> pd.DataFrame:
+        """The matching trades as a journal with a fresh index, ready for stats and plots."""
+        selected = self.df.take(self.positions(expression)).reset_index(drop=True)
+        # The column profile describes the full journal, not the selection.
+        selected.attrs.pop("column_profile", None)
+        return selected
+
+    def _evaluate_cached(self, expression: str) -> np.ndarray:
+        key = " ".join(expression.split())
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        bits = self._evaluate(parse_filter(expression))
+        with self._lock:
+            self._cache[key] = bits
+            while len(self._cache) > FILTER_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return bits
+
+    def _evaluate(self, node: tuple) -> np.ndarray:
+        kind = node[0]
+        if kind == "and":
+            return self._evaluate(node[1]) & self._evaluate(node[2])
+        if kind == "or":
+            return self._evaluate(node[1]) | self._evaluate(node[2])
+        if kind == "not":
+            return ~self._evaluate(node[1])
+        _, field, operator, values = node
+        column = self._resolve_field(field)
+        if column in FILTER_RANGE_COLUMNS:
+            return self._range_bits(column, operator, values)
+        if column in self._bitmaps or not pd.api.types.is_numeric_dtype(self.df[column]):
+            return self._label_bits(column, operator, values)
+        return self._numeric_bits(column, operator, values)
+
+    def _resolve_field(self, field: str) -> str:
+        name = field.strip().lower()
+        column = FILTER_FIELD_ALIASES.get(name, name)
+        if column not in self.df.columns:
+            raise FilterError(f"Unknown filter field: {field}")
+        return column
+
+    def _bitmap_column(self, column: str) -> tuple[pd.Index, list[np.ndarray]]:
+        """Per-value packed bitmaps; integer calendar columns keep -1 as missing."""
+        if column not in self._bitmaps:
+            series = self.df[column]
+            if pd.api.types.is_integer_dtype(series):
+                values = series.to_numpy()
+                codes, uniques = pd.factorize(np.where(values >= 0, values, -1), use_na_sentinel=True)
+                keep = uniques >= 0
+                remap = np.append(np.where(keep, np.cumsum(keep) - 1, -1), -1)
+                codes, uniques = remap[codes], pd.Index(uniques[keep])
+            else:
+                codes, uniques = factorize_labels(series)
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            bitmaps = []
+            for code in range(len(uniques)):
+                flags = np.zeros(self.rows, dtype=bool)
+                flags[order[bounds[code] : bounds[code + 1]]] = True
+                bitmaps.append(np.packbits(flags))
+            self._bitmaps[column] = (uniques, bitmaps)
+        return self._bitmaps[column]
+
+    def _label_bits(self, column: str, operator: str, values: list[str]) -> np.ndarray:
+        uniques, bitmaps = self._bitmap_column(column)
+        if pd.api.types.is_integer_dtype(uniques):
+            targets = np.array([_integer_value(column, value) for value in values])
+            keys = uniques.to_numpy()
+        else:
+            if operator not in ("==", "!=", "in", "not in"):
+                raise FilterError(f"Operator {operator} is not supported for text field {column}")
+            targets = np.array([value.casefold() for value in values], dtype=object)
+            keys = uniques.astype(str).str.casefold().to_numpy(dtype=object)
+
+        selected = _compare(keys, operator, targets)
+        return self._union(bitmaps, selected, complement=operator in ("!=", "not in"))
+
+    def _union(self, bitmaps: list[np.ndarray], selected: np.ndarray, complement: bool) -> np.ndarray:
+        """OR the bitmaps of the selected values; complements stay within rows that have a value."""
+        chosen = [bitmaps[code] for code in np.flatnonzero(selected)]
+        bits = np.bitwise_or.reduce(chosen) if chosen else np.zeros((self.rows + 7) // 8, dtype=np.uint8)
+        if complement:
+            present = np.bitwise_or.reduce(bitmaps) if bitmaps else np.zeros_like(bits)
+            bits = present & ~bits
+        return bits
+
+    def _range_index(self, column: str) -> tuple[np.ndarray, np.ndarray]:
+        """Row positions sorted by value (missing values left out) and the sorted keys."""
+        if column not in self._ranges:
+            if column == "trade_date":
+                dates = trade_dates(self.df[column])
+                keys = dates.to_numpy(dtype="datetime64[ns]").view(np.int64)
+                valid = dates.notna().to_numpy()
+            else:
+                keys = self.df[column].to_numpy(dtype=np.int64)
+                valid = keys >= 0
+            positions = np.flatnonzero(valid)
+            order = positions[np.argsort(keys[positions], kind="stable")]
+            self._ranges[column] = (order, keys[order])
+        return self._ranges[column]
+
+    def _range_bits(self, column: str, operator: str, values: list[str]) -> np.ndarray:
+        order, keys = self._range_index(column)
+        spans = [_range_value(column, value) for value in values]
+        size = len(keys)
+
+        def left(key: int) -> int:
+            return int(np.searchsorted(keys, key, side="left"))
+
+        if operator == "between":
+            (low, _), (_, high) = spans
+            slices = [(left(low), left(high))]
+        elif operator in ("==", "!=", "in", "not in"):
+            slices = [(left(start), left(end)) for start, end in spans]
+        else:
+            start, end = spans[0]
+            slices = [{
+                "<": (0, left(start)),
+                "<=": (0, left(end)),
+                ">": (left(end), size),
+                ">=": (left(start), size),
+            }[operator]]
+
+        flags = np.zeros(self.rows, dtype=bool)
+        for low, high in slices:
+            flags[order[low:high]] = True
+        if operator in ("!=", "not in"):
+            present = np.zeros(self.rows, dtype=bool)
+            present[order] = True
+            flags = present & ~flags
+        return np.packbits(flags)
+
+    def _numeric_bits(self, column: str, operator: str, values: list[str]) -> np.ndarray:
+        try:
+            targets = np.array([float(value) for value in values])
+        except ValueError as exc:
+            raise FilterError(f"Expected numbers for field {column}: {', '.join(values)}") from exc
+        data = pd.to_numeric(self.df[column], errors="coerce").to_numpy(dtype=float)
+        flags = _compare(data, operator, targets)
+        if operator in ("!=", "not in"):
+            flags = ~flags
+        flags &= ~np.isnan(data)
+        return np.packbits(flags)
+
+
+def filter_journal(df: pd.DataFrame, expression: str) -> pd.DataFrame:
+    """Filter a normalized journal once; build a ``JournalIndex`` to run many filters."""
+    return JournalIndex(df).select(expression)
+
+
+def _compare(keys: np.ndarray, operator: str, targets: np.ndarray) -> np.ndarray:
+    if operator in ("==", "!=", "in", "not in"):
+        return np.isin(keys, targets)
+    if operator == "between":
+        return (keys >= targets[0]) & (keys <= targets[1])
+    compare = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal}[operator]
+    return compare(keys, targets[0])
+
+
+def _integer_value(column: str, value: str) -> int:
+    text = value.strip().lower()
+    if column == "trade_weekday" and not text.lstrip("-").isdigit():
+        matches = [code for code, name in enumerate(WEEKDAY_NAMES) if len(text) >= 2 and name.startswith(text)]
+        if len(matches) != 1:
+            raise FilterError(f"Unknown weekday: {value}")
+        return matches[0]
+    try:
+        return int(text)
+    except ValueError as exc:
+        raise FilterError(f"Expected an integer for field {column}: {value}") from exc
+
+
+def _range_value(column: str, value: str) -> tuple[int, int]:
+    """Half-open ``[start, end)`` key span covered by a literal in a range column."""
+    text = value.strip()
+    if column == "trade_date":
+        try:
+            stamp = pd.Timestamp(text)
+        except ValueError as exc:
+            raise FilterError(f"Invalid date: {value}") from exc
+        start = stamp.as_unit("ns").value
+        # A bare date covers the whole day.
+        return (start, start + DAY_NANOSECONDS) if stamp == stamp.normalize() else (start, start + 1)
+    if column == "trade_month":
+        digits = text.replace("-", "").replace("/", "")
+        if len(digits) != 6 or not digits.isdigit():
+            raise FilterError(f"Invalid month (expected YYYY-MM): {value}")
+        return int(digits), int(digits) + 1
+    if not _TIME_OF_DAY.fullmatch(text):
+        raise FilterError(f"Invalid time of day (expected HH:MM[:SS]): {value}")
+    seconds = int(time_strings_to_seconds(pd.Series([text]))[0])
+    return seconds, seconds + 1
+
+
+def _tokenize(expression: str) -> list[tuple[str, str]]:
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if not match or match.end() == position:
+            raise FilterError(f"Cannot parse filter near {expression[position:]!r}")
+        position = match.end()
+        if match.group("op"):
+            tokens.append(("op", "==" if match.group("op") == "=" else match.group("op")))
+        elif match.group("punct"):
+            tokens.append(("punct", match.group("punct")))
+        elif match.group("dq") is not None or match.group("sq") is not None:
+            tokens.append(("value", match.group("dq") if match.group("dq") is not None else match.group("sq")))
+        else:
+            word = match.group("word")
+            tokens.append(("keyword", word.lower()) if word.lower() in _KEYWORDS else ("value", word))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens: list[tuple[str, str]]):
+        self.tokens = tokens
+        self.position = 0
+
+    def expression(self) -> tuple:
+        node = self.term()
+        while self._accept("keyword", "or"):
+            node = ("or", node, self.term())
+        return node
+
+    def term(self) -> tuple:
+        node = self.factor()
+        while self._accept("keyword", "and"):
+            node = ("and", node, self.factor())
+        return node
+
+    def factor(self) -> tuple:
+        if self._accept("keyword", "not"):
+            return ("not", self.factor())
+        if self._accept("punct", "("):
+            node = self.expression()
+            self._expect("punct", ")")
+            return node
+        return self.comparison()
+
+    def comparison(self) -> tuple:
+        field = self._expect("value")
+        if self._accept("keyword", "between"):
+            low = self._expect("value")
+            self._expect("keyword", "and")
+            return ("cmp", field, "between", [low, self._expect("value")])
+        negate = self._accept("keyword", "not")
+        if self._accept("keyword", "in"):
+            self._expect("punct", "(")
+            values = [self._expect("value")]
+            while self._accept("punct", ","):
+                values.append(self._expect("value"))
+            self._expect("punct", ")")
+            return ("cmp", field, "not in" if negate else "in", values)
+        if negate:
+            raise FilterError(f"Expected 'in' after 'not' for field {field}")
+        operator = self._expect("op")
+        return ("cmp", field, operator, [self._expect("value")])
+
+    def _accept(self, kind: str, text: str | None = None) -> bool:
+        if self.position < len(self.tokens):
+            token_kind, token_text = self.tokens[self.position]
+            if token_kind == kind and (text is None or token_text == text):
+                self.position += 1
+                return True
+        return False
+
+    def _expect(self, kind: str, text: str | None = None) -> str:
+        if self.position >= len(self.tokens):
+            raise FilterError(f"Filter ended early; expected {text or kind}")
+        token_kind, token_text = self.tokens[self.position]
+        if token_kind != kind or (text is not None and token_text != text):
+            raise FilterError(f"Expected {text or kind} but found {token_text!r} in filter")
+        self.position += 1
+        return token_text
@@ -0,0 +1,101 @@
+"""Load one or several journals from the CLI or the report server and normalize them."""
+
+import pandas as pd
+
+from config import DATA_URL_OVERALL, DATA_URL_WEEKLY
+from helpers.journal_merge import merge_journals
+from helpers.journal_normalization import load_journal_config, load_journal_data, normalize_journal
+from helpers.utils import column_profile, trade_dates
+
+
+def load_raw_journal(
+    input_path: str | None, journal_config: dict, report_columns: list[str] | None = None
+) -> pd.DataFrame:
+    """Load one journal, reporting how broker fills were paired."""
+    raw_df = load_journal_data(input_path, journal_config, report_columns)
+    if "fills" in raw_df.attrs:
+        counts = raw_df.attrs["fills"]
+        print(f"Paired {counts['fills']} fills into {counts['trades']} trades")
+        if counts["open_fills"]:
+            print(f"Left out {counts['open_fills']} fills of positions still open")
+    return raw_df
+
+
+def report_merge(counts: dict, conflicts: pd.DataFrame, conflicts_path: str | None) -> None:
+    """Print what merging journals dropped and where repeated trades disagree."""
+    print(
+        f"Merged {counts['journals']} journals: {counts['rows'] - counts['duplicates']} trades kept, "
+        f"{counts['duplicates']} repeated trades dropped"
+    )
+    if conflicts.empty:
+        return
+    columns = conflicts["columns"].str.split(", ").explode().value_counts()
+    print(
+        f"{len(conflicts)} repeated trades disagree with the kept row on: "
+        + ", ".join(f"{name} ({count})" for name, count in columns.items())
+    )
+    if conflicts_path:
+        conflicts.to_csv(conflicts_path, index=False)
+        print(f"Wrote merge conflicts to {conflicts_path}")
+    else:
+        print(conflicts.head().to_string(index=False))
+
+
+def load_input_dataframe(
+    report_type: str,
+    input_path: str | list[str] | None,
+    config_path: str | None,
+    fills: bool = False,
+    since: str | None = None,
+    until: str | None = None,
+    conflicts_path: str | None = None,
+    normalize_workers: int | None = None,
+    report_columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """Load data from local journals or fallback URL, then normalize it.
+
+    With ``fills``, the input holds broker fills that are paired into trades.
+    Several input paths are normalized one by one and merged, dropping trades
+    repeated across them; ``conflicts_path`` receives a CSV of repeated trades
+    whose other columns disagree. ``since``/``until`` keep trades dated
+    within that range; SQLite stores only read those dates.
+    ``normalize_workers`` overrides the threads cleaning columns.
+    ``report_columns`` are the columns the report reads: a single stored
+    journal loads only those (see ``load_journal_data``), while merged
+    inputs are loaded in full so repeated trades are compared on every column.
+    """
+    journal_config = load_journal_config(config_path)
+    if fills:
+        journal_config["fills"] = {**journal_config.get("fills", {}), "enabled": True}
+    if normalize_workers is not None:
+        journal_config["normalization"] = {**journal_config.get("normalization", {}), "max_workers": normalize_workers}
+    if since or until:
+        journal_config["source"] = {**journal_config.get("source", {}), "start": since, "end": until}
+
+    paths = input_path if isinstance(input_path, list) else [input_path]
+    if len(paths) > 1:
+        journals = {path: normalize_journal(load_raw_journal(path, journal_config), journal_config) for path in paths}
+        df, conflicts = merge_journals(journals, journal_config.get("merge"))
+        report_merge(df.attrs["merge"], conflicts, conflicts_path)
+    elif paths[0] or journal_config.get("source", {}).get("path"):
+        df = normalize_journal(load_raw_journal(paths[0], journal_config, report_columns), journal_config)
+    else:
+        url_map = {
+            "weekly": DATA_URL_WEEKLY,
+            "overall": DATA_URL_OVERALL,
+        }
+        df = normalize_journal(pd.read_csv(url_map[report_type]), journal_config)
+
+    if (since or until) and "trade_date" in df.columns:
+        dates = trade_dates(df["trade_date"])
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+        keep = pd.Series(True, index=df.index)
+        if since:
+            keep &= dates >= pd.Timestamp(since).normalize()
+        if until:
+            keep &= dates <= pd.Timestamp(until).normalize()
+        if not keep.all():
+            df = df[keep.to_numpy()].reset_index(drop=True)
+            df.attrs["column_profile"] = column_profile(df)
+    return df
@@ -0,0 +1,206 @@
+"""Merge overlapping journal exports without double counting trades.
+
+Every trade gets a 64-bit fingerprint hashed from the ``key_columns`` of
+``MERGE_DEFAULTS``. The exports are merged as multisets: a fingerprint is
+kept as many times as the one export that lists it most often, so trades an
+export genuinely repeats survive while copies across exports are dropped.
+
+Dedup runs one hash-table pass per fingerprint partition, keyed on the top
+bits of the fingerprint, so the hash index never holds more than about
+``partition_rows`` rows. Only the index is bounded: the input journals and
+their fingerprints stay in memory for the whole merge. Duplicates whose other shared columns disagree are
+reported as conflicts; the row from the earlier export is kept.
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import CALENDAR_COLUMNS, MERGE_DEFAULTS
+from helpers.utils import column_profile, trade_dates
+
+
+def row_fingerprints(df: pd.DataFrame, key_columns: list[str], decimals: int = MERGE_DEFAULTS["decimals"]) -> np.ndarray:
+    """Hash the key columns of a normalized journal into one uint64 per row.
+
+    Dates are compared by day whatever their unit, times by whole seconds,
+    and float columns after rounding to ``decimals``, so exports that format
+    values differently still fingerprint alike.
+    """
+    keys = {}
+    for name in key_columns:
+        if name == "trade_date":
+            # Parsed and stored dates can differ in unit; compare them in one.
+            keys[name] = trade_dates(df[name]).dt.normalize().dt.as_unit("ns")
+        elif f"{name}_seconds" in df.columns:
+            keys[name] = df[f"{name}_seconds"]
+        elif pd.api.types.is_float_dtype(df[name]):
+            keys[name] = np.round(df[name].to_numpy(), decimals) + 0.0
+        else:
+            keys[name] = df[name]
+    return pd.util.hash_pandas_object(pd.DataFrame(keys, index=df.index, copy=False), index=False).to_numpy()
+
+
+def find_duplicates(
+    fingerprints: np.ndarray, sources: np.ndarray, partition_rows: int = MERGE_DEFAULTS["partition_rows"]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find rows that repeat an earlier export's trade.
+
+    Args:
+        fingerprints: Row fingerprints of all exports, concatenated in export order.
+        sources: Export number of each row.
+        partition_rows: Target rows per hash partition; bounds the hash index,
+            not the arrays passed in.
+
+    Returns:
+        tuple: Positions of the duplicate rows, ascending, and the position of
+        the row each one repeats.
+    """
+    bits = max(0, int(np.ceil(np.log2(max(len(fingerprints), 1) / partition_rows))))
+    if bits:
+        # One stable sort groups rows by partition, keeping export order inside each.
+        partitions = fingerprints >> np.uint64(64 - bits)
+        order = np.argsort(partitions, kind="stable")
+        sorted_partitions = partitions[order]
+        groups = np.split(order, np.flatnonzero(sorted_partitions[1:] != sorted_partitions[:-1]) + 1)
+    else:
+        groups = [np.arange(len(fingerprints))]
+
+    duplicates, originals = [], []
+    for positions in groups:
+        codes, _ = pd.factorize(fingerprints[positions])
+        # Number the copies of a trade within its own export; only the nth copy
+        # from a later export repeats the nth copy from an earlier one.
+        copy = (
+            pd.DataFrame({"code": codes, "source": sources[positions]}, copy=False)
+            .groupby(["code", "source"], sort=False)
+            .cumcount()
+            .to_numpy()
+        )
+        groups, _ = pd.factorize(codes.astype(np.int64) * (int(copy.max(initial=0)) + 1) + copy)
+        # factorize numbers groups by first appearance, so a group starts where
+        # its code exceeds every earlier one.
+        first = np.flatnonzero(groups > np.maximum.accumulate(np.concatenate(([-1], groups[:-1]))))
+        repeats = np.flatnonzero(first[groups] != np.arange(len(groups)))
+        duplicates.append(positions[repeats])
+        originals.append(positions[first[groups[repeats]]])
+
+    duplicates, originals = np.concatenate(duplicates), np.concatenate(originals)
+    order = np.argsort(duplicates, kind="stable")
+    return duplicates[order], originals[order]
+
+
+def merge_journals(
+    journals: dict[str, pd.DataFrame], merge_config: dict | None = None
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Merge normalized journals from overlapping exports into one journal.
+
+    ``merge_config`` overrides ``MERGE_DEFAULTS``. Key columns missing from
+    any journal are left out of the fingerprint. Trades keep export order,
+    and the merged journal's ``attrs["merge"]`` counts journals, rows,
+    duplicates dropped, and conflicts.
+
+    Returns:
+        tuple: Merged journal and one row per conflict. Each conflict holds
+        the key values, both exports and rows, and the columns that differ.
+    """
+    settings = {**MERGE_DEFAULTS, **(merge_config or {})}
+    names, frames = list(journals), list(journals.values())
+    key_columns = [name for name in settings["key_columns"] if all(name in frame.columns for frame in frames)]
+    if not key_columns:
+        raise ValueError(f"The journals share none of the fingerprint columns: {', '.join(settings['key_columns'])}")
+
+    lengths = np.array([len(frame) for frame in frames])
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    sources = np.repeat(np.arange(len(frames), dtype=np.int32), lengths)
+    fingerprints = np.concatenate([row_fingerprints(frame, key_columns, settings["decimals"]) for frame in frames])
+    duplicates, originals = find_duplicates(fingerprints, sources, settings["partition_rows"])
+
+    shared = [name for name in frames[0].columns if all(name in frame.columns for frame in frames[1:])]
+    compared = [name for name in shared if name not in key_columns and name not in CALENDAR_COLUMNS]
+    conflicts = _conflicts(frames, names, offsets, sources, duplicates, originals, key_columns, compared)
+
+    keep = np.ones(len(fingerprints), dtype=bool)
+    keep[duplicates] = False
+    parts = [frame.iloc[np.flatnonzero(keep[offsets[i] : offsets[i + 1]])] for i, frame in enumerate(frames)]
+    for name in shared:
+        if all(isinstance(part[name].dtype, pd.CategoricalDtype) for part in parts):
+            categories = pd.Index(np.concatenate([part[name].cat.categories.to_numpy(dtype=object) for part in parts]))
+            categories = categories.unique()
+            parts = [part.assign(**{name: part[name].cat.set_categories(categories)}) for part in parts]
+    merged = pd.concat(parts, ignore_index=True)
+
+    detected_mappings = {}
+    for frame in reversed(frames):
+        detected_mappings.update(frame.attrs.get("detected_mappings", {}))
+    column_timings = {}
+    for frame in frames:
+        for name, seconds in frame.attrs.get("column_timings", {}).items():
+            column_timings[name] = column_timings.get(name, 0.0) + seconds
+    merged.attrs = {
+        "detected_mappings": detected_mappings,
+        "column_timings": column_timings,
+        "column_profile": column_profile(merged),
+        "merge": {
+            "journals": len(frames),
+            "rows": len(fingerprints),
+            "duplicates": len(duplicates),
+            "conflicts": len(conflicts),
+        },
+    }
+    return merged, conflicts
+
+
+def _conflicts(
+    frames: list[pd.DataFrame],
+    names: list[str],
+    offsets: np.ndarray,
+    sources: np.ndarray,
+    duplicates: np.ndarray,
+    originals: np.ndarray,
+    key_columns: list[str],
+    compared: list[str],
+) -> pd.DataFrame:
+    """Duplicate rows whose compared columns differ from the row they repeat."""
+    if compared and len(duplicates):
+        # Cheap screen on value hashes first; only hash mismatches are compared value by value.
+        values = np.concatenate(
+            [pd.util.hash_pandas_object(frame[compared], index=False).to_numpy() for frame in frames]
+        )
+        candidates = np.flatnonzero(values[duplicates] != values[originals])
+    else:
+        candidates = np.array([], dtype=np.int64)
+    duplicates, originals = duplicates[candidates], originals[candidates]
+
+    differing = []
+    for name in compared:
+        left = _gather(frames, name, offsets, sources, originals)
+        right = _gather(frames, name, offsets, sources, duplicates)
+        missing = pd.isna(left) | pd.isna(right)
+        same = pd.isna(left) & pd.isna(right)
+        same[~missing] = left[~missing] == right[~missing]
+        differing.append(~same)
+    differing = np.array(differing, dtype=bool).reshape(len(compared), len(duplicates))
+    found = differing.any(axis=0)
+    duplicates, originals, differing = duplicates[found], originals[found], differing[:, found]
+
+    conflicts = {name: _gather(frames, name, offsets, sources, originals) for name in key_columns}
+    conflicts["source"] = np.array(names, dtype=object)[sources[originals]]
+    conflicts["row"] = originals - offsets[sources[originals]]
+    conflicts["duplicate_source"] = np.array(names, dtype=object)[sources[duplicates]]
+    conflicts["duplicate_row"] = duplicates - offsets[sources[duplicates]]
+    conflicts["columns"] = [
+        ", ".join(name for name, differs in zip(compared, column) if differs) for column in differing.T
+    ]
+    return pd.DataFrame(conflicts)
+
+
+def _gather(
+    frames: list[pd.DataFrame], name: str, offsets: np.ndarray, sources: np.ndarray, positions: np.ndarray
+) -> np.ndarray:
+    """Values of one column at positions across the concatenated journals."""
+    values = np.empty(len(positions), dtype=object)
+    for source, frame in enumerate(frames):
+        selected = np.flatnonzero(sources[positions] == source)
+        if len(selected):
+            values[selected] = frame[name].iloc[positions[selected] - offsets[source]].to_numpy(dtype=object)
+    return values
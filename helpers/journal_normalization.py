@@ -1,17 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+import time
 import tomllib
 
+import numpy as np
 import pandas as pd
 
 from config import (
+    ARCHIVE_MAX_WORKERS,
     CANONICAL_COLUMNS,
     COLUMN_ALIASES,
+    COLUMNAR_TIME_COLUMNS,
     DEFAULT_JOURNAL_CONFIG_PATH,
+    DIRECTION_VALUE_MAP,
     MINIMUM_REQUIRED_COLUMNS,
+    NORMALIZATION_DEFAULTS,
     OUTCOME_VALUE_MAP,
+    WEEKDAY_NAMES,
 )
-from helpers.data_cleaning import clean_numeric_series, convert_to_datetime
-from helpers.utils import normalize_label
+from helpers.columnar_journal import is_columnar_journal, read_columnar_journal, seconds_to_time_strings
+from helpers.data_cleaning import add_calendar_columns, clean_numeric_series, convert_to_datetime
+from helpers.fills import fills_to_trades
+from helpers.journal_archives import (
+    is_compressed_journal,
+    is_journal_archive,
+    read_compressed_csv,
+    read_journal_archive,
+)
+from helpers.sqlite_journal import is_sqlite_journal, read_sqlite_journal
+from helpers.utils import column_profile, normalize_label
 
 
 def load_journal_config(config_path: str | None = None) -> dict:
@@ -41,8 +59,25 @@ def load_journal_config(config_path: str | None = None) -> dict:
     return loaded
 
 
-def load_journal_data(input_path: str | None, journal_config: dict) -> pd.DataFrame:
-    """Load CSV or Excel journal data from CLI input or config."""
+def load_journal_data(
+    input_path: str | None, journal_config: dict, report_columns: list[str] | None = None
+) -> pd.DataFrame:
+    """Load CSV, Excel, columnar, or SQLite-store journal data from CLI input or config.
+
+    CSVs may be compressed (``.csv.gz``, ``.csv.bz2``, ``.csv.xz``,
+    ``.csv.zst``) or bundled in a ``.zip``. Archive members are read
+    concurrently on ``source.max_workers`` threads and stacked.
+
+    Columnar journals and SQLite stores load only ``source.columns`` (default:
+    all); a SQLite store also only reads the trade dates from ``source.start``
+    through ``source.end`` when set. ``HH:MM:SS`` time strings are rebuilt only
+    when all columns are loaded or the subset names them; reports read the
+    ``<column>_seconds`` values instead. Without ``source.columns``, the
+    ``report_columns`` a report reads are loaded, skipping any the store lacks.
+
+    With ``fills.enabled`` in the config, a CSV or Excel source holds broker
+    fills and is aggregated into round-trip trades first.
+    """
     source_path = input_path or journal_config.get("source", {}).get("path")
     if not source_path:
         raise ValueError(
@@ -53,18 +88,40 @@ def load_journal_data(input_path: str | None, journal_config: dict) -> pd.DataFr
     if not path.exists():
         raise FileNotFoundError(f"Journal file not found: {path}")
 
+    source = journal_config.get("source", {})
+    columns, missing_ok = source.get("columns"), False
+    if columns is None and report_columns is not None:
+        columns, missing_ok = report_columns, True
+    decode_times = columns is None or any(name in COLUMNAR_TIME_COLUMNS for name in columns)
+    if is_columnar_journal(path):
+        return read_columnar_journal(path, columns, decode_times, missing_ok)
+    if is_sqlite_journal(path):
+        return read_sqlite_journal(
+            path, columns, source.get("start"), source.get("end"), decode_times, missing_ok=missing_ok
+        )
+
     suffix = path.suffix.lower()
-    if suffix == ".csv":
-        return pd.read_csv(path)
-    if suffix in {".xlsx", ".xls", ".xlsm"}:
+    if is_journal_archive(path):
+        raw = read_journal_archive(path, journal_config.get("source", {}).get("max_workers", ARCHIVE_MAX_WORKERS))
+    elif is_compressed_journal(path):
+        raw = read_compressed_csv(path)
+    elif suffix == ".csv":
+        raw = pd.read_csv(path)
+    elif suffix in {".xlsx", ".xls", ".xlsm"}:
         sheet_name = journal_config.get("source", {}).get("sheet_name", 0)
-        return pd.read_excel(path, sheet_name=sheet_name)
+        raw = pd.read_excel(path, sheet_name=sheet_name)
+    else:
+        raise ValueError(f"Unsupported file type: {suffix}")
 
-    raise ValueError(f"Unsupported file type: {suffix}")
+    fills_config = journal_config.get("fills", {})
+    return fills_to_trades(raw, fills_config) if fills_config.get("enabled") else raw
 
 
 def normalize_journal(df: pd.DataFrame, journal_config: dict) -> pd.DataFrame:
     """Rename, clean, and enrich raw journal data into the internal schema."""
+    if df.attrs.get("normalized"):
+        return df
+
     renamed, detected_mappings = _rename_columns(df, journal_config.get("columns", {}))
     normalized = pd.DataFrame(index=renamed.index)
 
@@ -72,9 +129,12 @@ def normalize_journal(df: pd.DataFrame, journal_config: dict) -> pd.DataFrame:
         if column in renamed.columns:
             normalized[column] = renamed[column]
 
-    normalized = _clean_columns(normalized, journal_config.get("outcome_map", {}))
+    max_workers = journal_config.get("normalization", {}).get("max_workers", NORMALIZATION_DEFAULTS["max_workers"])
+    normalized, column_timings = _clean_columns(normalized, journal_config.get("outcome_map", {}), max_workers)
     normalized = _derive_columns(normalized)
     normalized = normalized.dropna(how="all").reset_index(drop=True)
+    normalized = add_calendar_columns(normalized)
+    normalized.attrs["column_profile"] = column_profile(normalized)
 
     missing_required = [
         column for column in MINIMUM_REQUIRED_COLUMNS if column not in normalized.columns
@@ -85,6 +145,7 @@ def normalize_journal(df: pd.DataFrame, journal_config: dict) -> pd.DataFrame:
         )
 
     normalized.attrs["detected_mappings"] = detected_mappings
+    normalized.attrs["column_timings"] = column_timings
     return normalized
 
 
@@ -123,66 +184,118 @@ def _match_source_column(columns: pd.Index, desired_name: str) -> str | None:
     return normalized_columns.get(normalize_label(desired_name))
 
 
-def _clean_columns(df: pd.DataFrame, outcome_map: dict[str, str]) -> pd.DataFrame:
-    cleaned = df.copy()
+def _clean_columns(
+    df: pd.DataFrame, outcome_map: dict[str, str], max_workers: int | None = 1
+) -> tuple[pd.DataFrame, dict[str, float]]:
+    """Clean each mapped column and time how long each one takes.
 
-    if "trade_date" in cleaned.columns:
-        cleaned["trade_date"] = _safe_to_datetime(cleaned["trade_date"])
+    Columns are cleaned independently of each other. When ``max_workers`` is
+    not 1, they are cleaned concurrently on a thread pool; the vectorized
+    pandas and NumPy work releases the GIL. Columns without a cleaner are
+    passed through uncopied.
 
-    for time_column in ("entry_time", "exit_time"):
-        if time_column in cleaned.columns:
-            cleaned[time_column] = cleaned[time_column].apply(_normalize_time_value)
-
-    for numeric_column in ("position_size", "rr", "risk_amount", "reward_amount", "stop_loss_points"):
-        if numeric_column in cleaned.columns:
-            cleaned[numeric_column] = clean_numeric_series(cleaned[numeric_column], return_nan=True)
-
-    if "trade_day" in cleaned.columns:
-        cleaned["trade_day"] = cleaned["trade_day"].astype("string").str.strip().str.lower()
-
-    if "asset" in cleaned.columns:
-        cleaned["asset"] = cleaned["asset"].astype("string").str.strip()
-
-    if "outcome" in cleaned.columns:
-        cleaned["outcome"] = (
-            cleaned["outcome"]
-            .astype("string")
-            .str.strip()
-            .str.lower()
-            .map(lambda value: outcome_map.get(value, value.upper() if isinstance(value, str) else value))
-        )
+    Returns:
+        tuple: Cleaned frame and the seconds spent on each cleaned column.
+    """
+    cleaners = {}
+    for date_column in ("trade_date", "exit_date"):
+        cleaners[date_column] = _safe_to_datetime
 
-    return cleaned
+    for time_column in ("entry_time", "exit_time"):
+        cleaners[time_column] = _normalize_times
+
+    for numeric_column in ("position_size", "rr", "risk_amount", "reward_amount", "stop_loss_points", "entry_price"):
+        cleaners[numeric_column] = partial(clean_numeric_series, return_nan=True)
+
+    cleaners["trade_day"] = partial(_normalize_labels, transform=lambda labels: labels.str.strip().str.lower())
+    cleaners["asset"] = partial(_normalize_labels, transform=lambda labels: labels.str.strip())
+    cleaners["outcome"] = partial(
+        _normalize_labels,
+        transform=lambda labels: labels.str.strip()
+        .str.lower()
+        .map(lambda value: outcome_map.get(value, value.upper() if isinstance(value, str) else value)),
+    )
+    cleaners["direction"] = partial(
+        _normalize_labels,
+        transform=lambda labels: labels.str.strip().str.lower().map(lambda value: DIRECTION_VALUE_MAP.get(value, pd.NA)),
+    )
+
+    names = [name for name in cleaners if name in df.columns]
+    timings = {}
+
+    def clean(name: str) -> pd.Series:
+        started = time.perf_counter()
+        cleaned = cleaners[name](df[name])
+        timings[name] = time.perf_counter() - started
+        return cleaned
+
+    if max_workers == 1 or len(names) < 2:
+        results = [clean(name) for name in names]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(clean, names))
+
+    cleaned_columns = dict(zip(names, results))
+    cleaned = pd.DataFrame(
+        {name: cleaned_columns.get(name, df[name]) for name in df.columns}, index=df.index, copy=False
+    )
+    return cleaned, {name: timings[name] for name in names}
 
 
 def _derive_columns(df: pd.DataFrame) -> pd.DataFrame:
     derived = df.copy()
 
     if "trade_day" not in derived.columns and "trade_date" in derived.columns:
-        derived["trade_day"] = derived["trade_date"].dt.day_name().str.lower()
+        weekdays = derived["trade_date"].dt.weekday.to_numpy(dtype=float, na_value=-1).astype(np.int64)
+        derived["trade_day"] = pd.Categorical.from_codes(weekdays, categories=WEEKDAY_NAMES)
 
     if "rr" not in derived.columns and {"reward_amount", "risk_amount"}.issubset(derived.columns):
         valid_risk = derived["risk_amount"].replace(0, pd.NA)
         derived["rr"] = derived["reward_amount"] / valid_risk
 
     if "rr" in derived.columns and "outcome" not in derived.columns:
-        derived["outcome"] = pd.Series(pd.NA, index=derived.index, dtype="string")
+        derived["outcome"] = pd.Categorical([None] * len(derived), categories=[])
 
     if "outcome" in derived.columns and "rr" in derived.columns:
-        missing_outcomes = derived["outcome"].isna() | (derived["outcome"].astype(str).str.strip() == "")
-        derived.loc[missing_outcomes & (derived["rr"] > 0), "outcome"] = "WIN"
-        derived.loc[missing_outcomes & (derived["rr"] < 0), "outcome"] = "LOSS"
-        derived.loc[missing_outcomes & (derived["rr"] == 0), "outcome"] = "BE"
+        outcome = derived["outcome"]
+        if not isinstance(outcome.dtype, pd.CategoricalDtype):
+            outcome = _normalize_labels(outcome, lambda labels: labels)
+        blank = [label for label in outcome.cat.categories if str(label).strip() == ""]
+        missing_outcomes = outcome.isna() | outcome.isin(blank)
+        outcome = outcome.cat.add_categories([label for label in ("WIN", "LOSS", "BE") if label not in outcome.cat.categories])
+        outcome[missing_outcomes & (derived["rr"] > 0)] = "WIN"
+        outcome[missing_outcomes & (derived["rr"] < 0)] = "LOSS"
+        outcome[missing_outcomes & (derived["rr"] == 0)] = "BE"
+        derived["outcome"] = outcome
 
     if "trade_day" in derived.columns:
-        derived["trade_day"] = derived["trade_day"].astype("string").str.strip().str.lower()
+        derived["trade_day"] = _normalize_labels(derived["trade_day"], lambda labels: labels.str.strip().str.lower())
 
     if "outcome" in derived.columns:
-        derived["outcome"] = derived["outcome"].astype("string").str.strip().str.upper()
+        derived["outcome"] = _normalize_labels(derived["outcome"], lambda labels: labels.str.strip().str.upper())
 
     return derived
 
 
+def _normalize_labels(series: pd.Series, transform) -> pd.Series:
+    """Apply a string transform to each distinct value and rebuild the column as a categorical.
+
+    ``transform`` receives the distinct non-missing values as a string Series,
+    so the cost scales with the column's cardinality rather than its length.
+    Values that become equal after the transform share one category, and
+    categories are kept in order of first appearance.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    labels = transform(pd.Series(np.asarray(uniques, dtype=object), dtype="string"))
+    label_codes, categories = pd.factorize(labels.astype("object"), use_na_sentinel=True)
+    remap = np.append(label_codes, -1)
+    return pd.Series(
+        pd.Categorical.from_codes(remap[codes], categories=pd.Index(categories, dtype="object")),
+        index=series.index,
+        name=series.name,
+    )
+
+
 def _safe_to_datetime(series: pd.Series) -> pd.Series:
     try:
         return convert_to_datetime(series)
@@ -190,6 +303,28 @@ def _safe_to_datetime(series: pd.Series) -> pd.Series:
         return pd.to_datetime(series, errors="coerce")
 
 
+def _normalize_times(series: pd.Series) -> pd.Series:
+    """Normalize a time column to ``HH:MM:SS`` strings, parsing each distinct value once.
+
+    Plain ``H:MM`` and ``HH:MM:SS`` text is converted with vectorized string
+    ops; any other value goes through ``_normalize_time_value``.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    values = pd.Series(np.asarray(uniques, dtype=object), dtype=object)
+    labels = np.full(len(values) + 1, None, dtype=object)
+
+    text = values.map(lambda value: value if isinstance(value, str) else None)
+    parts = text.str.extract(r"^\s*(\d{1,2}):(\d{2})(?::(\d{2}))?\s*$").apply(pd.to_numeric)
+    hours, minutes, seconds = parts[0], parts[1], parts[2].fillna(0)
+    plain = (hours < 24) & (minutes < 60) & (seconds < 60)
+    plain_seconds = (hours * 3600 + minutes * 60 + seconds)[plain].to_numpy(dtype=np.int32)
+    labels[: len(values)][plain.to_numpy()] = seconds_to_time_strings(plain_seconds).to_numpy()
+    for position in np.flatnonzero(~plain.to_numpy()):
+        labels[position] = _normalize_time_value(values.iloc[position])
+
+    return pd.Series(labels[codes], index=series.index, name=series.name)
+
+
 def _normalize_time_value(value) -> str | None:
     if pd.isna(value):
         return None
@@ -223,3 +358,34 @@ def print_detected_mappings(df: pd.DataFrame) -> None:
         source_column = detected_mappings.get(canonical_name)
         if source_column:
             print(f"{source_column} -> {canonical_name}")
+
+
+def print_column_timings(df: pd.DataFrame) -> None:
+    """Print the seconds spent cleaning each column during normalization, slowest first."""
+    timings = df.attrs.get("column_timings")
+
+    print("\n--- Normalization Timings ---")
+    if not timings:
+        print("No normalization timings available.")
+        return
+
+    for name, seconds in sorted(timings.items(), key=lambda item: item[1], reverse=True):
+        print(f"{name:<20} {seconds:>9.3f}s")
+    print(f"{sum(timings.values()):.3f}s over {len(timings)} columns")
+
+
+def print_column_profile(df: pd.DataFrame) -> None:
+    """Print the column profile computed during normalization."""
+    profile = df.attrs.get("column_profile")
+
+    print("\n--- Column Profile ---")
+    if not profile:
+        print("No column profile available.")
+        return
+
+    print(f"{'column':<20} {'dtype':<16} {'non-null':>9} {'distinct':>9}  range")
+    for name, entry in profile["columns"].items():
+        value_range = f"{entry['min']} .. {entry['max']}" if entry["min"] is not None else ""
+        distinct = "-" if entry["distinct"] is None else entry["distinct"]
+        print(f"{name:<20} {entry['dtype']:<16} {entry['non_null']:>9} {distinct:>9}  {value_range}")
+    print(f"{profile['rows']} rows")
@@ -0,0 +1,362 @@
+"""Sequential kernels behind the drawdown, streak and equity-path metrics.
+
+Running peaks, streaks and compounding equity are inherently sequential, and
+the NumPy versions below need several full-size temporary arrays per call.
+When numba is installed, the same loops are compiled and run in one pass with
+no temporaries; otherwise (or with ``TJ_KERNELS=numpy``) the NumPy versions
+are used. The compiled loops only take over from ``JIT_MIN_SIZE`` elements,
+so small journals never pay for compilation.
+
+Both implementations perform the same floating-point operations in the same
+order, so results are bitwise identical. The one exception is the compounding
+equity path, whose ``log1p`` comes from a different math library under numba
+and may differ in the last ulp.
+"""
+
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Below this many elements the NumPy kernels are used even when numba is available.
+JIT_MIN_SIZE = 100_000
+
+JIT_AVAILABLE = numba is not None and os.environ.get("TJ_KERNELS", "auto").lower() != "numpy"
+
+
+def max_drawdown(values: np.ndarray) -> float:
+    """Largest drop of the running sum below its running peak, as a positive number."""
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return 0.0
+    return abs(float(_kernel("max_drawdown", len(values))(values)))
+
+
+def max_relative_drawdown(curve: np.ndarray, offset: float = 0.0) -> float:
+    """Largest ``(peak - value) / (offset + peak)`` along a curve, skipping NaN.
+
+    ``offset`` is 0 for equity balances and 1 for cumulative returns. Returns
+    NaN for an empty curve and a negative zero when there is no drawdown, like
+    ``-(drawdown).min()`` in pandas.
+    """
+    curve = np.ascontiguousarray(curve, dtype=np.float64)
+    kernel = _kernel("max_relative_drawdown", len(curve))
+    return float(kernel(curve, float(offset)))
+
+
+def max_streaks(codes: np.ndarray) -> tuple[int, int]:
+    """Longest loss and win streaks from outcome codes (1 win, -1 loss, 0 resets both)."""
+    codes = np.ascontiguousarray(codes, dtype=np.int8)
+    if len(codes) == 0:
+        return 0, 0
+    max_loss, max_win = _kernel("max_streaks", len(codes))(codes)
+    return int(max_loss), int(max_win)
+
+
+def segment_max_drawdown(rr: np.ndarray, has_rr: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Max drawdown of cumulative R within each contiguous segment.
+
+    ``rr`` has missing values filled with 0; rows without R (``has_rr`` False)
+    never set a peak before the segment's first trade with R.
+    """
+    rr = np.ascontiguousarray(rr, dtype=np.float64)
+    has_rr = np.ascontiguousarray(has_rr, dtype=bool)
+    starts = np.ascontiguousarray(starts, dtype=np.int64)
+    return _kernel("segment_max_drawdown", len(rr))(rr, has_rr, starts)
+
+
+def segment_max_run(flags: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Longest run of True values inside each contiguous segment."""
+    flags = np.ascontiguousarray(flags, dtype=bool)
+    starts = np.ascontiguousarray(starts, dtype=np.int64)
+    return _kernel("segment_max_run", len(flags))(flags, starts)
+
+
+def compounding_paths(rr: np.ndarray, risk: np.ndarray, block: int) -> tuple[np.ndarray, np.ndarray]:
+    """Log growth and max drawdown per policy when risking ``risk`` of current equity per 1R.
+
+    A trade losing the whole balance sends the log growth to -inf. The NumPy
+    version works on ``(policies, block)`` tiles.
+    """
+    rr = np.ascontiguousarray(rr, dtype=np.float64)
+    risk = np.ascontiguousarray(risk, dtype=np.float64)
+    level, worst_gap = _kernel("compounding_paths", len(rr) * len(risk))(rr, risk, block)
+    return level, -np.expm1(-worst_gap)
+
+
+def fixed_paths(rr: np.ndarray, risk: np.ndarray, block: int) -> tuple[np.ndarray, np.ndarray]:
+    """Log growth and max drawdown per policy when risking ``risk`` of starting equity per 1R.
+
+    Equity is relative to the start; reaching zero is ruin and ends the path.
+    """
+    rr = np.ascontiguousarray(rr, dtype=np.float64)
+    risk = np.ascontiguousarray(risk, dtype=np.float64)
+    level, worst = _kernel("fixed_paths", len(rr) * len(risk))(rr, risk, block)
+    with np.errstate(divide="ignore"):
+        return np.log(level), worst
+
+
+def _kernel(name: str, size: int):
+    if JIT_AVAILABLE and size >= JIT_MIN_SIZE:
+        return jit_kernel(name)
+    return NUMPY_KERNELS[name]
+
+
+# --- NumPy implementations -------------------------------------------------
+
+
+def _max_drawdown_numpy(values: np.ndarray) -> float:
+    cumulative = np.cumsum(values)
+    return -float(np.min(cumulative - np.maximum.accumulate(cumulative)))
+
+
+def _max_relative_drawdown_numpy(curve: np.ndarray, offset: float) -> float:
+    # Running peaks skip NaN, so dropping NaN up front leaves the result unchanged.
+    curve = curve[~np.isnan(curve)]
+    if len(curve) == 0:
+        return np.nan
+    peak = np.maximum.accumulate(curve)
+    return -float(np.min((curve - peak) / (offset + peak)))
+
+
+def _max_streaks_numpy(codes: np.ndarray) -> tuple[int, int]:
+    streaks = []
+    for flags in (codes == -1, codes == 1):
+        streaks.append(int(_segment_max_run_numpy(flags, np.zeros(1, dtype=np.int64))[0]))
+    return streaks[0], streaks[1]
+
+
+def _segment_ids(starts: np.ndarray, size: int) -> np.ndarray:
+    return np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, size]))
+
+
+def _segment_max_drawdown_numpy(rr: np.ndarray, has_rr: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    segment_ids = _segment_ids(starts, len(rr))
+    cumulative = np.cumsum(rr)
+    offsets = np.r_[0.0, cumulative[starts[1:] - 1]]
+    local = cumulative - offsets[segment_ids]
+    seen = np.cumsum(has_rr)
+    seen_offsets = np.r_[0, seen[starts[1:] - 1]]
+    local_for_peak = np.where(seen - seen_offsets[segment_ids] > 0, local, -np.inf)
+    peaks = pd.Series(local_for_peak).groupby(segment_ids, sort=False).cummax().to_numpy()
+    drawdown = np.where(np.isfinite(peaks), local - peaks, 0.0)
+    return -np.minimum.reduceat(drawdown, starts)
+
+
+def _segment_max_run_numpy(flags: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    result = np.zeros(len(starts), dtype=np.int64)
+    if not flags.any():
+        return result
+    segment_ids = _segment_ids(starts, len(flags))
+    boundaries = np.r_[True, (flags[1:] != flags[:-1]) | (segment_ids[1:] != segment_ids[:-1])]
+    run_starts = np.flatnonzero(boundaries)
+    run_lengths = np.diff(np.r_[run_starts, len(flags)])
+    true_runs = flags[run_starts]
+    np.maximum.at(result, segment_ids[run_starts[true_runs]], run_lengths[true_runs])
+    return result
+
+
+def _compounding_paths_numpy(rr: np.ndarray, risk: np.ndarray, block: int) -> tuple[np.ndarray, np.ndarray]:
+    level = np.zeros(len(risk))
+    peak = np.zeros(len(risk))
+    worst_gap = np.zeros(len(risk))
+    for start in range(0, len(rr), block):
+        chunk = rr[start : start + block]
+        path = np.multiply(risk[:, None], chunk[None, :])
+        np.maximum(path, -1.0, out=path)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.log1p(path, out=path)
+            # Carry the level into the first column so the sums accumulate in trade order.
+            path[:, 0] += level
+            np.cumsum(path, axis=1, out=path)
+            peaks = np.maximum.accumulate(path, axis=1)
+            np.maximum(peaks, peak[:, None], out=peaks)
+            peak = peaks[:, -1].copy()
+            np.subtract(peaks, path, out=peaks)
+        worst_gap = np.maximum(worst_gap, peaks.max(axis=1))
+        level = path[:, -1].copy()
+    return level, worst_gap
+
+
+def _fixed_paths_numpy(rr: np.ndarray, risk: np.ndarray, block: int) -> tuple[np.ndarray, np.ndarray]:
+    cumulative_rr = 0.0
+    peak = np.ones(len(risk))
+    ruined = np.zeros(len(risk), dtype=bool)
+    worst = np.zeros(len(risk))
+    level = np.ones(len(risk))
+    for start in range(0, len(rr), block):
+        cumulative = rr[start : start + block].copy()
+        cumulative[0] += cumulative_rr
+        np.cumsum(cumulative, out=cumulative)
+        cumulative_rr = cumulative[-1]
+        path = 1.0 + risk[:, None] * cumulative[None, :]
+        broke = np.logical_or.accumulate(path <= 0, axis=1) | ruined[:, None]
+        path[broke] = 0.0
+        peaks = np.maximum.accumulate(path, axis=1)
+        np.maximum(peaks, peak[:, None], out=peaks)
+        peak = peaks[:, -1].copy()
+        np.divide(path, peaks, out=path)
+        worst = np.maximum(worst, 1.0 - path.min(axis=1))
+        ruined = broke[:, -1]
+        level = np.where(ruined, 0.0, 1.0 + risk * cumulative_rr)
+    return level, worst
+
+
+NUMPY_KERNELS = {
+    "max_drawdown": _max_drawdown_numpy,
+    "max_relative_drawdown": _max_relative_drawdown_numpy,
+    "max_streaks": _max_streaks_numpy,
+    "segment_max_drawdown": _segment_max_drawdown_numpy,
+    "segment_max_run": _segment_max_run_numpy,
+    "compounding_paths": _compounding_paths_numpy,
+    "fixed_paths": _fixed_paths_numpy,
+}
+
+
+# --- Loop implementations, compiled with numba -----------------------------
+
+
+def _max_drawdown_loop(values):
+    cumulative = 0.0
+    peak = -np.inf
+    lowest = 0.0
+    for value in values:
+        cumulative += value
+        if cumulative > peak:
+            peak = cumulative
+        if cumulative - peak < lowest:
+            lowest = cumulative - peak
+    return -lowest
+
+
+def _max_relative_drawdown_loop(curve, offset):
+    peak = np.nan
+    lowest = np.inf
+    for value in curve:
+        if np.isnan(value):
+            continue
+        if np.isnan(peak) or value > peak:
+            peak = value
+        drawdown = (value - peak) / (offset + peak)
+        if drawdown < lowest:
+            lowest = drawdown
+    return -lowest if lowest != np.inf else np.nan
+
+
+def _max_streaks_loop(codes):
+    max_loss = max_win = loss = win = 0
+    for code in codes:
+        if code == -1:
+            loss += 1
+            win = 0
+            if loss > max_loss:
+                max_loss = loss
+        elif code == 1:
+            win += 1
+            loss = 0
+            if win > max_win:
+                max_win = win
+        else:
+            loss = win = 0
+    return max_loss, max_win
+
+
+def _segment_max_drawdown_loop(rr, has_rr, starts):
+    result = np.zeros(len(starts))
+    cumulative = 0.0
+    for segment in range(len(starts)):
+        end = starts[segment + 1] if segment + 1 < len(starts) else len(rr)
+        offset = cumulative
+        peak = -np.inf
+        lowest = 0.0
+        for position in range(starts[segment], end):
+            cumulative += rr[position]
+            local = cumulative - offset
+            if has_rr[position] or peak > -np.inf:
+                if local > peak:
+                    peak = local
+                if local - peak < lowest:
+                    lowest = local - peak
+        result[segment] = -lowest
+    return result
+
+
+def _segment_max_run_loop(flags, starts):
+    result = np.zeros(len(starts), dtype=np.int64)
+    for segment in range(len(starts)):
+        end = starts[segment + 1] if segment + 1 < len(starts) else len(flags)
+        run = 0
+        for position in range(starts[segment], end):
+            run = run + 1 if flags[position] else 0
+            if run > result[segment]:
+                result[segment] = run
+    return result
+
+
+def _compounding_paths_loop(rr, risk, block):
+    level = np.zeros(len(risk))
+    worst_gap = np.zeros(len(risk))
+    for policy in range(len(risk)):
+        current = 0.0
+        peak = 0.0
+        gap = 0.0
+        for value in rr:
+            step = max(risk[policy] * value, -1.0)
+            current += math.log1p(step) if step > -1.0 else -np.inf
+            if current > peak:
+                peak = current
+            if peak - current > gap:
+                gap = peak - current
+        level[policy] = current
+        worst_gap[policy] = gap
+    return level, worst_gap
+
+
+def _fixed_paths_loop(rr, risk, block):
+    level = np.ones(len(risk))
+    worst = np.zeros(len(risk))
+    for policy in range(len(risk)):
+        cumulative = 0.0
+        peak = 1.0
+        current = 1.0
+        for value in rr:
+            cumulative += value
+            current = 1.0 + risk[policy] * cumulative
+            if current <= 0.0:
+                current = 0.0
+                worst[policy] = 1.0
+                break
+            if current > peak:
+                peak = current
+            if 1.0 - current / peak > worst[policy]:
+                worst[policy] = 1.0 - current / peak
+        level[policy] = current
+    return level, worst
+
+
+LOOP_KERNELS = {
+    "max_drawdown": _max_drawdown_loop,
+    "max_relative_drawdown": _max_relative_drawdown_loop,
+    "max_streaks": _max_streaks_loop,
+    "segment_max_drawdown": _segment_max_drawdown_loop,
+    "segment_max_run": _segment_max_run_loop,
+    "compounding_paths": _compounding_paths_loop,
+    "fixed_paths": _fixed_paths_loop,
+}
+
+_compiled: dict = {}
+
+
+def jit_kernel(name: str):
+    """The numba-compiled loop for ``name`` (compiled on first use and cached on disk)."""
+    if numba is None:
+        raise ImportError("JIT kernels require numba. Install it with: pip install numba")
+    if name not in _compiled:
+        _compiled[name] = numba.njit(cache=True, nogil=True)(LOOP_KERNELS[name])
+    return _compiled[name]
@@ -1,15 +1,142 @@
-"""Modern plot styling utilities for consistent visualization aesthetics."""
+"""Modern plot styling utilities for consistent visualization aesthetics.
 
-import matplotlib.pyplot as plt
+Figures are built without pyplot: each one is a standalone ``Figure`` with its
+own Agg canvas, so figures can be built, drawn and saved from several threads
+at once. The report style is never installed into matplotlib's process-wide
+rcParams; ``apply_style`` copies the style's colors onto each finished figure.
+"""
+
+import io
+from functools import wraps
+
+import matplotlib
+import matplotlib.style
+from matplotlib.artist import Artist
 from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import Collection
+from matplotlib.colors import to_rgba
 from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+from matplotlib.text import Text
 
 from config import COLORS, PLOT_STYLE
 
 
-def apply_dark_style() -> None:
-    """Apply the dark background style globally."""
-    plt.style.use(PLOT_STYLE)
+def _style_rc(style: str | dict) -> dict:
+    """Return a copy of a style's rc settings: a matplotlib style name or an rc dict."""
+    return dict(matplotlib.style.library[style] if isinstance(style, str) else style)
+
+
+def _rgb(color) -> tuple | None:
+    try:
+        return to_rgba(color)[:3]
+    except ValueError:
+        return None
+
+
+def _same_color(color, value) -> bool:
+    rgb = _rgb(color)
+    return rgb is not None and rgb == _rgb(value)
+
+
+def _cycle_colors(rc) -> list:
+    cycle = rc.get("axes.prop_cycle")
+    return cycle.by_key().get("color", []) if cycle is not None else []
+
+
+def cycle_color(index: int = 0, style: str | dict = PLOT_STYLE) -> str:
+    """Return the ``index``-th color of a style's color cycle."""
+    colors = _cycle_colors(_style_rc(style)) or _cycle_colors(matplotlib.rcParams)
+    return colors[index % len(colors)]
+
+
+def apply_style(fig: Figure, style: str | dict = PLOT_STYLE) -> Figure:
+    """Give a built figure the colors of ``style`` without touching the global rcParams.
+
+    The figure's artists were created from the unchanged rcParams, so every
+    color still at its rc default is swapped for the style's value; colors the
+    plot code set explicitly are kept. Default color-cycle colors are mapped
+    onto the style's cycle by position. Alpha is kept as it was.
+    """
+    rc = _style_rc(style)
+    current = matplotlib.rcParams
+    cycle = dict(zip(map(_rgb, _cycle_colors(current)), _cycle_colors(rc)))
+
+    def swap(color, key: str):
+        return rc[key] if key in rc and _same_color(color, current[key]) else None
+
+    def recycle(color):
+        new = cycle.get(_rgb(color))
+        return (*to_rgba(new)[:3], to_rgba(color)[3]) if new is not None else None
+
+    def restyle(artist: Artist, getter: str, setter: str, key: str | None = None) -> None:
+        color = getattr(artist, getter)()
+        new = swap(color, key) if key else None
+        if new is None:
+            new = recycle(color)
+        if new is not None:
+            getattr(artist, setter)((*to_rgba(new)[:3], to_rgba(color)[3]))
+
+    restyle(fig.patch, "get_facecolor", "set_facecolor", "figure.facecolor")
+    restyle(fig.patch, "get_edgecolor", "set_edgecolor", "figure.edgecolor")
+    frames = {fig.patch}
+    for ax in fig.axes:
+        frames.add(ax.patch)
+        restyle(ax.patch, "get_facecolor", "set_facecolor", "axes.facecolor")
+        for spine in ax.spines.values():
+            frames.add(spine)
+            restyle(spine, "get_edgecolor", "set_edgecolor", "axes.edgecolor")
+        for axis, prefix in ((ax.xaxis, "xtick"), (ax.yaxis, "ytick")):
+            tick = axis.majorTicks[0]
+            params = {}
+            if _same_color(tick.tick1line.get_color(), current[f"{prefix}.color"]) and f"{prefix}.color" in rc:
+                params["color"] = rc[f"{prefix}.color"]
+            labelcolor = current[f"{prefix}.labelcolor"]
+            if labelcolor == "inherit":
+                labelcolor = current[f"{prefix}.color"]
+            if _same_color(tick.label1.get_color(), labelcolor) and f"{prefix}.color" in rc:
+                params["labelcolor"] = rc[f"{prefix}.color"]
+            if _same_color(tick.gridline.get_color(), current["grid.color"]) and "grid.color" in rc:
+                params["grid_color"] = rc["grid.color"]
+            axis.set_tick_params(which="both", **params)
+            restyle(axis.label, "get_color", "set_color", "axes.labelcolor")
+        legend = ax.get_legend()
+        if legend is not None:
+            frames.add(legend.get_frame())
+            restyle(legend.get_frame(), "get_facecolor", "set_facecolor", "axes.facecolor")
+
+    for artist in fig.findobj():
+        if isinstance(artist, Text):
+            restyle(artist, "get_color", "set_color", "text.color")
+        elif isinstance(artist, Line2D):
+            restyle(artist, "get_color", "set_color", "lines.color")
+        elif isinstance(artist, Patch) and artist not in frames:
+            restyle(artist, "get_facecolor", "set_facecolor")
+        elif isinstance(artist, Collection):
+            colors = [recycle(color) for color in artist.get_facecolor()]
+            if any(color is not None for color in colors):
+                artist.set_facecolor([new or old for new, old in zip(colors, artist.get_facecolor())])
+    return fig
+
+
+def styled_plot(func):
+    """Apply the report style to the figure a plot function returns."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        fig = func(*args, **kwargs)
+        return apply_style(fig) if fig is not None else None
+
+    return wrapper
+
+
+def figure_bytes(fig: Figure, image_format: str = "png", **savefig_kwargs) -> bytes:
+    """Rasterize or serialize a figure on its own canvas and return the file bytes."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=image_format, **savefig_kwargs)
+    return buffer.getvalue()
 
 
 def style_axes(
@@ -57,18 +184,20 @@ def style_axes(
     ax.spines["bottom"].set_color(COLORS["text"])
 
 
-def create_figure(figsize: tuple[int, int] = (8, 6)) -> tuple[Figure, Axes]:
+def create_figure(figsize: tuple[int, int] = (8, 6), nrows: int = 1) -> tuple[Figure, Axes]:
     """
     Create a styled figure and axes with dark theme.
     
     Args:
         figsize: Figure size as (width, height)
+        nrows: Number of vertically stacked axes
         
     Returns:
-        Tuple of (figure, axes)
+        Tuple of (figure, axes); axes is an array of ``nrows`` axes when nrows > 1
     """
-    apply_dark_style()
-    fig, ax = plt.subplots(figsize=figsize)
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.subplots(nrows, 1) if nrows > 1 else fig.add_subplot()
     return fig, ax
 
 
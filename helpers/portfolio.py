@@ -0,0 +1,247 @@
+"""Multi-account portfolio aggregation built from mergeable per-account summaries."""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from helpers.calculations import stats_table_overall
+from helpers.kernels import max_drawdown, max_streaks
+from helpers.utils import has_non_empty, series_or_none, trade_dates
+
+# Columns the per-account stats, summaries, and timelines read.
+PORTFOLIO_COLUMNS = ["rr", "position_size", "outcome", "asset", "trade_date", "entry_time_seconds"]
+
+OUTCOME_CODES = {"WIN": 1, "LOSS": -1, "BE": 0}
+MISSING_OUTCOME = 2
+
+SUM_FIELDS = (
+    "trades",
+    "wins",
+    "losses",
+    "breakevens",
+    "rr_count",
+    "rr_sum",
+    "gross_profit",
+    "gross_loss",
+    "win_rr_count",
+    "loss_rr_count",
+    "position_size_count",
+    "position_size_sum",
+)
+
+
+def account_summary(df: pd.DataFrame) -> dict:
+    """Reduce one normalized journal to sufficient statistics that merge by addition."""
+    rr_series = series_or_none(df, "rr")
+    position_size = series_or_none(df, "position_size")
+    outcomes = df["outcome"].astype(str).str.strip() if "outcome" in df.columns else None
+
+    summary = dict.fromkeys(SUM_FIELDS, 0)
+    summary.update(
+        trades=len(df),
+        best_trade=None,
+        has_rr=rr_series is not None,
+        has_outcome=outcomes is not None,
+        has_position_size=position_size is not None,
+        assets=set(),
+    )
+
+    if rr_series is not None:
+        rr = rr_series.to_numpy(dtype=float)
+        rr = rr[~np.isnan(rr)]
+        positive = rr[rr > 0]
+        negative = rr[rr < 0]
+        summary.update(
+            rr_count=len(rr),
+            rr_sum=float(rr.sum()),
+            gross_profit=float(positive.sum()),
+            gross_loss=float(-negative.sum()),
+            win_rr_count=len(positive),
+            loss_rr_count=len(negative),
+            best_trade=float(rr.max()) if len(rr) else None,
+        )
+
+    if outcomes is not None:
+        summary.update(
+            wins=int((outcomes == "WIN").sum()),
+            losses=int((outcomes == "LOSS").sum()),
+            breakevens=int((outcomes == "BE").sum()),
+        )
+
+    if position_size is not None:
+        sizes = position_size.dropna()
+        summary.update(position_size_count=len(sizes), position_size_sum=float(sizes.sum()))
+
+    if has_non_empty(df, "asset"):
+        summary["assets"] = set(df["asset"].dropna().astype(str))
+
+    return summary
+
+
+def merge_summaries(summaries: list[dict]) -> dict:
+    """Combine per-account sufficient statistics into portfolio totals."""
+    merged = dict.fromkeys(SUM_FIELDS, 0)
+    merged.update(best_trade=None, has_rr=False, has_outcome=False, has_position_size=False, assets=set())
+    for summary in summaries:
+        for field in SUM_FIELDS:
+            merged[field] += summary[field]
+        if summary["best_trade"] is not None:
+            merged["best_trade"] = (
+                summary["best_trade"] if merged["best_trade"] is None else max(merged["best_trade"], summary["best_trade"])
+            )
+        for flag in ("has_rr", "has_outcome", "has_position_size"):
+            merged[flag] = merged[flag] or summary[flag]
+        merged["assets"] |= summary["assets"]
+    return merged
+
+
+def account_timeline(df: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Return one account's trades as time-sorted key, R, and outcome-code arrays."""
+    keys = np.arange(len(df), dtype=np.int64)
+    if has_non_empty(df, "trade_date"):
+        dates = trade_dates(df["trade_date"])
+        nanoseconds = dates.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        if "entry_time_seconds" in df.columns:
+            seconds = df["entry_time_seconds"].to_numpy(dtype=np.int64)
+            nanoseconds = nanoseconds + np.maximum(seconds, 0) * 1_000_000_000
+        elif "entry_time" in df.columns:
+            entry = pd.to_timedelta(df["entry_time"].astype("string"), errors="coerce")
+            nanoseconds = nanoseconds + entry.fillna(pd.Timedelta(0)).to_numpy(dtype="timedelta64[ns]").astype(np.int64)
+        # Undated trades sort after dated ones while keeping their journal order.
+        keys = np.where(dates.notna().to_numpy(), nanoseconds, np.iinfo(np.int64).max)
+
+    rr_series = series_or_none(df, "rr")
+    rr = rr_series.to_numpy(dtype=float) if rr_series is not None else np.full(len(df), np.nan)
+    if "outcome" in df.columns:
+        outcome_codes = (
+            df["outcome"].astype(str).str.strip().map(OUTCOME_CODES).fillna(MISSING_OUTCOME).to_numpy(dtype=np.int8)
+        )
+    else:
+        outcome_codes = np.full(len(df), MISSING_OUTCOME, dtype=np.int8)
+
+    order = np.argsort(keys, kind="stable")
+    return {"keys": keys[order], "rr": rr[order], "outcome": outcome_codes[order]}
+
+
+def merge_timelines(timelines: list[dict[str, np.ndarray]]) -> dict[str, np.ndarray]:
+    """K-way merge of per-account time-sorted timelines into one portfolio timeline.
+
+    Each input is already sorted, so the stable sort below only has to merge
+    ``k`` presorted runs (O(n log k)); ties keep account order.
+    """
+    if not timelines:
+        return {"keys": np.array([], dtype=np.int64), "rr": np.array([]), "outcome": np.array([], dtype=np.int8)}
+    keys = np.concatenate([timeline["keys"] for timeline in timelines])
+    order = np.argsort(keys, kind="stable")
+    return {
+        "keys": keys[order],
+        "rr": np.concatenate([timeline["rr"] for timeline in timelines])[order],
+        "outcome": np.concatenate([timeline["outcome"] for timeline in timelines])[order],
+    }
+
+
+def summarize_account(df: pd.DataFrame) -> tuple[dict, dict, dict]:
+    """Compute one account's stats table, sufficient statistics, and timeline."""
+    return stats_table_overall(df), account_summary(df), account_timeline(df)
+
+
+def summarize_accounts(journals: dict[str, pd.DataFrame], max_workers: int | None = None) -> dict[str, tuple]:
+    """Summarize every account, in parallel worker processes when more than one."""
+    names = list(journals)
+    if max_workers == 1 or len(names) < 2:
+        return {name: summarize_account(journals[name]) for name in names}
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(summarize_account, [journals[name] for name in names])
+        return dict(zip(names, results))
+
+
+def portfolio_stats(summary: dict, timeline: dict[str, np.ndarray]) -> dict:
+    """Format merged statistics with the same keys as ``stats_table_overall``."""
+    stats: dict[str, str | int] = {"Total Trades": summary["trades"]}
+    rr = timeline["rr"][~np.isnan(timeline["rr"])]
+
+    if summary["has_rr"] and summary["rr_count"]:
+        profit_factor_value = (
+            summary["gross_profit"] / summary["gross_loss"] if summary["gross_loss"] else float("inf")
+        )
+        stats["Total R/R"] = f"{summary['rr_sum']:.2f}"
+        stats["Profit Factor"] = f"{profit_factor_value:.2f}"
+        stats["Max Drawdown"] = f"{max_drawdown(rr):.2f}R"
+        stats["Best Trade"] = f"{summary['best_trade']:.2f}R"
+
+    if summary["has_outcome"] and summary["trades"]:
+        decided = summary["wins"] + summary["losses"]
+        stats["WinRate"] = f"{(summary['wins'] / decided if decided else 0.0) * 100:.2f}%"
+        stats["Winning Trades"] = summary["wins"]
+        stats["Losing Trades"] = summary["losses"]
+        stats["Breakeven Trades"] = summary["breakevens"]
+        # Breakeven and missing outcomes are neither -1 nor 1, so they reset both streaks.
+        cons_losses, cons_wins = max_streaks(timeline["outcome"])
+        stats["Consecutive Losses"] = cons_losses
+        stats["Consecutive Wins"] = cons_wins
+
+    if summary["has_position_size"] and summary["rr_count"]:
+        avg_size = summary["position_size_sum"] / summary["position_size_count"] if summary["position_size_count"] else 0
+        stats["Avg R/R"] = f"{summary['rr_sum'] / summary['rr_count']:.2f}"
+        stats["Avg Position Size"] = f"{round(avg_size, 0):.0f}"
+
+    if summary["has_outcome"] and summary["rr_count"]:
+        stats["Expectancy"] = f"{_expectancy(summary):.2f}"
+
+    if summary["assets"]:
+        stats["Assets Traded"] = len(summary["assets"])
+
+    return stats
+
+
+def account_names(paths: list[str]) -> list[str]:
+    """Name accounts after their journal files, unique even when file names repeat.
+
+    Each account is named by its file stem. Where stems collide, parent
+    directories are prepended until the names differ, so ``a/journal.csv``
+    and ``b/journal.csv`` become ``a/journal`` and ``b/journal``.
+    """
+    resolved = [Path(path).resolve() for path in paths]
+    repeated = sorted({str(path) for path in resolved if resolved.count(path) > 1})
+    if repeated:
+        raise ValueError(f"Account journal given more than once: {', '.join(repeated)}")
+
+    parts = [(*path.parent.parts, path.stem) for path in resolved]
+    depth = [1] * len(parts)
+    while True:
+        names = ["/".join(part[-level:]) for part, level in zip(parts, depth)]
+        clashing = [index for index, name in enumerate(names) if names.count(name) > 1]
+        if not clashing:
+            return names
+        for index in clashing:
+            depth[index] += 1
+
+
+def build_portfolio(journals: dict[str, pd.DataFrame], max_workers: int | None = None) -> dict:
+    """Compute per-account stats and merged portfolio metrics for many journals.
+
+    Returns:
+        dict: ``accounts`` (account name -> stats table), ``stats`` (portfolio
+        stats table), and ``rr`` (portfolio R series in merged time order).
+    """
+    results = summarize_accounts(journals, max_workers=max_workers)
+    summary = merge_summaries([result[1] for result in results.values()])
+    timeline = merge_timelines([result[2] for result in results.values()])
+    return {
+        "accounts": {name: result[0] for name, result in results.items()},
+        "stats": portfolio_stats(summary, timeline),
+        "rr": pd.Series(timeline["rr"], name="rr").dropna().reset_index(drop=True),
+    }
+
+
+def _expectancy(summary: dict) -> float:
+    """Expectancy from merged counts, matching ``expectancy_from_rr``."""
+    decided = summary["wins"] + summary["losses"]
+    if decided == 0:
+        return 0.0
+    avg_win = summary["gross_profit"] / summary["win_rr_count"] if summary["win_rr_count"] else 0
+    avg_loss = summary["gross_loss"] / summary["loss_rr_count"] if summary["loss_rr_count"] else 0
+    return round((summary["wins"] / decided) * avg_win - (summary["losses"] / decided) * avg_loss, 2)
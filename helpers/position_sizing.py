@@ -0,0 +1,221 @@
+"""Position-sizing what-if analysis over the R history.
+
+Every sizing policy reduces to a risk fraction per trade and a compounding
+flag, so a whole parameter grid is simulated as one policies × trades array.
+Compounding policies run in log-equity space, which cannot overflow over long
+histories. The array is processed in tiles whose running equity, peak and
+worst drawdown carry over from one tile to the next, so memory is bounded by
+``chunk_bytes`` whatever the number of policies or trades. With numba
+installed, ``helpers.kernels`` walks each policy's path in one compiled loop
+instead.
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import SIZING_DEFAULTS
+from helpers.kernels import compounding_paths, fixed_paths
+from helpers.utils import trade_dates
+
+SIZING_POLICIES = ("fixed_fractional", "fixed_r", "kelly")
+
+SIZING_COLUMNS = [
+    "Policy",
+    "Parameter",
+    "Risk/Trade",
+    "Final Equity",
+    "Total Return",
+    "Max Drawdown",
+    "Growth/Trade",
+    "CAGR",
+    "Ruined",
+]
+
+# Trades per tile; the number of policies per tile follows from chunk_bytes.
+TRADE_BLOCK = 65_536
+
+
+def kelly_fraction(rr: np.ndarray) -> float:
+    """Full Kelly stake (fraction of equity risked per 1R) from the R history.
+
+    Uses the win rate and payoff ratio over winning and losing trades; the
+    result is clipped to [0, 1].
+    """
+    rr = rr[~np.isnan(rr)]
+    wins, losses = rr[rr > 0], rr[rr < 0]
+    if len(wins) == 0:
+        return 0.0
+    if len(losses) == 0:
+        return 1.0
+    win_rate = len(wins) / (len(wins) + len(losses))
+    payoff = wins.mean() / -losses.mean()
+    return float(np.clip(win_rate - (1 - win_rate) / payoff, 0.0, 1.0))
+
+
+def parse_sizing_spec(spec: str) -> dict[str, list[float]]:
+    """Parse ``policy=v1,v2;policy=...`` (e.g. ``fixed_fractional=0.5,1;kelly=0.5``) into a grid."""
+    grid: dict[str, list[float]] = {}
+    for part in spec.split(";"):
+        if not part.strip():
+            continue
+        name, _, values = part.partition("=")
+        name = name.strip().lower()
+        if name not in SIZING_POLICIES:
+            raise ValueError(f"Unknown sizing policy: {name} (expected one of {', '.join(SIZING_POLICIES)})")
+        try:
+            grid[name] = [float(value) for value in values.split(",") if value.strip()]
+        except ValueError as exc:
+            raise ValueError(f"Invalid values for sizing policy {name}: {values}") from exc
+        if not grid[name]:
+            raise ValueError(f"No values given for sizing policy {name}")
+    return grid
+
+
+def policy_table(rr: np.ndarray, grid: dict[str, list[float]] | None = None) -> pd.DataFrame:
+    """Expand a policy grid into one row per policy.
+
+    ``fixed_fractional`` values are the percent of current equity risked per
+    trade, ``fixed_r`` values the percent of starting equity risked per trade
+    (no compounding), and ``kelly`` values fractions of the full Kelly stake.
+
+    Returns:
+        pd.DataFrame: ``policy``, ``parameter``, ``risk`` (fraction risked per
+        1R) and ``compounding`` per policy, indexed by a readable label.
+    """
+    grid = SIZING_DEFAULTS["policies"] if grid is None else grid
+    unknown = [name for name in grid if name not in SIZING_POLICIES]
+    if unknown:
+        raise ValueError(f"Unknown sizing policy: {', '.join(unknown)}")
+
+    kelly = kelly_fraction(rr) if "kelly" in grid else 0.0
+    rows = []
+    for value in grid.get("fixed_fractional", []):
+        rows.append((f"Fixed {value:g}% of equity", "fixed_fractional", value, value / 100, True))
+    for value in grid.get("fixed_r", []):
+        rows.append((f"Fixed R {value:g}% of start", "fixed_r", value, value / 100, False))
+    for value in grid.get("kelly", []):
+        rows.append((f"{value:g}× Kelly", "kelly", value, value * kelly, True))
+    labels, policies, parameters, risks, compounding = zip(*rows) if rows else ((),) * 5
+    return pd.DataFrame(
+        {
+            "policy": list(policies),
+            "parameter": np.array(parameters, dtype=float),
+            "risk": np.array(risks, dtype=float),
+            "compounding": np.array(compounding, dtype=bool),
+        },
+        index=pd.Index(list(labels), name="label"),
+    )
+
+
+def simulate_policies(
+    rr: np.ndarray,
+    risk: np.ndarray,
+    compounding: np.ndarray,
+    chunk_bytes: int = SIZING_DEFAULTS["chunk_bytes"],
+) -> dict[str, np.ndarray]:
+    """Simulate every policy over the same trade sequence, tile by tile.
+
+    Args:
+        rr: R per trade, in order; NaN entries are skipped.
+        risk: Fraction of equity (or of starting equity, when not compounding)
+            risked per 1R, one per policy.
+        compounding: Whether each policy sizes off current equity.
+        chunk_bytes: Approximate memory budget for one tile.
+
+    Returns:
+        dict: Per-policy arrays ``log_growth`` (log of final / starting
+        equity, -inf when ruined), ``max_drawdown`` (fraction below the
+        running peak, starting equity included) and ``ruined``.
+    """
+    rr = np.asarray(rr, dtype=float)
+    rr = rr[~np.isnan(rr)]
+    risk = np.asarray(risk, dtype=float)
+    compounding = np.asarray(compounding, dtype=bool)
+    policies = len(risk)
+    log_growth = np.zeros(policies)
+    max_drawdown = np.zeros(policies)
+    if len(rr) == 0 or policies == 0:
+        return {"log_growth": log_growth, "max_drawdown": max_drawdown, "ruined": np.zeros(policies, dtype=bool)}
+
+    block = min(len(rr), TRADE_BLOCK)
+    # Two float64 (rows, block) buffers are alive per tile.
+    rows = max(1, chunk_bytes // (16 * block))
+    for compound in (True, False):
+        selected = np.flatnonzero(compounding == compound)
+        for start in range(0, len(selected), rows):
+            subset = selected[start : start + rows]
+            simulate = compounding_paths if compound else fixed_paths
+            log_growth[subset], max_drawdown[subset] = simulate(rr, risk[subset], block)
+    return {"log_growth": log_growth, "max_drawdown": max_drawdown, "ruined": np.isneginf(log_growth)}
+
+
+def evaluate_sizing(
+    rr_series: pd.Series,
+    dates: pd.Series | None = None,
+    grid: dict[str, list[float]] | None = None,
+    initial_equity: float = SIZING_DEFAULTS["initial_equity"],
+    chunk_bytes: int = SIZING_DEFAULTS["chunk_bytes"],
+) -> pd.DataFrame:
+    """Evaluate a grid of sizing policies over a journal's R history.
+
+    Args:
+        rr_series: R per trade in journal order.
+        dates: Trade dates aligned with ``rr_series``; the first-to-last span
+            annualizes growth into ``CAGR``.
+        grid: Policy name -> parameter values (see ``policy_table``).
+        initial_equity: Starting balance for every policy.
+        chunk_bytes: Approximate memory budget for one simulation tile.
+
+    Returns:
+        pd.DataFrame: ``SIZING_COLUMNS`` per policy, indexed by policy label.
+        Returns and drawdowns are fractions; ``CAGR`` is NaN without a date span.
+    """
+    rr = rr_series.to_numpy(dtype=float)
+    policies = policy_table(rr, grid)
+    simulated = simulate_policies(rr, policies["risk"].to_numpy(), policies["compounding"].to_numpy(), chunk_bytes)
+    log_growth = simulated["log_growth"]
+    trades = int((~np.isnan(rr)).sum())
+
+    years = np.nan
+    if dates is not None:
+        valid = trade_dates(dates)[rr_series.notna()].dropna()
+        if len(valid):
+            years = (valid.max() - valid.min()).days / 365.25
+
+    with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+        multiple = np.exp(log_growth)
+        growth_per_trade = np.expm1(log_growth / trades) if trades else np.zeros(len(policies))
+        cagr = np.expm1(log_growth / years) if years > 0 else np.full(len(policies), np.nan)
+
+    return pd.DataFrame(
+        {
+            "Policy": policies["policy"].to_numpy(),
+            "Parameter": policies["parameter"].to_numpy(),
+            "Risk/Trade": policies["risk"].to_numpy(),
+            "Final Equity": initial_equity * multiple,
+            "Total Return": multiple - 1,
+            "Max Drawdown": simulated["max_drawdown"],
+            "Growth/Trade": growth_per_trade,
+            "CAGR": cagr,
+            "Ruined": simulated["ruined"],
+        },
+        index=policies.index,
+    )
+
+
+def format_sizing(results: pd.DataFrame) -> pd.DataFrame:
+    """Format what-if results for the summary table."""
+    formatted = results.copy().astype(object)
+    for column in ("Risk/Trade", "Total Return", "Max Drawdown", "Growth/Trade", "CAGR"):
+        formatted[column] = [_percent(value) for value in results[column]]
+    formatted["Final Equity"] = [f"{value:,.0f}" if np.isfinite(value) else "-" for value in results["Final Equity"]]
+    formatted["Ruined"] = ["yes" if value else "" for value in results["Ruined"]]
+    return formatted
+
+
+def _percent(value: float) -> str:
+    if np.isnan(value):
+        return "-"
+    if np.isinf(value):
+        return "inf"
+    return f"{value * 100:,.2f}%"
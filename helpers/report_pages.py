@@ -0,0 +1,132 @@
+"""Report page lists: which plots each report type draws, and from what data."""
+
+import pandas as pd
+
+from config import DEFAULT_BREAKDOWNS
+from helpers.report_planner import ReportPlanner, Ref, plan_columns
+from helpers.visualizations import (
+    asset_performance_bar,
+    bar_outcomes_by_custom_ranges,
+    concurrent_exposure,
+    create_breakdown_table,
+    create_comparison_table,
+    create_sizing_table,
+    create_stats_table,
+    distribution_plot,
+    drawdown_curve,
+    excursion_scatter,
+    heatmap_rr,
+    holding_time_profile,
+    outcome_by_day,
+    risk_vs_reward_scatter,
+    rr_barplot,
+    rr_barplot_months,
+    rr_curve,
+    rr_vs_hour_range_bubble_scatter,
+    rr_vs_sl_points,
+    sizing_frontier,
+)
+
+
+def add_plot(plots: list[tuple], enabled: bool, func, *args) -> None:
+    """Append a plot only when its data requirements are satisfied."""
+    if enabled:
+        plots.append((func, args))
+
+
+def weekly_page_steps() -> list[tuple]:
+    """Declared steps of the weekly report."""
+    return [
+        (create_stats_table, (Ref("stats_weekly"),)),
+        (rr_barplot, (Ref("rr"), Ref("trade_weekday"), None, "Weekly R by Day", "", "Total R")),
+    ]
+
+
+def overall_page_steps(breakdowns: list[list[str]] | None = None, sizing: bool = False) -> list[tuple]:
+    """Declared steps of the overall report.
+
+    Pages declare the intermediates they need. With ``sizing``,
+    position-sizing what-if pages are added.
+    """
+    time_ranges = [
+        ("09:30–10:00", "09:30", "10:00"),
+        ("10:00–11:00", "10:00", "11:00"),
+    ]
+
+    steps: list[tuple] = [
+        (create_stats_table, (Ref("stats_overall"),)),
+        (rr_curve, (Ref("rr_trades"),), {"cumulative_rr": Ref("cumulative_rr")}),
+        (drawdown_curve, (Ref("rr_trades"),), {"drawdown": Ref("drawdown")}),
+        (asset_performance_bar, (Ref("asset"), Ref("rr"))),
+        (outcome_by_day, (Ref("outcome"), None, Ref("trade_weekday"), "WIN", "LOSS", "BE")),
+        (
+            heatmap_rr,
+            (
+                Ref("weekday_hour_totals", "rr"),
+                Ref("weekday_hour_totals", "weekday"),
+                Ref("weekday_hour_totals", "hour"),
+            ),
+        ),
+        (bar_outcomes_by_custom_ranges, (Ref("outcome"), Ref("entry_time_seconds"), time_ranges)),
+        (rr_vs_hour_range_bubble_scatter, (Ref("entry_hour"), Ref("rr"), Ref("outcome"))),
+        (distribution_plot, (Ref("stop_loss_points"), "Distribution of Stop-Loss points", "Stop-Loss Points")),
+        (
+            risk_vs_reward_scatter,
+            (Ref("position_size"), Ref("rr"), Ref("outcome"), "Position Size vs R/R", "Position Size", "R/R"),
+        ),
+        (rr_vs_sl_points, (Ref("stop_loss_points"), Ref("rr"), Ref("outcome"))),
+        (rr_barplot_months, (Ref("monthly_totals", "rr"), Ref("monthly_totals", "period"))),
+        (holding_time_profile, (Ref("holding_profile"),)),
+        (concurrent_exposure, (Ref("exposure_profile"),)),
+        (excursion_scatter, (Ref("excursion_profile"), "mae")),
+        (excursion_scatter, (Ref("excursion_profile"), "mfe")),
+    ]
+
+    for group_columns in DEFAULT_BREAKDOWNS if breakdowns is None else breakdowns:
+        title = "Performance by " + " × ".join(column.replace("_", " ").title() for column in group_columns)
+        steps.append((create_breakdown_table, (Ref(f"breakdown:{','.join(group_columns)}"), title)))
+
+    if sizing:
+        steps.append((create_sizing_table, (Ref("position_sizing"),)))
+        steps.append((sizing_frontier, (Ref("position_sizing"),)))
+
+    return steps
+
+
+def report_columns(report_type: str, breakdowns: list[list[str]] | None = None, sizing: bool = False) -> list[str]:
+    """Journal columns the pages of a weekly or overall report may read."""
+    steps = weekly_page_steps() if report_type == "weekly" else overall_page_steps(breakdowns, sizing)
+    return plan_columns(steps)
+
+
+def generate_plots_weekly(df: pd.DataFrame, planner: ReportPlanner | None = None) -> list[tuple]:
+    """Generate plot functions and arguments for weekly reports."""
+    planner = planner or ReportPlanner(df)
+    return planner.plan(weekly_page_steps())
+
+
+def generate_plots_overall(
+    df: pd.DataFrame,
+    breakdowns: list[list[str]] | None = None,
+    planner: ReportPlanner | None = None,
+    sizing: bool = False,
+) -> list[tuple]:
+    """Generate plot functions and arguments for overall reports.
+
+    The planner skips pages whose columns are empty and computes shared
+    intermediates once. With ``sizing``, position-sizing what-if pages are added.
+    """
+    planner = planner or ReportPlanner(df)
+    return planner.plan(overall_page_steps(breakdowns, sizing))
+
+
+def generate_plots_portfolio(portfolio: dict) -> list[tuple]:
+    """Generate plot functions and arguments for multi-account portfolio reports."""
+    plots: list[tuple] = [
+        (create_stats_table, (portfolio["stats"], "Portfolio Performance Summary")),
+        (create_comparison_table, (portfolio["accounts"],)),
+    ]
+    rr_series = portfolio["rr"]
+    add_plot(plots, not rr_series.empty, rr_curve, rr_series, "Portfolio Performance (R/R)")
+    add_plot(plots, not rr_series.empty, drawdown_curve, rr_series, "Portfolio Drawdown Curve")
+    return plots
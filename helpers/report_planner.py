@@ -0,0 +1,237 @@
+"""Lazy report planning over shared, memoized intermediates.
+
+Plot steps reference derived data (clean R series, cumulative R, drawdown,
+monthly and hourly totals, label factorizations, breakdown tables) by name.
+The planner decides from the column profile alone whether a step can be
+produced, then computes each intermediate it needs at most once, resolving
+dependencies first. ``plan_columns`` lists the journal columns a set of
+steps reads before any data is loaded.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import CALENDAR_COLUMNS
+from helpers.breakdowns import group_breakdown
+from helpers.calculations import stats_table_overall, stats_table_weekly
+from helpers.durations import holding_profile
+from helpers.excursions import excursion_profile
+from helpers.exposure import exposure_profile
+from helpers.position_sizing import evaluate_sizing
+from helpers.utils import factorize_labels, has_non_empty, profile_entry, series_or_none
+
+
+class Ref:
+    """Placeholder for an intermediate (or one of its columns) in plot arguments."""
+
+    def __init__(self, name: str, key: str | None = None):
+        self.name = name
+        self.key = key
+
+    def __repr__(self) -> str:
+        return f"Ref({self.name!r})" if self.key is None else f"Ref({self.name!r}, {self.key!r})"
+
+
+def _column(name: str) -> tuple:
+    return ((name,), (), lambda df: df[name])
+
+
+def _numeric(name: str) -> tuple:
+    return ((name,), (), lambda df: series_or_none(df, name))
+
+
+def _monthly_totals(df: pd.DataFrame, rr: pd.Series) -> pd.DataFrame:
+    months = df["trade_month"].where(df["trade_month"] >= 0)
+    totals = rr.groupby(months.to_numpy()).sum()
+    return pd.DataFrame({"period": totals.index.astype(np.int64), "rr": totals.to_numpy()})
+
+
+def _weekday_hour_totals(df: pd.DataFrame, rr: pd.Series) -> pd.DataFrame:
+    valid = (df["trade_weekday"] >= 0) & (df["entry_hour"] >= 0) & rr.notna()
+    keys = [df["trade_weekday"][valid].to_numpy(), df["entry_hour"][valid].to_numpy()]
+    totals = rr[valid].groupby(keys).sum()
+    return pd.DataFrame(
+        {
+            "rr": totals.to_numpy(),
+            "weekday": totals.index.get_level_values(0).astype(np.int64),
+            "hour": totals.index.get_level_values(1).astype(np.int64),
+        }
+    )
+
+
+def position_sizing(df: pd.DataFrame, rr: pd.Series, grid: dict[str, list[float]] | None = None) -> pd.DataFrame:
+    """What-if sizing results over the trades with R, annualized by their dates when present."""
+    dates = df["trade_date"].loc[rr.index] if "trade_date" in df.columns else None
+    return evaluate_sizing(rr, dates, grid)
+
+
+# name -> (source columns, dependencies, compute(df, *dependency values))
+INTERMEDIATES: dict[str, tuple] = {
+    "rr": _numeric("rr"),
+    "stop_loss_points": _numeric("stop_loss_points"),
+    "position_size": _numeric("position_size"),
+    "outcome": _column("outcome"),
+    "asset": _column("asset"),
+    "trade_weekday": _column("trade_weekday"),
+    "trade_month": _column("trade_month"),
+    "entry_hour": _column("entry_hour"),
+    "entry_time_seconds": _column("entry_time_seconds"),
+    "rr_trades": ((), ("rr",), lambda df, rr: rr.dropna()),
+    "cumulative_rr": ((), ("rr_trades",), lambda df, rr: rr.cumsum()),
+    "drawdown": ((), ("cumulative_rr",), lambda df, cumulative: cumulative - cumulative.cummax()),
+    "monthly_totals": (("trade_month",), ("rr",), _monthly_totals),
+    "weekday_hour_totals": (("trade_weekday", "entry_hour"), ("rr",), _weekday_hour_totals),
+    "position_sizing": ((), ("rr_trades",), position_sizing),
+    "holding_profile": (("entry_time_seconds", "exit_time_seconds"), (), holding_profile),
+    "exposure_profile": (("trade_date", "entry_time_seconds", "exit_time_seconds"), (), exposure_profile),
+    "excursion_profile": (("mae_points", "mfe_points", "rr"), (), excursion_profile),
+    "stats_overall": ((), (), stats_table_overall),
+    "stats_weekly": ((), (), stats_table_weekly),
+}
+
+# name -> columns an intermediate reads when present, beyond its source columns
+INTERMEDIATE_READS: dict[str, tuple[str, ...]] = {
+    "position_sizing": ("trade_date",),
+    "holding_profile": ("trade_date", "exit_date", "rr", "outcome"),
+    "exposure_profile": ("exit_date", "risk_amount", "position_size", "rr", "outcome"),
+    "excursion_profile": ("mae_r", "mfe_r", "outcome"),
+    "stats_overall": ("rr", "position_size", "outcome", "asset"),
+    "stats_weekly": ("rr", "outcome", "trade_date", "trade_weekday"),
+}
+
+# Columns every breakdown table reads besides its group columns.
+BREAKDOWN_READS = ("rr", "outcome")
+
+
+def plan_columns(steps: list[tuple], intermediates: dict[str, tuple] | None = None) -> list[str]:
+    """Journal columns that declared steps may read, judged from the declarations alone.
+
+    Lets a stored journal be loaded with just the columns a report's pages
+    need; columns the journal lacks only disable the steps that use them.
+    """
+    intermediates = INTERMEDIATES if intermediates is None else intermediates
+    names = [
+        name
+        for step in steps
+        for name in ReportPlanner._required_names(ReportPlanner._normalize_step(step))
+    ]
+    columns: dict[str, None] = {}
+    seen: set[str] = set()
+    while names:
+        name = names.pop(0)
+        if name in seen:
+            continue
+        seen.add(name)
+        family, _, argument = name.partition(":")
+        if family == "labels" and argument:
+            columns[argument] = None
+        elif family == "breakdown" and argument:
+            columns.update(dict.fromkeys([*argument.split(","), *BREAKDOWN_READS]))
+        else:
+            source, dependencies, _ = intermediates[name]
+            columns.update(dict.fromkeys([*source, *INTERMEDIATE_READS.get(name, ())]))
+            names.extend(dependencies)
+    return list(columns)
+
+
+class ReportPlanner:
+    """Resolve report intermediates lazily, computing each one at most once.
+
+    Besides the fixed ``INTERMEDIATES``, two families are created on demand:
+    ``labels:<column>`` (the column's label factorization) and
+    ``breakdown:<col1>,<col2>`` (a ``group_breakdown`` table that reuses the
+    shared factorizations).
+    """
+
+    def __init__(self, df: pd.DataFrame, intermediates: dict[str, tuple] | None = None):
+        self.df = df
+        self.timings: dict[str, float] = {}
+        self._intermediates = dict(INTERMEDIATES if intermediates is None else intermediates)
+        self._values: dict[str, object] = {}
+
+    def available(self, name: str) -> bool:
+        """Whether an intermediate can be computed, judged from the column profile only."""
+        columns, dependencies, _ = self._spec(name)
+        return all(self._column_available(column) for column in columns) and all(
+            self.available(dependency) for dependency in dependencies
+        )
+
+    def get(self, name: str, key: str | None = None):
+        """Return an intermediate (or one of its columns), computing it on first use."""
+        if name not in self._values:
+            _, dependencies, compute = self._spec(name)
+            values = [self.get(dependency) for dependency in dependencies]
+            started = time.perf_counter()
+            self._values[name] = compute(self.df, *values)
+            self.timings[name] = time.perf_counter() - started
+        value = self._values[name]
+        return value if key is None else value[key]
+
+    def plan(self, steps: list[tuple]) -> list[tuple]:
+        """Turn declared steps into render steps, skipping any that cannot be produced.
+
+        Each step is ``(func, args)`` or ``(func, args, kwargs)``, optionally
+        followed by extra intermediate names it requires. ``Ref`` arguments are
+        replaced by their values; intermediates are only computed for the steps
+        that are kept.
+        """
+        declared = [self._normalize_step(step) for step in steps]
+        enabled = [
+            step for step in declared
+            if all(self.available(name) for name in self._required_names(step))
+        ]
+        planned = []
+        for func, args, kwargs, _ in enabled:
+            resolved_args = tuple(self._resolve(arg) for arg in args)
+            resolved_kwargs = {key: self._resolve(value) for key, value in kwargs.items()}
+            planned.append((func, resolved_args, resolved_kwargs) if resolved_kwargs else (func, resolved_args))
+        return planned
+
+    def _spec(self, name: str) -> tuple:
+        if name not in self._intermediates:
+            family, _, argument = name.partition(":")
+            if family == "labels" and argument:
+                self._intermediates[name] = ((argument,), (), lambda df: factorize_labels(df[argument]))
+            elif family == "breakdown" and argument:
+                self._intermediates[name] = self._breakdown_spec(argument.split(","))
+            else:
+                raise KeyError(f"Unknown report intermediate: {name}")
+        return self._intermediates[name]
+
+    def _breakdown_spec(self, by: list[str]) -> tuple:
+        label_columns = list(dict.fromkeys([*by, "outcome"]))
+        shared = [column for column in label_columns if column in by or self._column_available(column)]
+        dependencies = tuple(f"labels:{column}" for column in shared)
+
+        def compute(df: pd.DataFrame, *labels) -> pd.DataFrame:
+            return group_breakdown(df, by, labels=dict(zip(shared, labels)))
+
+        return (), dependencies, compute
+
+    def _column_available(self, column: str) -> bool:
+        if column not in self.df.columns:
+            return False
+        if column in CALENDAR_COLUMNS:
+            entry = profile_entry(self.df, column)
+            if entry is not None:
+                return entry["max"] is not None and entry["max"] >= 0
+            return bool((self.df[column] >= 0).any())
+        return has_non_empty(self.df, column)
+
+    def _resolve(self, value):
+        return self.get(value.name, value.key) if isinstance(value, Ref) else value
+
+    @staticmethod
+    def _normalize_step(step: tuple) -> tuple:
+        func, args, *rest = step
+        kwargs = rest[0] if rest and isinstance(rest[0], dict) else {}
+        extra = tuple(rest[1:] if rest and isinstance(rest[0], dict) else rest)
+        return func, args, kwargs, extra
+
+    @staticmethod
+    def _required_names(step: tuple) -> list[str]:
+        _, args, kwargs, extra = step
+        refs = [value.name for value in (*args, *kwargs.values()) if isinstance(value, Ref)]
+        return [*refs, *extra]
@@ -0,0 +1,420 @@
+"""Long-running local HTTP service that keeps normalized journals warm in memory."""
+
+import json
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+from config import SERVER_DEFAULTS
+from helpers.calculations import stats_table_overall, stats_table_weekly
+from helpers.exporters import html_document, pdf_bytes, render_pages, report_payload, to_jsonable
+from helpers.journal_filter import FilterError, JournalIndex
+from helpers.journal_loading import load_input_dataframe
+from helpers.report_pages import generate_plots_overall, generate_plots_weekly
+from helpers.report_planner import ReportPlanner
+
+PLOT_BUILDERS = {
+    "weekly": generate_plots_weekly,
+    "overall": generate_plots_overall,
+}
+
+STATS_FUNCS = {
+    "weekly": stats_table_weekly,
+    "overall": stats_table_overall,
+}
+
+REPORT_CONTENT_TYPES = {
+    "html": "text/html; charset=utf-8",
+    "pdf": "application/pdf",
+    "json": "application/json",
+}
+
+
+class HTTPError(Exception):
+    """Error that maps directly onto an HTTP response status."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def file_fingerprint(path: Path) -> tuple:
+    """Identify a file's current content by path, size, and modification time."""
+    stat = path.stat()
+    return (str(path), stat.st_size, stat.st_mtime_ns)
+
+
+class JournalCache:
+    """Thread-safe LRU cache of normalized journals keyed by file fingerprint."""
+
+    def __init__(self, maxsize: int = SERVER_DEFAULTS["cache_size"]):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, pd.DataFrame] = OrderedDict()
+        self._indexes: dict[tuple, JournalIndex] = {}
+        self._lock = threading.Lock()
+        self._key_locks: dict[tuple, threading.Lock] = {}
+
+    def get(self, input_path: Path, config_path: Path | None = None) -> pd.DataFrame:
+        """Return the normalized journal, loading it only when the file changed."""
+        key = self._key(input_path, config_path)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Concurrent requests for the same journal wait for a single load.
+        with key_lock:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key]
+                self.misses += 1
+
+            try:
+                df = load_input_dataframe(
+                    "overall", str(input_path), str(config_path) if config_path else None
+                )
+            except BaseException:
+                # Failed loads are not cached, so their locks would never be evicted.
+                with self._lock:
+                    if key not in self._entries:
+                        self._key_locks.pop(key, None)
+                raise
+
+            with self._lock:
+                self._entries[key] = df
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+                    self._indexes.pop(evicted, None)
+        return df
+
+    def get_index(self, input_path: Path, config_path: Path | None = None) -> JournalIndex:
+        """Return the filter index of a cached journal, built once per loaded version."""
+        df = self.get(input_path, config_path)
+        key = self._key(input_path, config_path)
+        with self._lock:
+            index = self._indexes.get(key)
+        if index is None or index.df is not df:
+            index = JournalIndex(df)
+            with self._lock:
+                if key in self._entries:
+                    self._indexes[key] = index
+        return index
+
+    @staticmethod
+    def _key(input_path: Path, config_path: Path | None) -> tuple:
+        return (
+            file_fingerprint(input_path),
+            file_fingerprint(config_path) if config_path else None,
+        )
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class LatencyMetrics:
+    """Rolling per-route request latency and error counters."""
+
+    def __init__(self, window: int = SERVER_DEFAULTS["metrics_window"]):
+        self._window = window
+        self._samples: dict[str, deque] = {}
+        self._counts: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, seconds: float, failed: bool = False) -> None:
+        with self._lock:
+            self._samples.setdefault(route, deque(maxlen=self._window)).append(seconds * 1000)
+            self._counts[route] = self._counts.get(route, 0) + 1
+            if failed:
+                self._errors[route] = self._errors.get(route, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            routes = {route: np.array(samples) for route, samples in self._samples.items()}
+            counts = dict(self._counts)
+            errors = dict(self._errors)
+
+        summary = {}
+        for route, samples in routes.items():
+            p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+            summary[route] = {
+                "count": counts[route],
+                "errors": errors.get(route, 0),
+                "mean_ms": round(float(samples.mean()), 3),
+                "p50_ms": round(float(p50), 3),
+                "p95_ms": round(float(p95), 3),
+                "p99_ms": round(float(p99), 3),
+                "max_ms": round(float(samples.max()), 3),
+            }
+        return summary
+
+
+def render_journal(df: pd.DataFrame, report_type: str, report_format: str) -> bytes:
+    """Render a full report for a normalized journal into memory."""
+    planner = ReportPlanner(df)
+    steps = PLOT_BUILDERS[report_type](df, planner=planner)
+    stats = planner.get(f"stats_{report_type}")
+    pages = render_pages(steps, progress=False)
+    if report_format == "pdf":
+        return pdf_bytes(pages)
+    if report_format == "json":
+        payload = report_payload(pages, stats, report_type.capitalize())
+        return json.dumps(payload, allow_nan=False).encode("utf-8")
+    return html_document(pages, stats, f"{report_type.capitalize()} Report").encode("utf-8")
+
+
+# Each render worker keeps its own warm journals, so requests ship paths rather
+# than pickled DataFrames; the cache reloads a journal when its file changes.
+_worker_cache: JournalCache | None = None
+
+
+def render_report(
+    input_path: str,
+    config_path: str | None,
+    expression: str | None,
+    report_type: str,
+    report_format: str,
+) -> bytes:
+    """Render a report for a journal file; runs inside a render worker process."""
+    input_file = Path(input_path)
+    config_file = Path(config_path) if config_path else None
+    if expression:
+        df = _worker_cache.get_index(input_file, config_file).select(expression)
+    else:
+        df = _worker_cache.get(input_file, config_file)
+    return render_journal(df, report_type, report_format)
+
+
+def _init_render_worker(cache_size: int) -> None:
+    global _worker_cache
+    matplotlib.use("Agg")
+    _worker_cache = JournalCache(cache_size)
+
+
+class ReportServer(ThreadingHTTPServer):
+    """HTTP server holding the journal cache, render pool, and metrics."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        root: str | Path = ".",
+        cache_size: int = SERVER_DEFAULTS["cache_size"],
+        max_concurrent: int = SERVER_DEFAULTS["max_concurrent"],
+        render_workers: int = SERVER_DEFAULTS["render_workers"],
+        render_timeout: float = SERVER_DEFAULTS["render_timeout"],
+    ):
+        super().__init__(address, ReportRequestHandler)
+        self.root = Path(root).resolve()
+        self.cache = JournalCache(cache_size)
+        self.metrics = LatencyMetrics()
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.render_timeout = render_timeout
+        self.render_workers = render_workers
+        self.cache_size = cache_size
+        self._pool_lock = threading.Lock()
+        self.render_pool = self._start_render_pool()
+
+    def _start_render_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.render_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_render_worker,
+            initargs=(self.cache_size,),
+        )
+
+    def restart_render_pool(self, broken: ProcessPoolExecutor) -> None:
+        """Replace a render pool whose worker died, once, however many requests saw it fail."""
+        with self._pool_lock:
+            if self.render_pool is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self.render_pool = self._start_render_pool()
+
+    def resolve_local_path(self, value: str | None, required: bool = True) -> Path | None:
+        """Resolve a request path under the server root, rejecting anything outside it."""
+        if not value:
+            if required:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Missing 'input' query parameter.")
+            return None
+
+        path = (self.root / value).resolve()
+        if not path.is_relative_to(self.root):
+            raise HTTPError(HTTPStatus.FORBIDDEN, f"Path is outside the server root: {value}")
+        if not path.is_file():
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Journal file not found: {value}")
+        return path
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.render_pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    """Serve stats JSON, rendered reports, and service metrics."""
+
+    server: ReportServer
+
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        route = parsed.path.rstrip("/") or "/"
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        handlers = {
+            "/health": self._health,
+            "/metrics": self._metrics,
+            "/stats": self._stats,
+            "/report": self._report,
+        }
+
+        started = time.perf_counter()
+        failed = False
+        try:
+            handler = handlers.get(route)
+            if handler is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown route: {route}")
+            if route in {"/stats", "/report"}:
+                if not self.server.slots.acquire(blocking=False):
+                    raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Too many concurrent requests.")
+                # A render that outlives its timeout takes over the slot and frees it when done.
+                self.slot_handed_off = False
+                try:
+                    handler(query)
+                finally:
+                    if not self.slot_handed_off:
+                        self.server.slots.release()
+            else:
+                handler(query)
+        except HTTPError as error:
+            failed = True
+            self._send_json({"error": error.message}, error.status)
+        except (ValueError, KeyError) as error:
+            failed = True
+            self._send_json({"error": str(error)}, HTTPStatus.UNPROCESSABLE_ENTITY)
+        except TimeoutError:
+            failed = True
+            self._send_json({"error": "Report rendering timed out."}, HTTPStatus.GATEWAY_TIMEOUT)
+        except Exception as error:
+            failed = True
+            self.log_error("Unhandled error on %s: %r", route, error)
+            self._send_json({"error": "Internal server error."}, HTTPStatus.INTERNAL_SERVER_ERROR)
+        finally:
+            if route in handlers:
+                self.server.metrics.record(route, time.perf_counter() - started, failed)
+
+    def _health(self, query: dict) -> None:
+        self._send_json({"status": "ok"})
+
+    def _metrics(self, query: dict) -> None:
+        self._send_json({"cache": self.server.cache.snapshot(), "routes": self.server.metrics.snapshot()})
+
+    def _stats(self, query: dict) -> None:
+        report_type = self._report_type(query)
+        df = self._load(query)
+        stats = STATS_FUNCS[report_type](df)
+        self._send_json(
+            {"input": query["input"], "type": report_type, "filter": query.get("filter"), "stats": to_jsonable(stats)}
+        )
+
+    def _report(self, query: dict) -> None:
+        report_type = self._report_type(query)
+        report_format = query.get("format", "html").lower()
+        if report_format not in REPORT_CONTENT_TYPES:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Unsupported report format: {report_format}")
+
+        input_path = self.server.resolve_local_path(query.get("input"))
+        config_path = self.server.resolve_local_path(query.get("config"), required=False)
+        pool = self.server.render_pool
+        try:
+            future = pool.submit(
+                render_report,
+                str(input_path),
+                str(config_path) if config_path else None,
+                query.get("filter"),
+                report_type,
+                report_format,
+            )
+            body = future.result(timeout=self.server.render_timeout)
+        except FilterError as exc:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(exc)) from exc
+        except BrokenProcessPool:
+            self.server.restart_render_pool(pool)
+            raise
+        except TimeoutError:
+            if not future.cancel():
+                self.slot_handed_off = True
+                future.add_done_callback(lambda _: self.server.slots.release())
+            raise
+        self._send_bytes(body, REPORT_CONTENT_TYPES[report_format])
+
+    def _report_type(self, query: dict) -> str:
+        report_type = query.get("type", "overall").lower()
+        if report_type not in STATS_FUNCS:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Unknown report type: {report_type}")
+        return report_type
+
+    def _load(self, query: dict) -> pd.DataFrame:
+        input_path = self.server.resolve_local_path(query.get("input"))
+        config_path = self.server.resolve_local_path(query.get("config"), required=False)
+        if not query.get("filter"):
+            return self.server.cache.get(input_path, config_path)
+        try:
+            return self.server.cache.get_index(input_path, config_path).select(query["filter"])
+        except FilterError as exc:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(exc)) from exc
+
+    def _send_json(self, payload: dict, status: HTTPStatus = HTTPStatus.OK) -> None:
+        self._send_bytes(json.dumps(payload, allow_nan=False).encode("utf-8"), "application/json", status)
+
+    def _send_bytes(self, body: bytes, content_type: str, status: HTTPStatus = HTTPStatus.OK) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(
+    host: str = SERVER_DEFAULTS["host"],
+    port: int = SERVER_DEFAULTS["port"],
+    root: str | Path = ".",
+    cache_size: int = SERVER_DEFAULTS["cache_size"],
+    max_concurrent: int = SERVER_DEFAULTS["max_concurrent"],
+    render_workers: int = SERVER_DEFAULTS["render_workers"],
+) -> None:
+    """Run the report service until interrupted."""
+    server = ReportServer(
+        (host, port),
+        root=root,
+        cache_size=cache_size,
+        max_concurrent=max_concurrent,
+        render_workers=render_workers,
+    )
+    print(f"Serving reports for journals under {server.root} on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down report server...")
+    finally:
+        server.server_close()
@@ -0,0 +1,244 @@
+"""SQLite journal store with indexed, incremental ingestion.
+
+Normalized trades live in one typed table: REAL for numeric columns, INTEGER
+for dates (nanoseconds since the epoch, in UTC for zoned dates) and for
+entry/exit times (seconds of day), and TEXT for labels. ``SQLITE_INDEXED_COLUMNS``
+get an index each. Every row also stores a 64-bit trade key under a unique
+index, so ingesting an overlapping export inserts only the new trades. The key
+hashes the fixed ``MERGE_DEFAULTS`` key columns, not every column, so exports
+that gain or drop other columns still match the trades already stored.
+
+Reads select just the requested columns and date range. They copy
+``fetchmany`` batches straight into preallocated NumPy arrays and decode
+them like a columnar journal.
+"""
+
+import sqlite3
+from contextlib import closing
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import CALENDAR_COLUMNS, MERGE_DEFAULTS, SQLITE_BATCH_ROWS, SQLITE_INDEXED_COLUMNS, SQLITE_SUFFIXES, SQLITE_TABLE
+from helpers.columnar_journal import MISSING_TIME, decode_columns, encode_column, select_columns
+from helpers.journal_merge import row_fingerprints
+from helpers.utils import column_profile
+
+# Version 1 stores keyed trades on a hash of all their columns; they are re-keyed on ingest.
+STORE_VERSION = 2
+COLUMNS_TABLE = "journal_columns"
+SQL_TYPES = {"numeric": "REAL", "time": "INTEGER", "datetime": "INTEGER", "category": "TEXT"}
+NAT = np.iinfo(np.int64).min
+
+
+def is_sqlite_journal(path: str | Path) -> bool:
+    """Check whether a path names a SQLite journal store."""
+    return Path(path).suffix.lower() in SQLITE_SUFFIXES
+
+
+def ingest_sqlite_journal(
+    df: pd.DataFrame, path: str | Path, batch_rows: int = SQLITE_BATCH_ROWS
+) -> tuple[int, int]:
+    """Insert normalized trades into a SQLite store, skipping trades it already holds.
+
+    The store is created on first use, and columns the table lacks are added.
+    Trades are matched on ``trade_keys``, so re-ingesting an export, or a
+    later export with extra columns, only adds trades the store lacks.
+
+    Returns:
+        tuple: Rows inserted and total rows in the store.
+    """
+    keys = trade_keys(df).view(np.int64).tolist()
+    with closing(sqlite3.connect(path)) as connection, connection:
+        stored = _prepare_store(connection, path)
+        names, columns = [], []
+        for name in df.columns:
+            if name in CALENDAR_COLUMNS:
+                continue
+            spec = stored.get(name)
+            kind, values, extra = encode_column(df[name], name, kind=spec[0] if spec else None)
+            if kind == "datetime":
+                if spec and spec[1] != extra and df[name].notna().any():
+                    raise ValueError(f"Time zone mismatch for {name}: {spec[1]} vs {extra}")
+                values = values.astype("datetime64[ns]").view(np.int64)
+            if spec is None:
+                # Only the time zone of date columns is kept; labels are stored as text.
+                zone = extra if kind == "datetime" else None
+                connection.execute(f'ALTER TABLE {SQLITE_TABLE} ADD COLUMN "{name}" {SQL_TYPES[kind]}')
+                connection.execute(f"INSERT INTO {COLUMNS_TABLE} VALUES (?, ?, ?)", (name, kind, zone))
+                stored[name] = (kind, zone)
+            names.append(name)
+            columns.append(_sql_values(kind, values, extra))
+
+        placeholders = ", ".join("?" * (len(names) + 1))
+        quoted = ", ".join(f'"{name}"' for name in ["row_hash", *names])
+        statement = f"INSERT OR IGNORE INTO {SQLITE_TABLE} ({quoted}) VALUES ({placeholders})"
+        before = connection.total_changes
+        rows = zip(keys, *columns)
+        while batch := list(islice(rows, batch_rows)):
+            connection.executemany(statement, batch)
+        inserted = connection.total_changes - before
+
+        # Index after inserting, so a new store is bulk-loaded and sorted once per index.
+        for name in SQLITE_INDEXED_COLUMNS:
+            if name in stored:
+                connection.execute(f'CREATE INDEX IF NOT EXISTS idx_{SQLITE_TABLE}_{name} ON {SQLITE_TABLE} ("{name}")')
+        total = connection.execute(f"SELECT COUNT(*) FROM {SQLITE_TABLE}").fetchone()[0]
+    return inserted, total
+
+
+def trade_keys(df: pd.DataFrame) -> np.ndarray:
+    """One 64-bit key per trade from the ``MERGE_DEFAULTS`` key columns and the trade's copy number.
+
+    Key columns the journal lacks are hashed as missing. A trade listed n
+    times in one journal gets n distinct keys, so its repeats are kept as
+    in ``merge_journals``.
+    """
+    key_columns = MERGE_DEFAULTS["key_columns"]
+    if not any(name in df.columns for name in key_columns):
+        raise ValueError(f"The journal has none of the trade key columns: {', '.join(key_columns)}")
+    keyed = df.assign(**{name: np.nan for name in key_columns if name not in df.columns})
+    fingerprints = row_fingerprints(keyed, key_columns)
+    copies = pd.Series(fingerprints, copy=False).groupby(fingerprints, sort=False).cumcount().to_numpy()
+    frame = pd.DataFrame({"fingerprint": fingerprints, "copy": copies}, copy=False)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def read_sqlite_journal(
+    path: str | Path,
+    columns: list[str] | None = None,
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+    decode_times: bool = True,
+    batch_rows: int = SQLITE_BATCH_ROWS,
+    missing_ok: bool = False,
+) -> pd.DataFrame:
+    """Load a normalized journal from a SQLite store without re-normalizing it.
+
+    Args:
+        path: SQLite store.
+        columns: Optional subset of columns to query.
+        start: First trade date to load (inclusive), through the ``trade_date`` index.
+        end: Last trade date to load (inclusive).
+        decode_times: Also rebuild ``HH:MM:SS`` strings for time columns.
+        batch_rows: Rows per ``fetchmany`` batch.
+        missing_ok: Skip requested columns the store lacks instead of raising.
+
+    Returns:
+        pd.DataFrame: Normalized journal marked with ``attrs["normalized"]``, in
+        ingestion order.
+    """
+    with closing(sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)) as connection:
+        stored = _stored_columns(connection)
+        selected = select_columns(stored, columns, missing_ok)
+        where, params = _date_range(stored, start, end)
+        rows = connection.execute(f"SELECT COUNT(*) FROM {SQLITE_TABLE}{where}", params).fetchone()[0]
+
+        expressions, arrays = [], []
+        for name in selected:
+            kind = stored[name][0]
+            if kind == "numeric":
+                expressions.append(f'"{name}"')
+                arrays.append(np.empty(rows, dtype=np.float64))
+            elif kind == "time":
+                expressions.append(f'IFNULL("{name}", {MISSING_TIME})')
+                arrays.append(np.empty(rows, dtype=np.int32))
+            elif kind == "datetime":
+                expressions.append(f'IFNULL("{name}", {NAT})')
+                arrays.append(np.empty(rows, dtype=np.int64))
+            else:
+                expressions.append(f'"{name}"')
+                arrays.append(np.empty(rows, dtype=object))
+
+        cursor = connection.execute(
+            f"SELECT {', '.join(expressions)} FROM {SQLITE_TABLE}{where} ORDER BY id", params
+        )
+        cursor.arraysize = batch_rows
+        position = 0
+        while batch := cursor.fetchmany():
+            for array, values in zip(arrays, zip(*batch)):
+                array[position : position + len(batch)] = values
+            position += len(batch)
+
+    data = {}
+    for name, values in zip(selected, arrays):
+        kind, extra = stored[name]
+        if kind == "category":
+            codes, labels = pd.factorize(values, use_na_sentinel=True)
+            data[name] = (kind, codes.astype(np.int32), [str(label) for label in labels])
+        elif kind == "datetime":
+            data[name] = (kind, values.view("datetime64[ns]"), extra)
+        else:
+            data[name] = (kind, values, extra)
+
+    df = decode_columns(data, decode_times)
+    df.attrs["column_profile"] = column_profile(df)
+    return df
+
+
+def _prepare_store(connection: sqlite3.Connection, path: str | Path) -> dict[str, tuple[str, str | None]]:
+    """Create the store tables on first use, re-key older stores, and return the stored column kinds."""
+    version = connection.execute("PRAGMA user_version").fetchone()[0]
+    if version == 0:
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {SQLITE_TABLE} (id INTEGER PRIMARY KEY, row_hash INTEGER NOT NULL UNIQUE)"
+        )
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {COLUMNS_TABLE} (name TEXT PRIMARY KEY, kind TEXT NOT NULL, extra TEXT)"
+        )
+    elif version == 1:
+        _rekey_store(connection, path)
+    elif version != STORE_VERSION:
+        raise ValueError(f"Unsupported journal store version {version}")
+    connection.execute(f"PRAGMA user_version = {STORE_VERSION}")
+    return _stored_columns(connection)
+
+
+def _rekey_store(connection: sqlite3.Connection, path: str | Path) -> None:
+    """Replace the whole-row hashes of a version 1 store with ``trade_keys``."""
+    stored = _stored_columns(connection)
+    columns = [name for name in MERGE_DEFAULTS["key_columns"] if name in stored]
+    ids = [row[0] for row in connection.execute(f"SELECT id FROM {SQLITE_TABLE} ORDER BY id")]
+    if not ids:
+        return
+    keys = trade_keys(read_sqlite_journal(path, columns, decode_times=False)).view(np.int64).tolist()
+    connection.executemany(f"UPDATE {SQLITE_TABLE} SET row_hash = ? WHERE id = ?", zip(keys, ids))
+
+
+def _stored_columns(connection: sqlite3.Connection) -> dict[str, tuple[str, str | None]]:
+    try:
+        rows = connection.execute(f"SELECT name, kind, extra FROM {COLUMNS_TABLE} ORDER BY rowid").fetchall()
+    except sqlite3.OperationalError as error:
+        raise ValueError("Not a journal store: missing column table") from error
+    return {name: (kind, extra) for name, kind, extra in rows}
+
+
+def _sql_values(kind: str, values: np.ndarray, extra) -> list:
+    """Column values as Python objects for ``executemany``, with None for missing values."""
+    if kind == "numeric":
+        return values.tolist()  # SQLite stores NaN as NULL
+    if kind == "category":
+        return np.array([*extra, None], dtype=object)[values].tolist()
+    missing = MISSING_TIME if kind == "time" else NAT
+    return np.where(values == missing, None, values.astype(object)).tolist()
+
+
+def _date_range(stored: dict, start, end) -> tuple[str, list]:
+    """SQL ``WHERE`` clause selecting trade dates from ``start`` through ``end``."""
+    if start is None and end is None:
+        return "", []
+    if "trade_date" not in stored:
+        raise ValueError("The journal store has no trade_date column to select a date range")
+    tz = stored["trade_date"][1]
+    clauses, params = [], []
+    for bound, operator, shift in ((start, ">=", 0), (end, "<", 1)):
+        if bound is None:
+            continue
+        timestamp = pd.Timestamp(bound).normalize() + pd.Timedelta(days=shift)
+        if tz:
+            timestamp = timestamp.tz_localize(tz).tz_convert("UTC").tz_localize(None)
+        clauses.append(f"trade_date {operator} ?")
+        params.append(int(timestamp.value))
+    return " WHERE " + " AND ".join(clauses), params
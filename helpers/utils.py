@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
 
+from config import WEEKDAY_NAMES
 from helpers.data_cleaning import clean_numeric_series
 
 
@@ -18,23 +19,129 @@ def normalize_label(value: str) -> str:
 
 def has_non_empty(df: pd.DataFrame, column: str) -> bool:
     """Check whether a DataFrame column exists and contains non-empty values."""
-    return column in df.columns and df[column].dropna().astype(str).str.strip().ne("").any()
+    if column not in df.columns:
+        return False
+    entry = profile_entry(df, column)
+    if entry is not None:
+        return entry["non_empty"]
+    return df[column].dropna().astype(str).str.strip().ne("").any()
 
 
 def series_or_none(df: pd.DataFrame, column: str) -> pd.Series | None:
     """Return a cleaned numeric series when the column exists and has values."""
     if column not in df.columns:
         return None
+    entry = profile_entry(df, column)
+    if entry is not None and entry["kind"] == "numeric" and entry["non_null"] == 0:
+        return None
     series = clean_numeric_series(df[column], return_nan=True)
+    if entry is not None and entry["kind"] == "numeric":
+        return series
     return None if not series.notna().any() else series
 
 
+def column_profile(df: pd.DataFrame, columns: list[str] | None = None) -> dict:
+    """Summarize columns in one pass for plot planning and diagnostics.
+
+    Each entry holds the dtype, a kind (``numeric``, ``datetime`` or ``label``),
+    the non-null count, whether any value is non-empty, the number of distinct
+    values, and min/max for numeric and datetime columns. Label columns count
+    distinct values after stripping, with blank labels treated as missing.
+
+    Returns:
+        dict: ``{"rows": len(df), "columns": {name: entry}}``.
+    """
+    entries = {}
+    for column in df.columns if columns is None else columns:
+        series = df[column]
+        entry = {"dtype": str(series.dtype), "non_null": int(series.notna().sum())}
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            has_values = entry["non_null"] > 0
+            scalar = int if pd.api.types.is_integer_dtype(series) else float
+            entry.update(
+                kind="numeric",
+                non_empty=has_values,
+                distinct=int(series.nunique()),
+                min=scalar(series.min()) if has_values else None,
+                max=scalar(series.max()) if has_values else None,
+            )
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            has_values = entry["non_null"] > 0
+            entry.update(
+                kind="datetime",
+                non_empty=has_values,
+                distinct=int(series.nunique()),
+                min=series.min().isoformat() if has_values else None,
+                max=series.max().isoformat() if has_values else None,
+            )
+        else:
+            _, labels = factorize_labels(series)
+            entry.update(kind="label", non_empty=len(labels) > 0, distinct=len(labels), min=None, max=None)
+        entries[column] = entry
+    return {"rows": len(df), "columns": entries}
+
+
+def profile_entry(df: pd.DataFrame, column: str) -> dict | None:
+    """Return the attached profile entry for a column if it still describes the data.
+
+    Profiles travel with ``df.attrs`` into derived frames, so an entry is only
+    trusted when the row count and the column dtype still match.
+    """
+    profile = df.attrs.get("column_profile")
+    if not profile or profile.get("rows") != len(df) or column not in df.columns:
+        return None
+    entry = profile["columns"].get(column)
+    if entry is None or entry["dtype"] != str(df[column].dtype):
+        return None
+    return entry
+
+
+def factorize_labels(series: pd.Series) -> tuple[np.ndarray, pd.Index]:
+    """Factorize a label column, stripping only the distinct values.
+
+    Blank labels count as missing (code -1), and labels that only differ by
+    surrounding whitespace share one code.
+    """
+    raw_codes, raw_uniques = pd.factorize(series, use_na_sentinel=True)
+    stripped = pd.Series(raw_uniques.astype(str), dtype="string").str.strip().replace("", pd.NA)
+    unique_codes, uniques = pd.factorize(stripped, use_na_sentinel=True)
+    remap = np.append(unique_codes, -1)
+    return remap[raw_codes], pd.Index(uniques)
+
+
+def trade_dates(series: pd.Series) -> pd.Series:
+    """Return dates as datetime64, parsing only when they are not typed yet."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    return pd.to_datetime(series, errors="coerce")
+
+
+def weekday_labels(values: pd.Series) -> pd.Series:
+    """Return lowercase weekday names from weekday codes, dates, or day names.
+
+    Integer codes (0 = Monday, -1 = missing) and datetime64 values are mapped
+    without string parsing; text is stripped and lowercased once per distinct value.
+    """
+    if pd.api.types.is_integer_dtype(values):
+        names = np.array([*WEEKDAY_NAMES, None], dtype=object)
+        codes = values.to_numpy()
+        return pd.Series(names[np.where(codes >= 0, codes, -1)], index=values.index, dtype="object")
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.day_name().str.lower()
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    labels = np.append(pd.Index(uniques).astype(str).str.strip().str.lower().to_numpy(dtype=object), None)
+    return pd.Series(labels[codes], index=values.index, dtype="object")
+
+
 def weekly_day_labels(df: pd.DataFrame) -> pd.Series | None:
-    """Return normalized weekday labels from trade_day or trade_date."""
+    """Return normalized weekday labels from trade_weekday, trade_day or trade_date."""
+    if "trade_weekday" in df.columns:
+        labels = weekday_labels(df["trade_weekday"])
+        return labels if labels.notna().any() else None
     if has_non_empty(df, "trade_day"):
         return df["trade_day"].astype(str).str.strip().str.lower()
     if has_non_empty(df, "trade_date"):
-        dates = pd.to_datetime(df["trade_date"], errors="coerce")
+        dates = trade_dates(df["trade_date"])
         if dates.notna().any():
             return dates.dt.day_name().str.strip().str.lower()
     return None
@@ -1,11 +1,18 @@
-import matplotlib.pyplot as plt
+import calendar
+
 import numpy as np
 import pandas as pd
 import seaborn as sns
 from matplotlib.figure import Figure
+from matplotlib.ticker import MaxNLocator
 
-from config import COLORS, PLOT_DEFAULTS, DAY_ORDER
-from helpers.plot_styling import create_figure, style_axes, finalize_plot
+from config import BUBBLE_MAX_RR_LEVELS, COLORS, PLOT_DEFAULTS, DAY_ORDER
+from helpers.breakdowns import format_breakdown
+from helpers.density import binned_kde
+from helpers.durations import format_minutes
+from helpers.position_sizing import format_sizing
+from helpers.plot_styling import create_figure, cycle_color, finalize_plot, style_axes, styled_plot
+from helpers.utils import factorize_labels, trade_dates, weekday_labels
 
 
 def _parse_time_value(time_value):
@@ -24,19 +31,25 @@ def _parse_time_value(time_value):
     return None
 
 
+@styled_plot
 def rr_curve(
     rr_series: pd.Series,
     title: str = "Performance by (R/R)",
     xlabel: str = "Trades",
     ylabel: str = "Sum",
     figsize: tuple = PLOT_DEFAULTS["figsize"],
+    cumulative_rr: pd.Series | None = None,
 ) -> Figure:
-    """Plot cumulative R/R performance."""
+    """Plot cumulative R/R performance.
+
+    ``cumulative_rr`` may be passed when the running sum is already computed.
+    """
     fig, ax = create_figure(figsize)
-    rr_series = rr_series.dropna()
-    
-    x = range(len(rr_series))
-    sns.lineplot(x=x, y=rr_series.cumsum(), label="R/R", color=COLORS["primary"], ax=ax)
+    if cumulative_rr is None:
+        cumulative_rr = rr_series.dropna().cumsum()
+
+    x = range(len(cumulative_rr))
+    sns.lineplot(x=x, y=cumulative_rr, label="R/R", color=COLORS["primary"], ax=ax)
     
     style_axes(ax, title, xlabel, ylabel)
     ax.legend()
@@ -44,19 +57,23 @@ def rr_curve(
     return finalize_plot(fig)
 
 
+@styled_plot
 def drawdown_curve(
     rr_series: pd.Series,
     title: str = "Drawdown Curve",
     xlabel: str = "Trades",
     ylabel: str = "Drawdown (R)",
     figsize: tuple = PLOT_DEFAULTS["figsize"],
+    drawdown: pd.Series | None = None,
 ) -> Figure:
-    """Plot running drawdown from cumulative R performance."""
-    fig, ax = create_figure(figsize)
-    rr_series = rr_series.dropna()
+    """Plot running drawdown from cumulative R performance.
 
-    cumulative_rr = rr_series.cumsum()
-    drawdown = cumulative_rr - cumulative_rr.cummax()
+    ``drawdown`` may be passed when the running drawdown is already computed.
+    """
+    fig, ax = create_figure(figsize)
+    if drawdown is None:
+        cumulative_rr = rr_series.dropna().cumsum()
+        drawdown = cumulative_rr - cumulative_rr.cummax()
 
     sns.lineplot(
         x=range(len(drawdown)),
@@ -71,6 +88,7 @@ def drawdown_curve(
     return finalize_plot(fig)
 
 
+@styled_plot
 def rr_curve_weekly(
     rr_series: pd.Series,
     days: pd.Series | None = None,
@@ -80,7 +98,10 @@ def rr_curve_weekly(
     ylabel: str = "",
     figsize: tuple = PLOT_DEFAULTS["figsize"],
 ) -> Figure:
-    """Plot cumulative R/R by day of the week."""
+    """Plot cumulative R/R by day of the week.
+
+    ``days`` may hold day names or int weekday codes (0 = Monday).
+    """
     fig, ax = create_figure(figsize)
     valid_mask = rr_series.notna()
     rr_series = rr_series[valid_mask]
@@ -91,9 +112,9 @@ def rr_curve_weekly(
 
     # Determine x values
     if days is not None:
-        x_vals = days.str.strip().str.lower()
+        x_vals = weekday_labels(days)
     elif dates is not None:
-        x_vals = pd.to_datetime(dates, errors="coerce").dt.day_name().str.strip().str.lower()
+        x_vals = weekday_labels(trade_dates(dates))
     else:
         raise ValueError("No date or day series was provided!")
 
@@ -120,6 +141,7 @@ def rr_curve_weekly(
     return finalize_plot(fig)
 
 
+@styled_plot
 def rr_barplot(
     rr_series: pd.Series,
     days: pd.Series | None = None,
@@ -129,7 +151,10 @@ def rr_barplot(
     ylabel: str = "",
     figsize: tuple = PLOT_DEFAULTS["figsize"],
 ) -> Figure:
-    """Create bar plot of total R/R by day."""
+    """Create bar plot of total R/R by day.
+
+    ``days`` may hold day names or int weekday codes (0 = Monday).
+    """
     fig, ax = create_figure(figsize)
     valid_mask = rr_series.notna()
     rr_series = rr_series[valid_mask]
@@ -140,9 +165,9 @@ def rr_barplot(
 
     # Get day labels
     if days is not None:
-        day_labels = days.str.strip().str.lower()
+        day_labels = weekday_labels(days)
     elif dates is not None:
-        day_labels = pd.to_datetime(dates, errors="coerce").dt.day_name().str.strip().str.lower()
+        day_labels = weekday_labels(trade_dates(dates))
     else:
         raise ValueError("No date or day series was provided!")
 
@@ -166,6 +191,7 @@ def rr_barplot(
     return finalize_plot(fig)
 
 
+@styled_plot
 def rr_barplot_months(
     rr_series: pd.Series,
     dates: pd.Series,
@@ -174,7 +200,10 @@ def rr_barplot_months(
     ylabel: str = "Total R/R",
     figsize: tuple = PLOT_DEFAULTS["figsize"],
 ) -> Figure:
-    """Create bar plot of R/R by month."""
+    """Create bar plot of R/R by month.
+
+    ``dates`` may be dates or int ``YYYYMM`` month periods (-1 = missing).
+    """
     # Validation
     rr_series = rr_series.dropna()
     dates = dates.loc[rr_series.index]
@@ -183,19 +212,20 @@ def rr_barplot_months(
     if len(rr_series) != len(dates):
         raise ValueError("rr_series and dates must have the same length")
 
-    # Convert dates
-    dates = pd.to_datetime(dates, errors="coerce")
-    if dates.isna().all():
+    # Reduce dates to integer year-month periods
+    if pd.api.types.is_integer_dtype(dates):
+        periods = dates.where(dates >= 0)
+    else:
+        dates = trade_dates(dates)
+        periods = dates.dt.year * 100 + dates.dt.month
+    if periods.isna().all():
         raise ValueError("No valid dates provided")
 
-    # Create and process DataFrame
-    df = pd.DataFrame({"dates": dates, "rr": rr_series})
-    df["month_num"] = df["dates"].dt.month
-    df["year"] = df["dates"].dt.year
-    df["month_name"] = df["dates"].dt.strftime("%b %Y")
-
-    monthly_rr = df.groupby(["year", "month_num", "month_name"])["rr"].sum().reset_index()
-    monthly_rr = monthly_rr.sort_values(["year", "month_num"])
+    monthly = rr_series.groupby(periods.to_numpy()).sum().sort_index()
+    monthly_rr = pd.DataFrame({
+        "month_name": [f"{calendar.month_abbr[int(period) % 100]} {int(period) // 100}" for period in monthly.index],
+        "rr": monthly.to_numpy(),
+    })
 
     # Dynamic figure size
     num_months = len(monthly_rr)
@@ -220,6 +250,7 @@ def rr_barplot_months(
     return finalize_plot(fig)
 
 
+@styled_plot
 def asset_performance_bar(
     asset_series: pd.Series,
     rr_series: pd.Series,
@@ -251,6 +282,7 @@ def asset_performance_bar(
     return finalize_plot(fig)
 
 
+@styled_plot
 def outcome_by_day(
     outcome_series: pd.Series,
     date_series: pd.Series = None,
@@ -263,16 +295,19 @@ def outcome_by_day(
     ylabel: str = "",
     figsize: tuple = PLOT_DEFAULTS["figsize"],
 ) -> Figure:
-    """Create bar plot of outcome counts by day."""
+    """Create bar plot of outcome counts by day.
+
+    ``day_series`` may hold day names or int weekday codes (0 = Monday).
+    """
     if date_series is None and day_series is None:
         raise ValueError("Provide either date_series or day_series.")
     
     fig, ax = create_figure(figsize)
 
     if date_series is not None:
-        days = pd.to_datetime(date_series, errors="coerce").dt.day_name().str.strip().str.lower()
+        days = weekday_labels(trade_dates(date_series))
     else:
-        days = day_series.str.strip().str.lower()
+        days = weekday_labels(day_series)
 
     df = pd.DataFrame({
         "day": days,
@@ -300,6 +335,7 @@ def outcome_by_day(
     return finalize_plot(fig)
 
 
+@styled_plot
 def distribution_plot(
     series: pd.Series,
     title: str = "Distribution",
@@ -307,26 +343,43 @@ def distribution_plot(
     ylabel: str = "Frequency",
     dist_label: str = "R/R",
     figsize: tuple = PLOT_DEFAULTS["figsize"],
+    bins: int = 10,
+    bw_method: str | float = "scott",
 ) -> Figure:
-    """Plot histogram with KDE."""
+    """Plot histogram with a binned FFT KDE scaled to the bar counts."""
     fig, ax = create_figure(figsize)
-    
-    sns.histplot(
-        series,
-        bins=10,
-        kde=True,
+    values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        style_axes(ax, title, xlabel, ylabel)
+        ax.text(0.5, 0.5, "No valid data", ha="center", va="center", color=COLORS["text"])
+        return finalize_plot(fig)
+
+    color = cycle_color(0)
+    counts, edges = np.histogram(values, bins=bins)
+    ax.bar(
+        edges[:-1],
+        counts,
+        width=np.diff(edges),
+        align="edge",
+        color=color,
+        alpha=0.5,
         edgecolor=PLOT_DEFAULTS["edgecolor"],
         linewidth=PLOT_DEFAULTS["edge_linewidth"],
-        ax=ax,
         label=dist_label,
     )
-    
+
+    grid, density = binned_kde(values, bw_method=bw_method)
+    if len(grid):
+        ax.plot(grid, density * len(values) * np.diff(edges).min(), color=color)
+
     style_axes(ax, title, xlabel, ylabel)
     ax.legend()
-    
+
     return finalize_plot(fig)
 
 
+@styled_plot
 def risk_vs_reward_scatter(
     risk_series: pd.Series,
     reward_series: pd.Series,
@@ -353,6 +406,7 @@ def risk_vs_reward_scatter(
     return finalize_plot(fig)
 
 
+@styled_plot
 def heatmap_rr(
     rr_series: pd.Series,
     days: pd.Series,
@@ -362,17 +416,21 @@ def heatmap_rr(
     ylabel: str = "Entry Hour",
     figsize: tuple = PLOT_DEFAULTS["figsize"],
 ) -> Figure:
-    """Create heatmap of R/R by day and entry hour."""
+    """Create heatmap of R/R by day and entry hour.
+
+    ``days`` may hold day names or int weekday codes, and ``entry_time`` time
+    values or int entry hours.
+    """
 
     fig, ax = create_figure(figsize)
 
     temp_df = pd.DataFrame({
         "rr": rr_series,
-        "day": days.str.strip().str.lower(),
-        "hour": entry_time.apply(_parse_time_value).apply(lambda x: x.hour if pd.notna(x) else None),
+        "day": weekday_labels(days),
+        "hour": _entry_hours(entry_time),
     })
-    
-    temp_df = temp_df.dropna(subset=["rr", "hour", "day"])
+
+    temp_df = temp_df[temp_df["hour"] >= 0].dropna(subset=["rr", "day"])
     if temp_df.empty:
         style_axes(ax, title, xlabel, ylabel)
         ax.text(0.5, 0.5, "No valid day/time data", ha="center", va="center", color=COLORS["text"])
@@ -387,6 +445,7 @@ def heatmap_rr(
     return finalize_plot(fig)
 
 
+@styled_plot
 def bar_outcomes_by_custom_ranges(
     outcome: pd.Series,
     entry_time: pd.Series,
@@ -396,29 +455,31 @@ def bar_outcomes_by_custom_ranges(
     ylabel: str = "",
     figsize: tuple = PLOT_DEFAULTS["figsize"],
 ) -> Figure:
-    """Create bar plot of outcomes by custom time ranges."""
+    """Create bar plot of outcomes by custom time ranges.
+
+    ``entry_time`` may hold time values or int seconds of day (-1 = missing).
+    """
     fig, ax = create_figure(figsize)
 
-    df = pd.DataFrame({
-        "outcome": outcome,
-        "entry_time": entry_time.apply(_parse_time_value),
-    })
-    df = df.dropna(subset=["entry_time"])
-    if df.empty:
+    seconds = _entry_seconds(entry_time)
+    valid = seconds >= 0
+    if not valid.any():
         style_axes(ax, title, xlabel, ylabel)
         ax.text(0.5, 0.5, "No valid time data", ha="center", va="center", color=COLORS["text"])
         return finalize_plot(fig)
 
+    seconds = seconds[valid]
+    outcomes = np.asarray(outcome, dtype=object)[valid]
     parsed_ranges = [
-        (label, pd.to_datetime(start).time(), pd.to_datetime(end).time())
+        (label, _time_to_seconds(pd.to_datetime(start).time()), _time_to_seconds(pd.to_datetime(end).time()))
         for label, start, end in time_ranges
     ]
 
     data = []
     for label, start, end in parsed_ranges:
-        range_data = df[(df["entry_time"] >= start) & (df["entry_time"] < end)]
+        range_outcomes = outcomes[(seconds >= start) & (seconds < end)]
         for outcome_type in ["WIN", "LOSS", "BE"]:
-            count = range_data[range_data["outcome"] == outcome_type].shape[0]
+            count = int((range_outcomes == outcome_type).sum())
             data.append({"Time Range": label, "Outcome": outcome_type, "Count": count})
 
     plot_df = pd.DataFrame(data)
@@ -446,6 +507,7 @@ def bar_outcomes_by_custom_ranges(
     return finalize_plot(fig)
 
 
+@styled_plot
 def rr_vs_hour_range_bubble_scatter(
     entry_time: pd.Series,
     rr_series: pd.Series,
@@ -455,34 +517,50 @@ def rr_vs_hour_range_bubble_scatter(
     ylabel: str = "R/R",
     figsize: tuple = PLOT_DEFAULTS["figsize"],
     size_scale: tuple = (50, 500),
+    rr_step: float | None = None,
 ) -> Figure:
-    """Bubble scatter plot of R/R vs hour range."""
+    """Bubble scatter plot of R/R vs hour range.
+
+    Trades are counted per (entry hour, R, outcome) bucket on integer codes.
+    ``rr_step`` rounds R to a multiple of the step before counting; when it is
+    None, R is kept exact unless there are more than ``BUBBLE_MAX_RR_LEVELS``
+    distinct values, in which case a step is picked to stay under that limit.
+    """
     fig, ax = create_figure(figsize)
 
-    hour_ints = entry_time.apply(_parse_time_value).dropna().apply(lambda t: t.hour)
-    if hour_ints.empty:
+    hours = _entry_hours(entry_time)
+    rr = pd.to_numeric(rr_series, errors="coerce").to_numpy(dtype=float)
+    outcome_codes, outcome_labels = factorize_labels(outcome)
+    valid = (hours >= 0) & np.isfinite(rr) & (outcome_codes >= 0)
+    if not valid.any():
         style_axes(ax, title, xlabel, ylabel)
         ax.text(0.5, 0.5, "No valid entry times", ha="center", va="center", color=COLORS["text"])
         return finalize_plot(fig)
-    aligned_rr = rr_series.loc[hour_ints.index]
-    aligned_outcome = outcome.loc[hour_ints.index]
-    hour_ranges = hour_ints.apply(lambda h: f"{h:02d}:00–{(h + 1) % 24:02d}:00")
 
-    df = pd.DataFrame({
-        "hour_range": hour_ranges,
-        "rr": aligned_rr,
-        "outcome": aligned_outcome,
+    hours, rr, outcome_codes = hours[valid], rr[valid], outcome_codes[valid]
+    rr_step = _bubble_rr_step(rr) if rr_step is None else rr_step
+    if rr_step:
+        rr = np.round(rr / rr_step) * rr_step
+    rr_levels, rr_codes = np.unique(rr, return_inverse=True)
+
+    # One np.unique over a combined integer key replaces groupby + drop_duplicates.
+    outcome_count = len(outcome_labels)
+    keys = (hours.astype(np.int64) * len(rr_levels) + rr_codes) * outcome_count + outcome_codes
+    unique_keys, counts = np.unique(keys, return_counts=True)
+    bucket_hours, remainder = np.divmod(unique_keys, len(rr_levels) * outcome_count)
+    bucket_rr, bucket_outcomes = np.divmod(remainder, outcome_count)
+
+    present_hours = np.unique(bucket_hours)
+    hour_labels = [f"{hour:02d}:00–{(hour + 1) % 24:02d}:00" for hour in present_hours]
+    df_unique = pd.DataFrame({
+        "hour_range": pd.Categorical.from_codes(
+            np.searchsorted(present_hours, bucket_hours), categories=hour_labels, ordered=True
+        ),
+        "rr": rr_levels[bucket_rr],
+        "outcome": np.asarray(outcome_labels, dtype=object)[bucket_outcomes],
+        "count": counts,
     })
 
-    df["count"] = df.groupby(["hour_range", "rr", "outcome"])["rr"].transform("count")
-    df_unique = df.drop_duplicates(subset=["hour_range", "rr", "outcome"]).copy()
-
-    sorted_hours = sorted(df_unique["hour_range"].unique(), key=lambda x: int(x[:2]))
-    df_unique["hour_range"] = pd.Categorical(
-        df_unique["hour_range"], categories=sorted_hours, ordered=True
-    )
-    df_unique = df_unique.sort_values("hour_range")
-
     scatter = sns.scatterplot(
         data=df_unique,
         x="hour_range",
@@ -511,6 +589,51 @@ def rr_vs_hour_range_bubble_scatter(
     return finalize_plot(fig)
 
 
+def _entry_hours(entry_time: pd.Series) -> np.ndarray:
+    """Return entry hours as int codes (-1 when missing), parsing each distinct time once.
+
+    Integer input is taken as precomputed entry hours.
+    """
+    if pd.api.types.is_integer_dtype(entry_time):
+        return entry_time.to_numpy(dtype=np.int64)
+    codes, uniques = pd.factorize(entry_time, use_na_sentinel=True)
+    unique_hours = [_parse_time_value(value) for value in uniques]
+    lookup = np.array([-1 if parsed is None else parsed.hour for parsed in unique_hours] + [-1], dtype=np.int64)
+    return lookup[codes]
+
+
+def _entry_seconds(entry_time: pd.Series) -> np.ndarray:
+    """Return entry seconds of day (-1 when missing), parsing each distinct time once.
+
+    Integer input is taken as precomputed seconds of day.
+    """
+    if pd.api.types.is_integer_dtype(entry_time):
+        return entry_time.to_numpy(dtype=np.int64)
+    codes, uniques = pd.factorize(entry_time, use_na_sentinel=True)
+    unique_seconds = [_parse_time_value(value) for value in uniques]
+    lookup = np.array(
+        [-1 if parsed is None else _time_to_seconds(parsed) for parsed in unique_seconds] + [-1], dtype=np.int64
+    )
+    return lookup[codes]
+
+
+def _time_to_seconds(value) -> int:
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def _bubble_rr_step(rr: np.ndarray) -> float | None:
+    """Pick a round R step that keeps the number of bubble rows bounded."""
+    if len(np.unique(rr)) <= BUBBLE_MAX_RR_LEVELS:
+        return None
+    raw_step = (rr.max() - rr.min()) / BUBBLE_MAX_RR_LEVELS
+    magnitude = 10 ** np.floor(np.log10(raw_step))
+    for multiplier in (1, 2, 2.5, 5, 10):
+        if multiplier * magnitude >= raw_step:
+            return float(multiplier * magnitude)
+    return float(10 * magnitude)
+
+
+@styled_plot
 def rr_vs_sl_points(
     sl_points_series: pd.Series,
     rr_series: pd.Series,
@@ -538,6 +661,220 @@ def rr_vs_sl_points(
     return finalize_plot(fig)
 
 
+@styled_plot
+def sizing_frontier(
+    results: pd.DataFrame,
+    title: str = "Position Sizing: Growth vs Drawdown",
+    xlabel: str = "Max Drawdown (%)",
+    figsize: tuple = PLOT_DEFAULTS["figsize"],
+) -> Figure:
+    """Plot growth against max drawdown for each sizing policy, one line per policy family."""
+    fig, ax = create_figure(figsize)
+    use_cagr = results["CAGR"].notna().any()
+    growth_column = "CAGR" if use_cagr else "Growth/Trade"
+    colors = {"fixed_fractional": COLORS["primary"], "fixed_r": COLORS["breakeven"], "kelly": COLORS["loss"]}
+    names = {"fixed_fractional": "Fixed fractional (% equity)", "fixed_r": "Fixed R (% start)", "kelly": "Kelly fraction"}
+
+    for policy, group in results[~results["Ruined"]].groupby("Policy", sort=False):
+        ax.plot(
+            group["Max Drawdown"] * 100,
+            group[growth_column] * 100,
+            marker="o",
+            color=colors.get(policy, COLORS["gray"]),
+            label=names.get(policy, policy),
+        )
+        for _, row in group.iterrows():
+            ax.annotate(
+                f"{row['Parameter']:g}",
+                (row["Max Drawdown"] * 100, row[growth_column] * 100),
+                textcoords="offset points",
+                xytext=(4, 4),
+                fontsize=8,
+                color=COLORS["text"],
+            )
+
+    # Growth spans orders of magnitude across risk levels; symlog also keeps losses visible.
+    ax.set_yscale("symlog", linthresh=10 if use_cagr else 0.1)
+    style_axes(ax, title, xlabel, "CAGR (%)" if use_cagr else "Growth per Trade (%)")
+    if ax.get_legend_handles_labels()[0]:
+        ax.legend()
+    return finalize_plot(fig)
+
+
+@styled_plot
+def holding_time_profile(
+    profile: dict,
+    title: str = "Holding Time",
+    figsize: tuple = (10, 9),
+) -> Figure:
+    """Plot average R per duration bucket and win rate per duration quantile.
+
+    ``profile`` is a ``holding_profile`` result; the summary line shows the
+    median and mean time held and R per minute held.
+    """
+    fig, (rr_ax, winrate_ax) = create_figure(figsize, nrows=2)
+    buckets = profile["buckets"][profile["buckets"]["Trades"] > 0]
+    quantiles = profile["quantiles"]
+    summary = profile["summary"]
+
+    positions = np.arange(len(buckets))
+    avg_r = buckets["Avg R"].fillna(0).to_numpy()
+    rr_ax.bar(
+        positions,
+        avg_r,
+        color=np.where(avg_r >= 0, COLORS["win"], COLORS["loss"]),
+        edgecolor=PLOT_DEFAULTS["edgecolor"],
+        linewidth=PLOT_DEFAULTS["edge_linewidth"],
+    )
+    for position, value, trades in zip(positions, avg_r, buckets["Trades"]):
+        rr_ax.annotate(
+            f"n={trades}",
+            (position, value),
+            textcoords="offset points",
+            xytext=(0, 4 if value >= 0 else -12),
+            ha="center",
+            fontsize=8,
+            color=COLORS["text"],
+        )
+    rr_ax.set_xticks(positions, buckets.index)
+    rr_ax.axhline(0, color=COLORS["gray"], linewidth=1)
+    style_axes(rr_ax, "Avg R by Time Held", "", "Avg R")
+
+    positions = np.arange(len(quantiles))
+    winrate_ax.bar(
+        positions,
+        quantiles["WinRate"].fillna(0).to_numpy() * 100,
+        color=COLORS["secondary"],
+        edgecolor=PLOT_DEFAULTS["edgecolor"],
+        linewidth=PLOT_DEFAULTS["edge_linewidth"],
+    )
+    winrate_ax.set_xticks(positions, quantiles.index)
+    winrate_ax.set_ylim(0, 100)
+    style_axes(winrate_ax, "Win Rate by Duration Quantile", "", "Win Rate (%)")
+
+    details = [f"median {format_minutes(summary['median_minutes'])}", f"mean {format_minutes(summary['mean_minutes'])}"]
+    if not np.isnan(summary["r_per_minute"]):
+        details.append(f"{summary['r_per_minute']:.4f} R per minute held")
+    fig.suptitle(f"{title} — {', '.join(details)} ({summary['trades']} trades)", color=COLORS["text"])
+    return finalize_plot(fig)
+
+
+@styled_plot
+def concurrent_exposure(
+    profile: dict,
+    title: str = "Concurrent Exposure",
+    figsize: tuple = (10, 9),
+) -> Figure:
+    """Plot open positions (and open risk) over time and R per trade by overlap-cluster size.
+
+    ``profile`` is an ``exposure_profile`` result.
+    """
+    fig, (timeline_ax, cluster_ax) = create_figure(figsize, nrows=2)
+    timeline = profile["timeline"]
+    clusters = profile["clusters"]
+    summary = profile["summary"]
+
+    timeline_ax.step(
+        timeline["time"], timeline["positions"], where="post", color=COLORS["primary"], label="Open positions"
+    )
+    timeline_ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+    style_axes(timeline_ax, "Open Positions Over Time", "", "Open Positions")
+    if summary["risk_column"] is not None:
+        risk_ax = timeline_ax.twinx()
+        risk_ax.plot(timeline["time"], timeline["risk"], color=COLORS["loss"], linewidth=1, alpha=0.8)
+        risk_label = "Open Risk" if summary["risk_column"] == "risk_amount" else "Open Size"
+        risk_ax.set_ylabel(risk_label, color=COLORS["loss"])
+        risk_ax.tick_params(axis="y", colors=COLORS["loss"])
+        for side in ("top", "left", "bottom"):
+            risk_ax.spines[side].set_visible(False)
+        risk_ax.spines["right"].set_color(COLORS["loss"])
+
+    positions = np.arange(len(clusters))
+    avg_r = clusters["Avg R/Trade"].fillna(0).to_numpy()
+    cluster_ax.bar(
+        positions,
+        avg_r,
+        color=np.where(avg_r >= 0, COLORS["win"], COLORS["loss"]),
+        edgecolor=PLOT_DEFAULTS["edgecolor"],
+        linewidth=PLOT_DEFAULTS["edge_linewidth"],
+    )
+    for position, value, count, agreement in zip(
+        positions, avg_r, clusters["Clusters"], clusters["Outcome Agreement"]
+    ):
+        label = f"{count} clusters" if np.isnan(agreement) else f"{count} clusters\n{agreement * 100:.0f}% agree"
+        cluster_ax.annotate(
+            label,
+            (position, value),
+            textcoords="offset points",
+            xytext=(0, 4 if value >= 0 else -22),
+            ha="center",
+            fontsize=8,
+            color=COLORS["text"],
+        )
+    cluster_ax.set_xticks(positions, clusters.index)
+    cluster_ax.axhline(0, color=COLORS["gray"], linewidth=1)
+    style_axes(cluster_ax, "Avg R per Trade by Overlap Cluster Size", "Trades in Cluster", "Avg R/Trade")
+
+    details = [
+        f"max {summary['max_positions']} open",
+        f"avg {summary['avg_positions_when_exposed']:.2f} while exposed",
+    ]
+    if not np.isnan(summary["outcome_agreement"]):
+        details.append(
+            f"overlapping outcomes agree {summary['outcome_agreement'] * 100:.0f}% "
+            f"(independent: {summary['expected_agreement'] * 100:.0f}%)"
+        )
+    fig.suptitle(f"{title} — {', '.join(details)}", color=COLORS["text"])
+    return finalize_plot(fig)
+
+
+@styled_plot
+def excursion_scatter(
+    profile: dict,
+    side: str = "mae",
+    title: str | None = None,
+    figsize: tuple = PLOT_DEFAULTS["figsize"],
+) -> Figure:
+    """Scatter MAE or MFE (``side``) against the final R of each trade, colored by outcome.
+
+    ``profile`` is an ``excursion_profile`` result. In R, the MAE page marks
+    the 1R stop and the MFE page the line where the exit caught the whole move.
+    """
+    fig, ax = create_figure(figsize)
+    trades = profile["trades"]
+    summary = profile["summary"]
+    name = side.upper()
+    unit = summary["unit"]
+    palette = {"WIN": COLORS["win"], "LOSS": COLORS["loss"], "BE": COLORS["neutral"]}
+
+    for outcome, color in palette.items():
+        subset = trades[trades["outcome"] == outcome]
+        if len(subset):
+            ax.scatter(subset[side], subset["rr"], s=12, color=color, alpha=0.6, label=outcome, rasterized=True)
+    other = trades[~trades["outcome"].isin(list(palette))]
+    if len(other):
+        ax.scatter(other[side], other["rr"], s=12, color=COLORS["gray"], alpha=0.6, label="Other", rasterized=True)
+
+    ax.axhline(0, color=COLORS["gray"], linewidth=1)
+    if unit == "R" and side == "mae":
+        ax.axvline(1, color=COLORS["loss"], linewidth=1, linestyle="--", label="1R stop")
+    elif unit == "R":
+        limit = float(np.nanmax(trades[side])) if len(trades) else 1.0
+        ax.plot([0, limit], [0, limit], color=COLORS["primary"], linewidth=1, linestyle="--", label="Exit at MFE")
+
+    if side == "mae":
+        detail = f"median winner MAE {summary['median_mae_winners']:.2f}{'R' if unit == 'R' else ''}"
+    else:
+        detail = f"median loser MFE {summary['median_mfe_losers']:.2f}{'R' if unit == 'R' else ''}"
+        if not np.isnan(summary["mfe_captured"]):
+            detail += f", winners kept {summary['mfe_captured'] * 100:.0f}% of MFE"
+    title = title or f"{name} vs R/R — {detail}"
+    style_axes(ax, title, f"{name} ({unit})", "R/R")
+    ax.legend()
+    return finalize_plot(fig)
+
+
+@styled_plot
 def create_stats_table(
     stats: dict,
     title: str = "Trading Performance Summary",
@@ -578,7 +915,7 @@ def create_stats_table(
         
         cell.set_text_props(ha="left" if j == 0 else "right")
 
-    plt.title(
+    ax.set_title(
         title,
         pad=30,
         color=accent_color,
@@ -591,3 +928,139 @@ def create_stats_table(
     fig.patch.set_linewidth(1)
     
     return finalize_plot(fig)
+
+
+@styled_plot
+def create_comparison_table(
+    account_stats: dict[str, dict],
+    title: str = "Account Comparison",
+    labelsize: int = 10,
+) -> Figure:
+    """Create a table comparing stats side by side, one column per account."""
+    metrics = list(dict.fromkeys(key for stats in account_stats.values() for key in stats))
+    accounts = list(account_stats)
+    figsize = (min(max(8, 2 + 1.6 * len(accounts)), 40), max(6, 0.45 * len(metrics) + 2))
+    fig, ax = create_figure(figsize)
+
+    bg_color = "#010101"
+    text_color = "#e0e0e0"
+    accent_color = "#797979"
+
+    ax.axis("off")
+    fig.patch.set_facecolor(bg_color)
+
+    table = ax.table(
+        cellText=[[str(account_stats[account].get(metric, "-")) for account in accounts] for metric in metrics],
+        rowLabels=metrics,
+        colLabels=accounts,
+        loc="center",
+        cellLoc="right",
+        edges="open",
+    )
+    table.auto_set_font_size(False)
+    table.set_fontsize(labelsize)
+    table.scale(1.0, 1.4)
+
+    for (i, j), cell in table.get_celld().items():
+        cell.set_facecolor("#2a2a2a" if i % 2 == 0 else bg_color)
+        cell.set_text_props(color=accent_color if i == 0 or j == -1 else text_color, weight="medium")
+
+    ax.set_title(title, pad=20, color=accent_color, fontsize=labelsize + 4, weight="bold")
+    return finalize_plot(fig)
+
+
+@styled_plot
+def create_breakdown_table(
+    breakdown: pd.DataFrame,
+    title: str = "Breakdown",
+    max_rows: int = 25,
+    labelsize: int = 9,
+) -> Figure:
+    """Create a table of per-group stats, keeping the groups with the most trades."""
+    shown = breakdown.sort_values("Trades", ascending=False, kind="stable").head(max_rows)
+    formatted = format_breakdown(shown)
+    columns = [
+        "Trades",
+        "WinRate",
+        "Total R",
+        "Avg R",
+        "Expectancy",
+        "Profit Factor",
+        "Max Drawdown",
+        "Consecutive Wins",
+        "Consecutive Losses",
+    ]
+    labels = [" × ".join(map(str, key)) if isinstance(key, tuple) else str(key) for key in shown.index]
+    if len(breakdown) > max_rows:
+        title = f"{title} (top {max_rows} of {len(breakdown)} by trades)"
+
+    fig, ax = create_figure((13, max(4, 0.35 * len(shown) + 2)))
+
+    bg_color = "#010101"
+    text_color = "#e0e0e0"
+    accent_color = "#797979"
+
+    ax.axis("off")
+    fig.patch.set_facecolor(bg_color)
+
+    table = ax.table(
+        cellText=formatted[columns].astype(str).values.tolist(),
+        rowLabels=labels,
+        colLabels=[column.replace("Consecutive ", "Cons. ") for column in columns],
+        loc="center",
+        cellLoc="right",
+        edges="open",
+    )
+    table.auto_set_font_size(False)
+    table.set_fontsize(labelsize)
+    table.scale(1.0, 1.3)
+
+    for (i, j), cell in table.get_celld().items():
+        cell.set_facecolor("#2a2a2a" if i % 2 == 0 else bg_color)
+        cell.set_text_props(color=accent_color if i == 0 or j == -1 else text_color, weight="medium")
+
+    ax.set_title(title, pad=20, color=accent_color, fontsize=labelsize + 5, weight="bold")
+    return finalize_plot(fig)
+
+
+@styled_plot
+def create_sizing_table(
+    results: pd.DataFrame,
+    title: str = "Position Sizing What-If",
+    max_rows: int = 25,
+    labelsize: int = 9,
+) -> Figure:
+    """Create a table of sizing-policy results in grid order."""
+    shown = results.head(max_rows)
+    formatted = format_sizing(shown)
+    columns = ["Risk/Trade", "Final Equity", "Total Return", "Max Drawdown", "Growth/Trade", "CAGR", "Ruined"]
+    if len(results) > max_rows:
+        title = f"{title} (first {max_rows} of {len(results)} policies)"
+
+    fig, ax = create_figure((13, max(4, 0.35 * len(shown) + 2)))
+
+    bg_color = "#010101"
+    text_color = "#e0e0e0"
+    accent_color = "#797979"
+
+    ax.axis("off")
+    fig.patch.set_facecolor(bg_color)
+
+    table = ax.table(
+        cellText=formatted[columns].astype(str).values.tolist(),
+        rowLabels=[str(label) for label in shown.index],
+        colLabels=columns,
+        loc="center",
+        cellLoc="right",
+        edges="open",
+    )
+    table.auto_set_font_size(False)
+    table.set_fontsize(labelsize)
+    table.scale(1.0, 1.3)
+
+    for (i, j), cell in table.get_celld().items():
+        cell.set_facecolor("#2a2a2a" if i % 2 == 0 else bg_color)
+        cell.set_text_props(color=accent_color if i == 0 or j == -1 else text_color, weight="medium")
+
+    ax.set_title(title, pad=20, color=accent_color, fontsize=labelsize + 5, weight="bold")
+    return finalize_plot(fig)
@@ -0,0 +1,256 @@
+"""Weekly reports for every ISO week of a journal, computed and rendered in one pass.
+
+The journal is sorted once by ISO week; week boundaries come from a single
+scan of the sorted keys, and the weekly stats and ``rr_barplot`` inputs for
+all weeks are reduced with segment sums. Weeks are rendered in worker
+processes, and a week whose rows hash the same as in the previous run is
+not rendered again.
+"""
+
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_pdf import PdfPages
+
+from config import BACKFILL_COMBINED_NAME, BACKFILL_MANIFEST, BACKFILL_OUTPUT_NAME, DAY_ORDER
+from helpers.exporters import atomic_write, export_report, report_basename
+from helpers.utils import series_or_none, trade_dates
+from helpers.visualizations import create_stats_table, rr_barplot
+
+# Columns that feed the weekly report; a week is re-rendered when any of them change.
+WEEKLY_HASH_COLUMNS = ["trade_date", "trade_weekday", "rr", "outcome"]
+BACKFILL_LAYOUTS = ("per-week", "combined")
+
+
+def iso_week_partitions(df: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Partition dated trades by ISO week with one stable sort and a boundary scan.
+
+    Returns:
+        dict: ``order`` (row positions grouped by week, journal order kept
+        inside each week), ``starts`` (segment start offsets into ``order``),
+        ``keys`` (``YYYYWW`` per week) and ``labels`` (e.g. ``2024-W05``).
+        Trades without a valid date are left out.
+    """
+    dates = trade_dates(df["trade_date"])
+    iso = dates.dt.isocalendar()
+    valid = dates.notna().to_numpy()
+    keys = (
+        iso["year"].to_numpy(dtype=np.int64, na_value=0) * 100 + iso["week"].to_numpy(dtype=np.int64, na_value=0)
+    )
+    dated = np.flatnonzero(valid)
+    order = dated[np.argsort(keys[dated], kind="stable")]
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]) if len(order) else np.array([], dtype=np.int64)
+    week_keys = sorted_keys[starts]
+    return {
+        "order": order,
+        "starts": starts,
+        "keys": week_keys,
+        "labels": np.array([f"{key // 100}-W{key % 100:02d}" for key in week_keys.tolist()], dtype=object),
+    }
+
+
+def weekly_report_inputs(df: pd.DataFrame, partitions: dict[str, np.ndarray]) -> list[dict]:
+    """Compute ``stats_table_weekly`` and ``rr_barplot`` inputs for every week at once.
+
+    Returns:
+        list[dict]: One entry per week with ``label``, ``stats`` (same keys and
+        formatting as ``stats_table_weekly``) and ``rr_by_day`` (a
+        ``(totals, weekday codes)`` pair for ``rr_barplot``, or None when no
+        trade in the week has both R and a weekday).
+    """
+    order, starts = partitions["order"], partitions["starts"]
+    if len(starts) == 0:
+        return []
+    segment_ids = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(order)]))
+    week_count = len(starts)
+    trades = np.diff(np.r_[starts, len(order)])
+
+    dates = trade_dates(df["trade_date"]).to_numpy()[order]
+    first_dates = np.minimum.reduceat(dates, starts)
+    last_dates = np.maximum.reduceat(dates, starts)
+
+    rr_series = series_or_none(df, "rr")
+    rr = rr_series.to_numpy(dtype=float)[order] if rr_series is not None else np.full(len(order), np.nan)
+    has_rr = ~np.isnan(rr)
+    rr_filled = np.where(has_rr, rr, 0.0)
+    rr_counts = np.add.reduceat(has_rr.astype(np.int64), starts)
+    rr_totals = np.add.reduceat(rr_filled, starts)
+
+    if "trade_weekday" in df.columns:
+        weekdays = df["trade_weekday"].to_numpy(dtype=np.int64)[order]
+    else:
+        weekdays = np.full(len(order), -1, dtype=np.int64)
+    with_day = has_rr & (weekdays >= 0)
+    cells = segment_ids[with_day] * 7 + weekdays[with_day]
+    day_totals = np.bincount(cells, weights=rr[with_day], minlength=week_count * 7).reshape(week_count, 7)
+    day_counts = np.bincount(cells, minlength=week_count * 7).reshape(week_count, 7)
+
+    outcome_counts = None
+    if "outcome" in df.columns:
+        outcomes = df["outcome"].to_numpy(dtype=object)[order]
+        outcome_counts = {
+            label: np.add.reduceat((outcomes == label).astype(np.int64), starts) for label in ("WIN", "LOSS", "BE")
+        }
+
+    weeks = []
+    for week in range(week_count):
+        stats: dict[str, str | int] = {"Total Trades": int(trades[week])}
+        if rr_counts[week]:
+            stats["Total R/R"] = f"{rr_totals[week]:.2f}"
+            # Best/Worst Day only consider the trading days in DAY_ORDER, as daily_rr_summary does.
+            present = np.flatnonzero(day_counts[week, : len(DAY_ORDER)] > 0)
+            if len(present):
+                totals = day_totals[week, present]
+                best, worst = present[np.argmax(totals)], present[np.argmin(totals)]
+                stats["Best Day"] = f"{DAY_ORDER[best].title()} ({day_totals[week, best]:.2f}R)"
+                stats["Worst Day"] = f"{DAY_ORDER[worst].title()} ({day_totals[week, worst]:.2f}R)"
+        stats["Week Range"] = (
+            f"{pd.Timestamp(first_dates[week]).strftime('%Y-%m-%d')} to "
+            f"{pd.Timestamp(last_dates[week]).strftime('%Y-%m-%d')}"
+        )
+        if outcome_counts is not None:
+            stats["Winning Trades"] = int(outcome_counts["WIN"][week])
+            stats["Losing Trades"] = int(outcome_counts["LOSS"][week])
+            stats["Breakeven Trades"] = int(outcome_counts["BE"][week])
+
+        rr_by_day = None
+        if day_counts[week].any():
+            days = np.flatnonzero(day_counts[week] > 0)
+            rr_by_day = (pd.Series(day_totals[week, days], name="rr"), pd.Series(days.astype(np.int8), name="trade_weekday"))
+        weeks.append({"label": str(partitions["labels"][week]), "stats": stats, "rr_by_day": rr_by_day})
+    return weeks
+
+
+def week_hashes(df: pd.DataFrame, partitions: dict[str, np.ndarray], salt: str = "") -> list[str]:
+    """Content hash of each week's rows (in journal order) over the report columns."""
+    columns = [column for column in WEEKLY_HASH_COLUMNS if column in df.columns]
+    row_hashes = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()[partitions["order"]]
+    bounds = np.r_[partitions["starts"], len(row_hashes)]
+    return [
+        hashlib.blake2b(salt.encode() + row_hashes[start:end].tobytes(), digest_size=16).hexdigest()
+        for start, end in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+def weekly_steps(week: dict) -> list[tuple]:
+    """Plot steps for one week, matching ``generate_plots_weekly``."""
+    steps: list[tuple] = [(create_stats_table, (week["stats"],))]
+    if week["rr_by_day"] is not None:
+        totals, weekdays = week["rr_by_day"]
+        steps.append((rr_barplot, (totals, weekdays, None, "Weekly R by Day", "", "Total R")))
+    return steps
+
+
+def backfill_weekly_reports(
+    df: pd.DataFrame,
+    output_dir: str | Path = ".",
+    formats: tuple[str, ...] | list[str] = ("pdf",),
+    layout: str = "per-week",
+    output_name: str | None = None,
+    max_workers: int | None = None,
+    force: bool = False,
+) -> dict:
+    """Write weekly reports for every ISO week in the journal.
+
+    Args:
+        df: Normalized journal.
+        output_dir: Directory for the reports and the backfill manifest.
+        formats: Export formats for ``per-week`` output; ``combined`` writes PDF only.
+        layout: ``"per-week"`` (one report per week) or ``"combined"`` (one
+            multi-page PDF with every week).
+        output_name: Name template; ``{week}`` is replaced by the ISO week label.
+            For ``per-week`` output, a template without ``{week}`` gets the
+            label prepended so that every week writes its own file.
+        max_workers: Rendering processes (defaults to the CPU count).
+        force: Render every week even if unchanged.
+
+    Returns:
+        dict: ``rendered`` and ``skipped`` week labels and the ``files`` written.
+    """
+    if layout not in BACKFILL_LAYOUTS:
+        raise ValueError(f"Unknown backfill layout: {layout}")
+    if layout == "combined" and list(formats) != ["pdf"]:
+        raise ValueError("The combined backfill layout only writes a PDF.")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / BACKFILL_MANIFEST
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    partitions = iso_week_partitions(df)
+    weeks = weekly_report_inputs(df, partitions)
+    hashes = week_hashes(df, partitions, salt=f"{layout}:{','.join(formats)}")
+
+    if layout == "combined":
+        result = _backfill_combined(weeks, hashes, output_dir, output_name, manifest, max_workers, force)
+    else:
+        result = _backfill_per_week(weeks, hashes, output_dir, formats, output_name, manifest, max_workers, force)
+
+    atomic_write(manifest_path, lambda file: file.write(json.dumps(manifest, indent=2).encode("utf-8")))
+    return result
+
+
+def _backfill_per_week(weeks, hashes, output_dir, formats, output_name, manifest, max_workers, force) -> dict:
+    template = output_name or BACKFILL_OUTPUT_NAME
+    if "{week}" not in template:
+        # Without the week label every week would be written to the same file.
+        template = "{week}-" + template
+    pending, skipped = [], []
+    for week, digest in zip(weeks, hashes):
+        previous = manifest.get(week["label"], {})
+        unchanged = previous.get("hash") == digest and all(Path(path).exists() for path in previous.get("files", []))
+        if unchanged and not force:
+            skipped.append(week["label"])
+        else:
+            name = template.replace("{week}", week["label"])
+            pending.append((week, list(formats), str(output_dir), name, digest))
+
+    files: list[str] = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for label, digest, written in executor.map(_render_week_files, pending):
+            paths = [path for format_paths in written.values() for path in format_paths]
+            manifest[label] = {"hash": digest, "files": paths}
+            files.extend(paths)
+
+    return {"rendered": [task[0]["label"] for task in pending], "skipped": skipped, "files": files}
+
+
+def _backfill_combined(weeks, hashes, output_dir, output_name, manifest, max_workers, force) -> dict:
+    path = output_dir / f"{report_basename('Weekly', output_name or BACKFILL_COMBINED_NAME)}.pdf"
+    digest = hashlib.blake2b("".join(hashes).encode(), digest_size=16).hexdigest()
+    previous = manifest.get("combined", {})
+    if previous.get("hash") == digest and previous.get("files") == [str(path)] and path.exists() and not force:
+        return {"rendered": [], "skipped": [week["label"] for week in weeks], "files": []}
+
+    def write(file) -> None:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor, PdfPages(file) as pdf:
+            # Figures are built in the workers and written here in week order.
+            for figures in executor.map(_build_week_figures, weeks):
+                for fig in figures:
+                    pdf.savefig(fig)
+
+    atomic_write(path, write)
+    manifest["combined"] = {"hash": digest, "files": [str(path)]}
+    return {"rendered": [week["label"] for week in weeks], "skipped": [], "files": [str(path)]}
+
+
+def _render_week_files(task: tuple) -> tuple[str, str, dict[str, list[str]]]:
+    week, formats, output_dir, name, digest = task
+    written = export_report(
+        weekly_steps(week), report_type="Weekly", formats=formats, output_dir=output_dir, output_name=name
+    )
+    return week["label"], digest, written
+
+
+def _build_week_figures(week: dict) -> list:
+    figures = []
+    for func, args in weekly_steps(week):
+        fig = func(*args)
+        if fig is not None:
+            figures.append(fig)
+    return figures
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def synthetic_journal(rows: int, seed: int = 0) -> pd.DataFrame:
+    """A raw journal export with the column names and formats users' spreadsheets have."""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2023-01-02") + pd.to_timedelta(rng.integers(0, 700, rows), unit="D")
+    rr = np.round(rng.choice([-1, 0, 1.5, 2, 3, -1, -1], rows) * rng.uniform(0.8, 1.2, rows), 2)
+    hours, minutes = rng.integers(8, 16, rows), rng.integers(0, 60, rows)
+    exit_minutes = hours * 60 + minutes + rng.integers(1, 240, rows)
+    return pd.DataFrame(
+        {
+            "date": dates.strftime("%Y-%m-%d"),
+            "symbol": rng.choice(["NQ", "ES", "GC"], rows),
+            "entry time": [f"{h:02d}:{m:02d}" for h, m in zip(hours, minutes)],
+            "exit": [f"{m // 60 % 24:02d}:{m % 60:02d}" for m in exit_minutes],
+            "size": rng.integers(1, 5, rows),
+            "result": np.where(rr > 0, "win", np.where(rr < 0, "Loss", "be")),
+            "r/r": rr,
+            "sl": rng.normal(20, 5, rows).round(1),
+            "session": rng.choice(["NY", "London", "Asia"], rows),
+            "setup": rng.choice(["A", "B", "C"], rows),
+            "risk": rng.integers(100, 300, rows),
+        }
+    )
+
+
+@pytest.fixture
+def journal_csv(tmp_path):
+    path = tmp_path / "journal.csv"
+    synthetic_journal(200).to_csv(path, index=False)
+    return path
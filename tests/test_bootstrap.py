@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers.bootstrap import OUTCOME_LOSS, OUTCOME_WIN, bootstrap_samples
+from helpers.calculations import expectancy_from_rr, max_drawdown_r, profit_factor, winrate
+
+RR = np.array([2.0, -1.0, np.nan, 0.0, 1.5, -1.0, 3.0])
+OUTCOMES = np.array(["WIN", "LOSS", "LOSS", "BE", "WIN", "LOSS", "WIN"])
+CODES = np.select([OUTCOMES == "WIN", OUTCOMES == "LOSS"], [OUTCOME_WIN, OUTCOME_LOSS], 0).astype(np.int8)
+
+
+def test_seeded_resamples_repeat_whatever_the_workers():
+    first = bootstrap_samples(RR, CODES, resamples=200, seed=11, min_chunk_rows=16, chunk_bytes=0)
+    again = bootstrap_samples(RR, CODES, resamples=200, seed=11, min_chunk_rows=16, chunk_bytes=0)
+    pooled = bootstrap_samples(RR, CODES, resamples=200, seed=11, min_chunk_rows=16, chunk_bytes=0, max_workers=2)
+    other = bootstrap_samples(RR, CODES, resamples=200, seed=12, min_chunk_rows=16, chunk_bytes=0)
+
+    assert set(first) == {"WinRate", "Expectancy", "Profit Factor", "Max Drawdown", "Avg R/R"}
+    for name, values in first.items():
+        assert len(values) == 200
+        np.testing.assert_array_equal(values, again[name])
+        np.testing.assert_array_equal(values, pooled[name])
+    assert not np.array_equal(first["Avg R/R"], other["Avg R/R"])
+
+
+def test_resampled_stats_match_the_point_statistics():
+    samples = bootstrap_samples(RR, CODES, resamples=40, seed=3)
+    # A single chunk draws its indices from the first child seed.
+    rng = np.random.default_rng(np.random.SeedSequence(3).spawn(1)[0])
+    index = rng.integers(0, len(RR), size=(40, len(RR)), dtype=np.int32)
+
+    for row, positions in enumerate(index):
+        rr = pd.Series(RR[positions])
+        outcomes = pd.Series(OUTCOMES[positions])
+        assert samples["WinRate"][row] == pytest.approx(winrate(outcomes)[0])
+        assert samples["Max Drawdown"][row] == pytest.approx(max_drawdown_r(rr))
+        assert samples["Profit Factor"][row] == pytest.approx(profit_factor(rr.dropna()))
+        assert samples["Avg R/R"][row] == pytest.approx(rr.mean())
+        # expectancy_from_rr rounds to cents.
+        assert samples["Expectancy"][row] == pytest.approx(expectancy_from_rr(outcomes, rr), abs=0.005)
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers.breakdowns import group_breakdown
+from helpers.calculations import consecutive_wins_and_losses, max_drawdown_r
+from helpers.journal_normalization import load_journal_config, normalize_journal
+
+from conftest import synthetic_journal
+
+
+@pytest.fixture
+def journal():
+    df = normalize_journal(synthetic_journal(800, seed=5), load_journal_config(None))
+    rng = np.random.default_rng(5)
+    df.loc[rng.random(len(df)) < 0.1, "session"] = np.nan
+    df.loc[rng.random(len(df)) < 0.05, "rr"] = np.nan
+    return df
+
+
+def expected_breakdown(df, by):
+    keys = [df[column].astype(object) for column in by]
+    rows = {}
+    for key, group in df.groupby(keys, sort=True, dropna=True):
+        outcomes = group["outcome"].astype(str)
+        wins, losses = (outcomes == "WIN").sum(), (outcomes == "LOSS").sum()
+        streak_losses, streak_wins = consecutive_wins_and_losses(outcomes, "LOSS", "WIN")
+        rows[key if isinstance(key, tuple) else (key,)] = {
+            "Trades": len(group),
+            "WinRate": wins / (wins + losses),
+            "Total R": group["rr"].sum(),
+            "Max Drawdown": max_drawdown_r(group["rr"]),
+            "Consecutive Wins": streak_wins,
+            "Consecutive Losses": streak_losses,
+        }
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+@pytest.mark.parametrize("by", [["setup"], ["asset"], ["session"], ["setup", "session"], ["asset", "setup"]])
+def test_group_breakdown_matches_groupby(journal, by):
+    breakdown = group_breakdown(journal, by)
+    expected = expected_breakdown(journal, by)
+
+    actual_keys = [key if isinstance(key, tuple) else (key,) for key in breakdown.index]
+    assert [tuple(str(value) for value in key) for key in actual_keys] == [
+        tuple(str(value) for value in key) for key in expected.index
+    ]
+    for column in expected.columns:
+        np.testing.assert_allclose(
+            breakdown[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float), err_msg=column
+        )
+
+
+def test_missing_labels_are_left_out(journal):
+    breakdown = group_breakdown(journal, "session")
+    assert breakdown["Trades"].sum() == journal["session"].notna().sum()
+    assert breakdown.index.notna().all()
@@ -0,0 +1,63 @@
+import pytest
+
+from helpers import columnar_journal
+from helpers.columnar_journal import append_columnar_journal, read_columnar_journal, write_columnar_journal
+from helpers.journal_normalization import load_journal_config, load_journal_data, normalize_journal
+
+from conftest import synthetic_journal
+
+
+@pytest.fixture
+def journal():
+    raw = synthetic_journal(400)
+    raw["exit date"] = raw["date"]
+    return normalize_journal(raw, load_journal_config(None))
+
+
+def test_append_extends_the_journal(tmp_path, journal):
+    write_columnar_journal(journal, tmp_path / "cols")
+    assert append_columnar_journal(journal, tmp_path / "cols") == 800
+    loaded = read_columnar_journal(tmp_path / "cols")
+    assert len(loaded) == 800
+    assert loaded["rr"].sum() == pytest.approx(2 * journal["rr"].sum())
+
+
+def test_rejected_append_leaves_the_journal_intact(tmp_path, journal):
+    write_columnar_journal(journal, tmp_path / "cols")
+    before = {file.name: file.read_bytes() for file in (tmp_path / "cols").iterdir()}
+
+    zoned = journal.copy()
+    zoned["exit_date"] = zoned["exit_date"].dt.tz_localize("America/New_York")
+    with pytest.raises(ValueError, match="Time zone mismatch"):
+        append_columnar_journal(zoned, tmp_path / "cols")
+
+    assert {file.name: file.read_bytes() for file in (tmp_path / "cols").iterdir()} == before
+    assert len(read_columnar_journal(tmp_path / "cols")) == 400
+
+
+def test_failed_write_rolls_back_extended_columns(tmp_path, journal, monkeypatch):
+    write_columnar_journal(journal, tmp_path / "cols")
+    before = {file.name: file.read_bytes() for file in (tmp_path / "cols").iterdir()}
+
+    def fail(path, manifest):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(columnar_journal, "_write_manifest", fail)
+    with pytest.raises(OSError):
+        append_columnar_journal(journal, tmp_path / "cols")
+
+    assert {file.name: file.read_bytes() for file in (tmp_path / "cols").iterdir()} == before
+    assert len(read_columnar_journal(tmp_path / "cols")) == 400
+
+
+def test_configured_columns_are_the_only_ones_loaded(tmp_path, journal):
+    write_columnar_journal(journal, tmp_path / "cols")
+    config = load_journal_config(None)
+    config["source"]["columns"] = ["rr", "outcome", "entry_hour", "entry_time_seconds"]
+    loaded = load_journal_data(str(tmp_path / "cols"), config)
+    assert set(loaded.columns) == {"rr", "outcome", "entry_time_seconds", "entry_hour"}
+    assert loaded["entry_hour"].tolist() == journal["entry_hour"].tolist()
+
+    config["source"]["columns"] = ["rr", "entry_time"]
+    loaded = load_journal_data(str(tmp_path / "cols"), config)
+    assert loaded["entry_time"].tolist() == journal["entry_time"].tolist()
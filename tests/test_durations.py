@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from helpers.durations import holding_minutes
+
+HOUR = 3600
+
+
+def test_exit_before_entry_wraps_overnight_without_dates():
+    minutes = holding_minutes(
+        np.array([23 * HOUR, 9 * HOUR, 9 * HOUR, -1, 10 * HOUR]),
+        np.array([1 * HOUR, 9 * HOUR, 9 * HOUR + 90, 10 * HOUR, -1]),
+    )
+    np.testing.assert_array_equal(minutes, [120, 0, 1.5, np.nan, np.nan])
+
+
+def test_exit_dates_set_the_day_count():
+    entry = np.array([23 * HOUR, 23 * HOUR, 23 * HOUR, 9 * HOUR, 9 * HOUR, 9 * HOUR])
+    exit_ = np.array([1 * HOUR, 1 * HOUR, 1 * HOUR, 9 * HOUR, 9 * HOUR, 8 * HOUR])
+    entry_dates = pd.Series(pd.to_datetime(["2024-03-04"] * 5 + [None]))
+    exit_dates = pd.Series(pd.to_datetime(["2024-03-05", "2024-03-06", "2024-03-04", "2024-03-04", "2024-03-05", None]))
+
+    minutes = holding_minutes(entry, exit_, entry_dates, exit_dates)
+
+    # Same-day exit before the entry is unknown, not an overnight hold; undated rows still wrap.
+    np.testing.assert_array_equal(minutes, [120, 1560, np.nan, 0, 1440, 1380])
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers.excursions import bar_store_path, range_extremes, segment_reduce, trade_excursions, write_bars
+
+
+def test_segment_reduce_matches_a_slice_loop():
+    rng = np.random.default_rng(4)
+    values = rng.normal(size=200)
+    first = np.sort(rng.integers(20, 150, 60))
+    last = np.minimum(first + rng.integers(1, 30, 60), 160)
+    # Ranges ending on the window edge, including one-bar ranges there.
+    first, last = np.r_[first, 150, 159], np.r_[last, 160, 160]
+    for ufunc, reduce in ((np.fmax, np.max), (np.fmin, np.min), (np.add, np.sum)):
+        expected = [reduce(values[low:high]) for low, high in zip(first, last)]
+        np.testing.assert_allclose(segment_reduce(ufunc, values, first, last), expected)
+
+
+def test_range_extremes_matches_a_slice_loop():
+    rng = np.random.default_rng(8)
+    close = 100 + np.cumsum(rng.normal(size=300))
+    bars = {"open": close - 0.1, "high": close + 1, "low": close - 1, "close": close}
+    first = rng.integers(0, 300, 80)
+    last = np.minimum(first + rng.integers(0, 20, 80), 300)
+
+    extremes = range_extremes(bars, first, last)
+
+    for column, (low, high) in enumerate(zip(first, last)):
+        if high == low:
+            assert np.isnan(extremes[:, column]).all()
+            continue
+        expected = [
+            bars["high"][low:high].max(),
+            bars["low"][low:high].min(),
+            bars["open"][low],
+            bars["close"][high - 1],
+        ]
+        np.testing.assert_allclose(extremes[:, column], expected)
+
+
+@pytest.fixture
+def bars_dir(tmp_path):
+    minutes = np.arange(60)
+    opens = 100.0 + minutes
+    write_bars(
+        pd.DataFrame(
+            {
+                "time": pd.Timestamp("2024-03-04 09:30") + pd.to_timedelta(minutes, unit="min"),
+                "open": opens,
+                "high": opens + 0.5,
+                "low": opens - 0.5,
+                "close": opens + 0.25,
+            }
+        ),
+        bar_store_path(tmp_path, "NQ"),
+    )
+    return tmp_path
+
+
+def journal(**extra):
+    entry, exit_ = 9 * 3600 + 30 * 60, 9 * 3600 + 35 * 60
+    return pd.DataFrame(
+        {
+            "asset": ["NQ", "NQ", "NQ", "CL"],
+            "trade_date": pd.to_datetime(["2024-03-04"] * 4),
+            "entry_time_seconds": [entry] * 4,
+            "exit_time_seconds": [exit_] * 4,
+            "rr": [1.0, -1.0, 0.0, 1.0],
+            "stop_loss_points": [2.0, 2.0, 2.0, 2.0],
+            **extra,
+        }
+    )
+
+
+def test_side_is_inferred_from_r_and_the_price_move(bars_dir):
+    frame, missing = trade_excursions(journal(), bars_dir, max_workers=1)
+
+    # Bars 09:30 to 09:35: entry at the first open (100), highs up to 105.5, lows down to 99.5.
+    assert missing == ["CL"]
+    np.testing.assert_array_equal(frame["mfe_points"], [5.5, 0.5, np.nan, np.nan])
+    np.testing.assert_array_equal(frame["mae_points"], [0.5, 5.5, np.nan, np.nan])
+    np.testing.assert_array_equal(frame["mfe_r"], [2.75, 0.25, np.nan, np.nan])
+
+
+def test_direction_and_entry_price_override_inference(bars_dir):
+    frame, _ = trade_excursions(
+        journal(direction=["SHORT", "LONG", "LONG", "LONG"], entry_price=[101.0, 101.0, np.nan, 101.0]),
+        bars_dir,
+        max_workers=1,
+    )
+    np.testing.assert_array_equal(frame["mfe_points"], [1.5, 4.5, 5.5, np.nan])
+    np.testing.assert_array_equal(frame["mae_points"], [4.5, 1.5, 0.5, np.nan])
@@ -0,0 +1,31 @@
+import os
+import stat
+
+from helpers import exporters
+
+
+def test_atomic_write_follows_umask_for_new_files(tmp_path):
+    path = tmp_path / "report.json"
+    previous = os.umask(0o027)
+    try:
+        exporters.atomic_write(path, lambda file: file.write(b"{}"))
+    finally:
+        os.umask(previous)
+    assert path.read_bytes() == b"{}"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+
+def test_atomic_write_keeps_mode_of_replaced_file(tmp_path):
+    path = tmp_path / "report.html"
+    path.write_bytes(b"old")
+    path.chmod(0o604)
+    exporters.atomic_write(path, lambda file: file.write(b"new"))
+    assert path.read_bytes() == b"new"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o604
+    assert [entry.name for entry in tmp_path.iterdir()] == ["report.html"]
+
+
+def test_default_report_names_differ_between_processes(monkeypatch):
+    first = exporters.report_basename("Overall")
+    monkeypatch.setattr(os, "getpid", lambda: -1)
+    assert exporters.report_basename("Overall") != first
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from helpers.exposure import sweep_exposure
+
+# Entry/exit seconds: the third trade enters the moment the second exits.
+START = np.array([30, 0, 5, 15])
+END = np.array([40, 10, 15, 20])
+RISK = np.array([1.0, 2.0, 3.0, np.nan])
+
+
+@pytest.mark.parametrize("chunk_trades", [1, 3, 100])
+def test_sweep_counts_positions_clusters_and_exposure(chunk_trades):
+    sweep = sweep_exposure(START, END, RISK, chunk_trades=chunk_trades, timeline_points=4)
+
+    assert sweep["order"].tolist() == [1, 2, 3, 0]
+    assert sweep["max_positions"] == 2
+    assert sweep["max_positions_at"] == 5
+    assert sweep["max_risk"] == 5
+    # An exit at the same second as an entry does not overlap it.
+    assert sweep["cluster_ids"].tolist() == [0, 0, 1, 2]
+    assert sweep["position_seconds"] == 35
+    assert sweep["exposed_seconds"] == 30
+    assert sweep["span_seconds"] == 40
+    assert sweep["timeline"]["positions"].tolist() == [2, 1, 0, 1]
+    assert sweep["timeline"]["risk"].tolist() == [5, 3, 0, 1]
+
+
+def test_sweep_without_risk():
+    sweep = sweep_exposure(np.array([0, 0, 0]), np.array([5, 5, 5]), timeline_points=2)
+    assert sweep["max_positions"] == 3
+    assert np.isnan(sweep["max_risk"])
+    assert sweep["cluster_ids"].tolist() == [0, 0, 0]
+    assert sweep["exposed_seconds"] == 5
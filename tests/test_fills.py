@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers.fills import fills_to_trades, pair_fills
+
+
+def pair(quantity, price, pairing="position", groups=None, stop_price=None):
+    quantity = np.array(quantity, dtype=float)
+    groups = np.zeros(len(quantity), dtype=np.int64) if groups is None else np.array(groups)
+    times = np.arange(len(quantity), dtype=np.int64)
+    return pair_fills(groups, times, quantity, np.array(price, dtype=float), None, stop_price, pairing)
+
+
+def fills_frame(rows):
+    fills = pd.DataFrame(rows, columns=["time", "symbol", "qty", "price", "stop", "fees"])
+    fills["time"] = pd.to_datetime("2024-03-04 09:30") + pd.to_timedelta(fills["time"], unit="min")
+    return fills
+
+
+def test_scale_in_then_one_exit_is_one_position():
+    trades = pair([1, 1, -2], [100, 102, 105])
+    assert trades["direction"].tolist() == [1]
+    assert trades["quantity"].tolist() == [2]
+    assert trades["entry_price"].tolist() == [101]
+    assert trades["exit_price"].tolist() == [105]
+    assert trades["points"].tolist() == [8]
+    assert trades["entry_time"].tolist() == [0] and trades["exit_time"].tolist() == [2]
+    assert trades["open_fills"] == 0
+
+
+def test_fifo_pairs_each_entry_fill_with_the_exits_it_meets():
+    trades = pair([2, 1, -1, -2], [100, 101, 103, 104], pairing="fifo")
+    assert trades["quantity"].tolist() == [2, 1]
+    assert trades["entry_price"].tolist() == [100, 101]
+    assert trades["exit_price"].tolist() == [103.5, 104]
+    assert trades["points"].tolist() == [7, 3]
+    assert trades["exit_time"].tolist() == [3, 3]
+
+    position = pair([2, 1, -1, -2], [100, 101, 103, 104])
+    assert position["quantity"].tolist() == [3]
+    assert position["points"].tolist() == [10]
+
+
+def test_flip_through_zero_closes_and_reopens():
+    trades = pair([2, -3, 1], [100, 104, 101])
+    assert trades["direction"].tolist() == [1, -1]
+    assert trades["quantity"].tolist() == [2, 1]
+    assert trades["entry_price"].tolist() == [100, 104]
+    assert trades["exit_price"].tolist() == [104, 101]
+    assert trades["points"].tolist() == [8, 3]
+    assert trades["entry_time"].tolist() == [0, 1]
+
+
+def test_short_positions_gain_when_price_falls():
+    trades = pair([-2, 1, 1], [50, 48, 53])
+    assert trades["direction"].tolist() == [-1]
+    assert trades["exit_price"].tolist() == [50.5]
+    assert trades["points"].tolist() == [-1]
+
+    fifo = pair([-1, -1, 2], [50, 52, 49], pairing="fifo")
+    assert fifo["direction"].tolist() == [-1, -1]
+    assert fifo["points"].tolist() == [1, 3]
+
+
+def test_positions_still_open_are_left_out():
+    trades = pair([1, -1, 1, 1, 5], [100, 101, 102, 103, 104], groups=[0, 0, 0, 0, 1])
+    assert trades["points"].tolist() == [1]
+    assert trades["open_fills"] == 3
+
+    journal = fills_to_trades(
+        fills_frame(
+            [
+                (0, "NQ", 1, 100, np.nan, 0),
+                (1, "NQ", -1, 101, np.nan, 0),
+                (2, "ES", 1, 50, np.nan, 0),
+            ]
+        )
+    )
+    assert len(journal) == 1
+    assert journal.attrs["fills"] == {"fills": 3, "trades": 1, "open_fills": 1}
+
+
+def test_fifo_risk_and_r_are_per_entry_piece():
+    fills = fills_frame(
+        [
+            (0, "NQ", 1, 100, 98, 0),
+            (1, "NQ", 1, 102, 98, 0),
+            (2, "NQ", -2, 105, np.nan, 1),
+        ]
+    )
+    fifo = fills_to_trades(fills, {"pairing": "fifo"})
+    assert fifo["entry_price"].tolist() == [100, 102]
+    assert fifo["risk_amount"].tolist() == [2, 4]
+    assert fifo["reward_amount"].tolist() == [4.5, 2.5]
+    assert fifo["rr"].tolist() == pytest.approx([2.25, 0.625])
+    assert fifo["entry_time"].tolist() == ["09:30:00", "09:31:00"]
+    assert fifo["exit_time"].tolist() == ["09:32:00", "09:32:00"]
+
+    position = fills_to_trades(fills, {"pairing": "position"})
+    assert position["position_size"].tolist() == [2]
+    assert position["risk_amount"].tolist() == [6]
+    assert position["rr"].tolist() == pytest.approx([7 / 6])
+
+
+def test_short_trades_from_fills_are_signed():
+    fills = fills_frame([(0, "CL", -2, 80, 81, 0), (1, "CL", 2, 78, np.nan, 0)])
+    journal = fills_to_trades(fills, {"multipliers": {"CL": 10}})
+    assert journal["direction"].tolist() == ["SHORT"]
+    assert journal["reward_amount"].tolist() == [40]
+    assert journal["risk_amount"].tolist() == [20]
+    assert journal["rr"].tolist() == [2]
+    assert journal["outcome"].tolist() == ["WIN"]
+
+
+def test_unknown_pairing_is_rejected():
+    with pytest.raises(ValueError, match="Unknown fill pairing"):
+        pair([1, -1], [100, 101], pairing="lifo")
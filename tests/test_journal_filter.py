@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers.journal_filter import FilterError, JournalIndex, filter_journal, parse_filter
+from helpers.journal_normalization import load_journal_config, normalize_journal
+
+from conftest import synthetic_journal
+
+
+@pytest.fixture
+def index():
+    raw = pd.DataFrame(
+        {
+            "date": ["2024-03-04", "2024-03-04", "2024-03-05", "2024-03-05", "2024-03-06", None],
+            "symbol": ["NQ", "ES", "NQ", "ES", "NQ", "ES"],
+            "entry time": ["09:30", "10:00", "10:00:01", "11:15", "09:29:59", "12:00"],
+            "result": ["win", "loss", "be", "win", "loss", "win"],
+            "r/r": [2.0, -1.0, 0.0, 1.5, -1.0, np.nan],
+            "session": ["New York", "London", None, "New York", "Asia", "London"],
+        }
+    )
+    return JournalIndex(normalize_journal(raw, load_journal_config(None)))
+
+
+def rows(index, expression):
+    return index.positions(expression).tolist()
+
+
+def test_and_binds_tighter_than_or(index):
+    assert rows(index, "symbol == ES or symbol == NQ and rr > 0") == [0, 1, 3, 5]
+    assert rows(index, "(symbol == ES or symbol == NQ) and rr > 0") == [0, 3]
+    assert rows(index, "not symbol == ES and rr < 0") == [4]
+    assert rows(index, "not (symbol == ES and rr < 0)") == [0, 2, 3, 4, 5]
+
+
+def test_quoted_labels_and_case(index):
+    assert rows(index, "session == 'New York'") == [0, 3]
+    assert rows(index, 'session == "new york"') == [0, 3]
+    assert rows(index, "session in ('New York', asia)") == [0, 3, 4]
+    assert rows(index, "session not in ('New York', Asia)") == [1, 5]
+
+
+def test_date_bounds(index):
+    assert rows(index, "date == 2024-03-04") == [0, 1]
+    assert rows(index, "date >= 2024-03-05") == [2, 3, 4]
+    assert rows(index, "date > 2024-03-05") == [4]
+    assert rows(index, "date < 2024-03-05") == [0, 1]
+    assert rows(index, "date <= 2024-03-05") == [0, 1, 2, 3]
+    assert rows(index, "date between 2024-03-04 and 2024-03-05") == [0, 1, 2, 3]
+
+
+def test_time_bounds(index):
+    assert rows(index, "time >= 09:30") == [0, 1, 2, 3, 5]
+    assert rows(index, "time < 09:30") == [4]
+    assert rows(index, "time > 10:00") == [2, 3, 5]
+    assert rows(index, "time <= 10:00") == [0, 1, 4]
+    assert rows(index, "time between 09:30 and 10:00") == [0, 1]
+    assert rows(index, "time == 10:00:01") == [2]
+
+
+def test_not_keeps_missing_values_but_inequality_does_not(index):
+    assert rows(index, "session != London") == [0, 3, 4]
+    assert rows(index, "not session == London") == [0, 2, 3, 4]
+    assert rows(index, "rr != 2") == [1, 2, 3, 4]
+    assert rows(index, "not rr == 2") == [1, 2, 3, 4, 5]
+    assert rows(index, "not date == 2024-03-04") == [2, 3, 4, 5]
+
+
+@pytest.mark.parametrize(
+    "expression, message",
+    [
+        ("", "Empty filter"),
+        ("session ==", "ended early"),
+        ("(session == London", "ended early"),
+        ("session == London)", "Unexpected"),
+        ("session London", "Expected op"),
+        ("session not London", "Expected 'in'"),
+        ("session < London", "not supported for text"),
+        ("venue == X", "Unknown filter field"),
+        ("day == xx", "Unknown weekday"),
+        ("date >= someday", "Invalid date"),
+        ("time > 25:99", "Invalid time"),
+        ("rr > big", "Expected numbers"),
+    ],
+)
+def test_malformed_expressions_raise(index, expression, message):
+    with pytest.raises(FilterError, match=message):
+        index.mask(expression)
+
+
+def test_parse_tree_groups_or_over_and():
+    assert parse_filter("a == 1 or b == 2 and not c in (3, 4)") == (
+        "or",
+        ("cmp", "a", "==", ["1"]),
+        ("and", ("cmp", "b", "==", ["2"]), ("not", ("cmp", "c", "in", ["3", "4"]))),
+    )
+
+
+def test_bitmaps_match_boolean_masks():
+    df = normalize_journal(synthetic_journal(600, seed=3), load_journal_config(None))
+    index = JournalIndex(df)
+    dates = df["trade_date"]
+    cases = {
+        "symbol == NQ and (session in (London, Asia) or rr >= 1.5)": (df["asset"] == "NQ")
+        & (df["session"].isin(["London", "Asia"]) | (df["rr"] >= 1.5)),
+        "not setup == A and day in (mon, fri)": (df["setup"] != "A") & df["trade_weekday"].isin([0, 4]),
+        "date between 2023-06-01 and 2023-12-31 and hour < 12": dates.between("2023-06-01", "2023-12-31")
+        & (df["entry_hour"] < 12),
+        "month == 2024-02 or time >= 15:30": (df["trade_month"] == 202402) | (df["entry_time_seconds"] >= 55800),
+        "outcome != WIN and exit_time < 10:15": (df["outcome"] != "WIN") & (df["exit_time_seconds"] < 36900),
+    }
+    for expression, expected in cases.items():
+        np.testing.assert_array_equal(index.mask(expression), expected.to_numpy(), err_msg=expression)
+        assert index.count(expression) == int(expected.sum())
+        assert len(filter_journal(df, expression)) == int(expected.sum())
@@ -0,0 +1,34 @@
+import numpy as np
+
+from helpers.journal_loading import load_input_dataframe
+from helpers.journal_merge import find_duplicates, merge_journals
+from helpers.sqlite_journal import ingest_sqlite_journal, read_sqlite_journal
+
+
+def test_reloaded_journal_merges_into_its_source(tmp_path, journal_csv):
+    df = load_input_dataframe("overall", str(journal_csv), None)
+    ingest_sqlite_journal(df, tmp_path / "journal.sqlite")
+    stored = read_sqlite_journal(tmp_path / "journal.sqlite")
+    assert stored["trade_date"].dtype != df["trade_date"].dtype
+
+    merged, conflicts = merge_journals({"csv": df, "stored": stored})
+
+    assert len(merged) == len(df)
+    assert merged.attrs["merge"]["duplicates"] == len(df)
+    assert conflicts.empty
+
+
+def test_partitioned_dedup_matches_a_single_pass():
+    rng = np.random.default_rng(0)
+    fingerprints = rng.integers(0, 2**63, 300, dtype=np.uint64) * np.uint64(2)
+    fingerprints = np.concatenate([fingerprints, fingerprints[:200], fingerprints[:50]])
+    sources = np.repeat(np.arange(3, dtype=np.int32), [300, 200, 50])
+
+    duplicates, originals = find_duplicates(fingerprints, sources, partition_rows=len(fingerprints))
+    assert duplicates.tolist() == list(range(300, 550))
+    assert originals.tolist() == list(range(200)) + list(range(50))
+
+    for partition_rows in (1, 7, 100):
+        split_duplicates, split_originals = find_duplicates(fingerprints, sources, partition_rows)
+        assert split_duplicates.tolist() == duplicates.tolist()
+        assert split_originals.tolist() == originals.tolist()
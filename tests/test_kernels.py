@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers import kernels
+
+pytest.importorskip("numba")
+
+SEEDS = range(40)
+
+
+def same_bits(left, right) -> bool:
+    left, right = np.asarray(left, dtype=np.float64), np.asarray(right, dtype=np.float64)
+    return left.shape == right.shape and np.array_equal(left.view(np.int64), right.view(np.int64))
+
+
+def both(name, *args):
+    return kernels.NUMPY_KERNELS[name](*args), kernels.jit_kernel(name)(*args)
+
+
+def random_rr(rng, rows):
+    rr = np.round(rng.normal(0.1, 1.5, rows), int(rng.integers(0, 6)))
+    rr[rng.random(rows) < 0.05] = 0.0
+    return rr
+
+
+def random_starts(rng, rows):
+    return np.unique(np.r_[0, rng.integers(0, rows, int(rng.integers(1, 20)))]).astype(np.int64)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_drawdown_kernels_match(seed):
+    rng = np.random.default_rng(seed)
+    rr = random_rr(rng, int(rng.integers(1, 3000)))
+    numpy_result, jit_result = both("max_drawdown", rr)
+    cumulative = pd.Series(rr).cumsum()
+    assert same_bits(numpy_result, jit_result)
+    assert same_bits(abs(numpy_result), abs((cumulative - cumulative.cummax()).min()))
+
+    equity = 1000 + np.cumsum(rng.normal(0, 5, len(rr)))
+    equity[rng.random(len(rr)) < 0.1] = np.nan
+    for offset in (0.0, 1.0):
+        assert same_bits(*both("max_relative_drawdown", equity, offset))
+
+    has_rr = rng.random(len(rr)) < 0.8
+    filled = np.where(has_rr, rr, 0.0)
+    assert same_bits(*both("segment_max_drawdown", filled, has_rr, random_starts(rng, len(rr))))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_streak_kernels_match(seed):
+    rng = np.random.default_rng(seed)
+    rows = int(rng.integers(1, 3000))
+    codes = rng.choice(np.array([1, -1, 0], dtype=np.int8), rows, p=[0.45, 0.4, 0.15])
+
+    expected, loss, win = [0, 0], 0, 0
+    for code in codes:
+        loss, win = (loss + 1 if code == -1 else 0), (win + 1 if code == 1 else 0)
+        expected = [max(expected[0], loss), max(expected[1], win)]
+    numpy_result, jit_result = both("max_streaks", codes)
+    assert tuple(numpy_result) == tuple(jit_result) == tuple(expected)
+
+    flags = rng.random(rows) < rng.uniform(0.1, 0.9)
+    numpy_runs, jit_runs = both("segment_max_run", flags, random_starts(rng, rows))
+    assert np.array_equal(numpy_runs, jit_runs)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_sizing_kernels_match(seed):
+    rng = np.random.default_rng(seed)
+    rr = random_rr(rng, int(rng.integers(1, 3000)))
+    risk = np.r_[rng.uniform(0, 0.5, 5), 0.0, 2.0]
+    block = int(rng.integers(1, len(rr) + 2))
+
+    (numpy_level, numpy_gap), (jit_level, jit_gap) = both("compounding_paths", rr, risk, block)
+    # log1p comes from a different math library under numba; allow last-ulp differences.
+    assert np.array_equal(np.isneginf(numpy_level), np.isneginf(jit_level))
+    np.testing.assert_allclose(jit_level, numpy_level, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(jit_gap, numpy_gap, rtol=1e-12, atol=1e-12)
+
+    numpy_result, jit_result = both("fixed_paths", rr, risk, block)
+    assert all(same_bits(left, right) for left, right in zip(numpy_result, jit_result))
+
+
+def test_public_functions_agree_across_the_jit_threshold(monkeypatch):
+    rng = np.random.default_rng(0)
+    rr = random_rr(rng, kernels.JIT_MIN_SIZE)
+    codes = rng.choice(np.array([1, -1, 0], dtype=np.int8), len(rr))
+
+    monkeypatch.setattr(kernels, "JIT_AVAILABLE", False)
+    numpy_results = (kernels.max_drawdown(rr), kernels.max_streaks(codes), kernels.max_relative_drawdown(1e4 + rr))
+    monkeypatch.setattr(kernels, "JIT_AVAILABLE", True)
+    jit_results = (kernels.max_drawdown(rr), kernels.max_streaks(codes), kernels.max_relative_drawdown(1e4 + rr))
+
+    assert same_bits(numpy_results[0], jit_results[0])
+    assert numpy_results[1] == jit_results[1]
+    assert same_bits(numpy_results[2], jit_results[2])
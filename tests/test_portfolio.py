@@ -0,0 +1,20 @@
+import pytest
+
+from helpers.portfolio import account_names
+
+
+def test_account_names_are_stems_when_unique(tmp_path):
+    assert account_names([str(tmp_path / "alpha.csv"), str(tmp_path / "beta.xlsx")]) == ["alpha", "beta"]
+
+
+def test_account_names_add_parents_where_stems_collide(tmp_path):
+    paths = [tmp_path / "a" / "journal.csv", tmp_path / "b" / "journal.csv", tmp_path / "b" / "other.csv"]
+    assert account_names([str(path) for path in paths]) == ["a/journal", "b/journal", "other"]
+
+    nested = [tmp_path / "x" / "live" / "journal.csv", tmp_path / "y" / "live" / "journal.csv"]
+    assert account_names([str(path) for path in nested]) == ["x/live/journal", "y/live/journal"]
+
+
+def test_account_names_reject_the_same_file_twice(tmp_path):
+    with pytest.raises(ValueError, match="more than once"):
+        account_names([str(tmp_path / "journal.csv"), str(tmp_path / "." / "journal.csv")])
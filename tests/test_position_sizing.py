@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from helpers import kernels
+from helpers.calculations import max_drawdown_from_equity, max_drawdown_from_pct_returns
+from helpers.position_sizing import simulate_policies
+
+RISK = 0.02
+
+
+@pytest.fixture
+def rr():
+    rng = np.random.default_rng(9)
+    return np.round(rng.choice([-1.0, -1.0, 0.0, 1.5, 2.0, 3.0], 500) * rng.uniform(0.8, 1.2, 500), 2)
+
+
+def paths(name, rr, block, use_jit):
+    if use_jit:
+        pytest.importorskip("numba")
+        kernel = kernels.jit_kernel(name)
+    else:
+        kernel = kernels.NUMPY_KERNELS[name]
+    return kernel(np.ascontiguousarray(rr), np.array([RISK]), block)
+
+
+@pytest.mark.parametrize("use_jit", [False, True])
+@pytest.mark.parametrize("block", [7, 500])
+def test_compounding_path_matches_pct_return_drawdown(rr, block, use_jit):
+    level, worst_gap = paths("compounding_paths", rr, block, use_jit)
+    returns = np.r_[0.0, RISK * rr]
+    assert level[0] == pytest.approx(np.log1p(RISK * rr).sum())
+    assert -np.expm1(-worst_gap[0]) == pytest.approx(max_drawdown_from_pct_returns(perTrade_returns=returns))
+
+
+@pytest.mark.parametrize("use_jit", [False, True])
+@pytest.mark.parametrize("block", [7, 500])
+def test_fixed_path_matches_equity_drawdown(rr, block, use_jit):
+    level, worst = paths("fixed_paths", rr, block, use_jit)
+    equity = np.r_[1.0, 1.0 + np.cumsum(RISK * rr)]
+    assert level[0] == pytest.approx(equity[-1])
+    assert worst[0] == pytest.approx(max_drawdown_from_equity(list(equity)))
+
+
+def test_simulated_policies_match_the_scalar_drawdowns(rr):
+    rr_with_gaps = np.insert(rr, [10, 200], np.nan)
+    simulated = simulate_policies(rr_with_gaps, np.array([RISK, RISK]), np.array([True, False]), chunk_bytes=1)
+
+    returns = np.r_[0.0, RISK * rr]
+    equity = np.r_[1.0, 1.0 + np.cumsum(RISK * rr)]
+    assert simulated["log_growth"] == pytest.approx([np.log1p(RISK * rr).sum(), np.log(equity[-1])])
+    assert simulated["max_drawdown"] == pytest.approx(
+        [max_drawdown_from_pct_returns(perTrade_returns=returns), max_drawdown_from_equity(list(equity))]
+    )
+    assert not simulated["ruined"].any()
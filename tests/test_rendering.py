@@ -0,0 +1,32 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib
+import matplotlib.pyplot as plt
+
+from helpers.exporters import render_pages
+from helpers.journal_normalization import load_journal_config, normalize_journal
+from helpers.plot_styling import figure_bytes
+from helpers.report_pages import generate_plots_overall, generate_plots_weekly
+
+from conftest import synthetic_journal
+
+BUILDERS = {"overall": generate_plots_overall, "weekly": generate_plots_weekly}
+
+
+def test_reports_render_identically_from_many_threads():
+    df = normalize_journal(synthetic_journal(200), load_journal_config(None))
+    rc_before = dict(matplotlib.rcParams)
+
+    def render(report_type):
+        pages = render_pages(BUILDERS[report_type](df), progress=False)
+        return [hashlib.md5(figure_bytes(page["figure"], "png", dpi=20)).hexdigest() for page in pages]
+
+    expected = {report_type: render(report_type) for report_type in BUILDERS}
+    report_types = ["weekly" if index % 6 == 5 else "overall" for index in range(24)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        rendered = list(pool.map(render, report_types))
+
+    assert all(images == expected[report_type] for images, report_type in zip(rendered, report_types))
+    assert dict(matplotlib.rcParams) == rc_before
+    assert plt.get_fignums() == []
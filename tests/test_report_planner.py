@@ -0,0 +1,71 @@
+import pytest
+
+from helpers.columnar_journal import read_columnar_journal, write_columnar_journal
+from helpers.journal_filter import filter_columns
+from helpers.journal_loading import load_input_dataframe
+from helpers.journal_normalization import load_journal_config, normalize_journal
+from helpers.report_pages import generate_plots_overall, report_columns
+from helpers.report_planner import ReportPlanner
+from helpers.sqlite_journal import ingest_sqlite_journal, read_sqlite_journal
+
+from conftest import synthetic_journal
+
+
+@pytest.fixture
+def journal():
+    raw = synthetic_journal(300)
+    raw["exit date"] = raw["date"]
+    return normalize_journal(raw, load_journal_config(None))
+
+
+def test_report_columns_follow_the_planned_pages():
+    assert set(report_columns("weekly")) == {"rr", "outcome", "trade_date", "trade_weekday"}
+    overall = report_columns("overall", [["setup"]])
+    assert {"rr", "entry_hour", "stop_loss_points", "exit_time_seconds", "setup"} <= set(overall)
+    assert "session" not in overall
+    assert "trade_date" in report_columns("overall", [["setup"]], sizing=True)
+
+
+def test_filter_columns_resolve_aliases():
+    assert filter_columns("(symbol == NQ or hour >= 10) and not session in (Asia, 'New York')") == [
+        "asset",
+        "entry_hour",
+        "session",
+    ]
+
+
+def test_stored_report_columns_produce_the_same_report(tmp_path, journal):
+    write_columnar_journal(journal, tmp_path / "cols")
+    ingest_sqlite_journal(journal, tmp_path / "store.sqlite")
+    expected = ReportPlanner(journal)
+    expected_steps = generate_plots_overall(journal, None, expected)
+
+    columns = report_columns("overall")
+    for path in (tmp_path / "cols", tmp_path / "store.sqlite"):
+        df = load_input_dataframe("overall", str(path), None, report_columns=columns)
+        assert "entry_time" not in df.columns
+        assert "setup" in df.columns
+        planner = ReportPlanner(df)
+        steps = generate_plots_overall(df, None, planner)
+        assert [step[0] for step in steps] == [step[0] for step in expected_steps]
+        assert planner.get("stats_overall") == expected.get("stats_overall")
+
+    store = str(tmp_path / "store.sqlite")
+    weekly = load_input_dataframe("weekly", store, None, report_columns=report_columns("weekly"))
+    assert not {"asset", "session", "setup", "stop_loss_points"} & set(weekly.columns)
+
+
+def test_report_columns_missing_from_the_store_are_skipped(tmp_path, journal):
+    stored = journal.drop(columns=["session", "position_size"])
+    write_columnar_journal(stored, tmp_path / "cols")
+    ingest_sqlite_journal(stored, tmp_path / "store.sqlite")
+    columns = report_columns("overall")
+
+    for path in (tmp_path / "cols", tmp_path / "store.sqlite"):
+        df = load_input_dataframe("overall", str(path), None, report_columns=columns)
+        assert "session" not in df.columns and "position_size" not in df.columns
+
+    with pytest.raises(ValueError, match="session"):
+        read_columnar_journal(tmp_path / "cols", ["rr", "session"])
+    with pytest.raises(ValueError, match="session"):
+        read_sqlite_journal(tmp_path / "store.sqlite", ["rr", "session"])
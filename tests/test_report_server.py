@@ -0,0 +1,106 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from helpers import report_server
+from helpers.report_server import ReportServer
+
+
+@pytest.fixture
+def server(journal_csv):
+    servers = []
+
+    def start(**options):
+        instance = ReportServer(("127.0.0.1", 0), root=journal_csv.parent, render_workers=1, **options)
+        threading.Thread(target=instance.serve_forever, daemon=True).start()
+        servers.append(instance)
+        return instance
+
+    yield start
+    for instance in servers:
+        instance.shutdown()
+        instance.server_close()
+
+
+def get(server, path):
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}{path}", timeout=120) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as error:
+        return error.code, error.read()
+
+
+def test_report_renders_local_journal(server):
+    instance = server()
+    status, body = get(instance, "/report?input=journal.csv&format=json")
+    assert status == 200
+    payload = json.loads(body)
+    assert payload["report_type"] == "Overall"
+    assert payload["stats"]["Total Trades"] == 200
+    assert payload["plots"]
+
+    status, body = get(instance, "/report?input=journal.csv&format=json&filter=asset%20==%20NQ")
+    assert status == 200
+    assert 0 < json.loads(body)["stats"]["Total Trades"] < 200
+
+
+def test_report_errors(server):
+    instance = server()
+    assert get(instance, "/report?input=missing.csv")[0] == 404
+    assert get(instance, "/report?input=../outside.csv")[0] in (403, 404)
+    assert get(instance, "/report?input=journal.csv&format=docx")[0] == 400
+    status, body = get(instance, "/report?input=journal.csv&filter=asset%20~~%20NQ")
+    assert status == 400
+    assert "error" in json.loads(body)
+
+
+def test_unexpected_errors_get_a_500(server, monkeypatch):
+    instance = server()
+
+    def fail(*args, **kwargs):
+        raise OSError("disk went away")
+
+    monkeypatch.setattr(instance, "resolve_local_path", fail)
+    status, body = get(instance, "/stats?input=journal.csv")
+    assert status == 500
+    assert json.loads(body) == {"error": "Internal server error."}
+    assert get(instance, "/health")[0] == 200
+
+
+def test_timed_out_render_keeps_its_slot_until_done(server):
+    instance = server(max_concurrent=1, render_timeout=0.01)
+    assert get(instance, "/report?input=journal.csv&format=json")[0] == 504
+    # The render is still running in the pool and holds the only slot.
+    assert get(instance, "/stats?input=journal.csv")[0] == 503
+
+    deadline = time.monotonic() + 120
+    while get(instance, "/stats?input=journal.csv")[0] == 503:
+        assert time.monotonic() < deadline
+        time.sleep(0.1)
+
+
+def test_render_workers_keep_journals_warm(journal_csv, monkeypatch):
+    monkeypatch.setattr(report_server, "_worker_cache", None)
+    report_server._init_render_worker(cache_size=2)
+    for _ in range(2):
+        payload = json.loads(report_server.render_report(str(journal_csv), None, None, "weekly", "json"))
+        assert payload["plots"]
+    assert report_server._worker_cache.snapshot()["misses"] == 1
+    assert report_server._worker_cache.snapshot()["hits"] == 1
+
+
+def test_failed_loads_do_not_leave_locks_behind(journal_csv, monkeypatch):
+    def fail(*args, **kwargs):
+        raise ValueError("bad journal")
+
+    monkeypatch.setattr(report_server, "load_input_dataframe", fail)
+    cache = report_server.JournalCache(maxsize=2)
+    for _ in range(3):
+        with pytest.raises(ValueError, match="bad journal"):
+            cache.get(journal_csv)
+    assert cache._key_locks == {}
+    assert cache.snapshot()["entries"] == 0
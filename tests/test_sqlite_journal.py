@@ -0,0 +1,41 @@
+import sqlite3
+
+import pytest
+
+from config import SQLITE_TABLE
+from helpers.journal_normalization import load_journal_config, normalize_journal
+from helpers.sqlite_journal import ingest_sqlite_journal, read_sqlite_journal
+
+from conftest import synthetic_journal
+
+
+@pytest.fixture
+def journal():
+    return normalize_journal(synthetic_journal(5), load_journal_config(None))
+
+
+def test_extra_columns_do_not_make_stored_trades_new(tmp_path, journal):
+    store = tmp_path / "trades.sqlite"
+    assert ingest_sqlite_journal(journal.drop(columns=["session"]), store) == (5, 5)
+    assert ingest_sqlite_journal(journal.drop(columns=["session"]), store) == (0, 5)
+    assert ingest_sqlite_journal(journal, store) == (0, 5)
+    assert ingest_sqlite_journal(journal.assign(setup="Z"), store) == (0, 5)
+    assert ingest_sqlite_journal(read_sqlite_journal(store), store) == (0, 5)
+
+
+def test_repeated_trades_are_kept_once_per_copy(tmp_path, journal):
+    store = tmp_path / "trades.sqlite"
+    repeated = journal.iloc[[0, 0, 1]]
+    assert ingest_sqlite_journal(repeated, store) == (3, 3)
+    assert ingest_sqlite_journal(journal, store) == (3, 6)
+    assert ingest_sqlite_journal(journal.iloc[[0, 0, 0]], store) == (1, 7)
+
+
+def test_version_1_stores_are_rekeyed(tmp_path, journal):
+    store = tmp_path / "trades.sqlite"
+    ingest_sqlite_journal(journal, store)
+    with sqlite3.connect(store) as connection:
+        connection.execute(f"UPDATE {SQLITE_TABLE} SET row_hash = -id")
+        connection.execute("PRAGMA user_version = 1")
+
+    assert ingest_sqlite_journal(journal, store) == (0, 5)
@@ -0,0 +1,15 @@
+from helpers.journal_normalization import load_journal_config, normalize_journal
+from helpers.weekly_backfill import backfill_weekly_reports
+
+from conftest import synthetic_journal
+
+
+def test_per_week_names_without_week_placeholder_stay_distinct(tmp_path):
+    df = normalize_journal(synthetic_journal(60), load_journal_config(None))
+    result = backfill_weekly_reports(df, tmp_path, formats=("json",), output_name="journal", max_workers=1)
+
+    assert len(result["rendered"]) > 1
+    assert len(set(result["files"])) == len(result["rendered"])
+    assert sorted(path.name for path in tmp_path.glob("*.json") if path.name != "weekly_backfill.json") == sorted(
+        f"{label}-journal.json" for label in result["rendered"]
+    )